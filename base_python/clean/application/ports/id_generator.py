@@ -0,0 +1,23 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class IdGenerator(ABC):
+    """Interface for entity ID generation"""
+
+    @abstractmethod
+    def new_id(self) -> str:
+        """Generate one ID"""
+        pass
+
+    def new_ids(self, count: int) -> List[str]:
+        """Generate IDs for a batch insert, in generation order"""
+        return [self.new_id() for _ in range(count)]
+
+
+class UUID4IdGenerator(IdGenerator):
+    """Random UUIDv4 IDs (no ordering)"""
+
+    def new_id(self) -> str:
+        return str(uuid.uuid4())
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from domain.order import Order
+
+
+class OrderQueue(ABC):
+    """Interface for handing new orders to background processing"""
+
+    @property
+    def running(self) -> bool:
+        """Whether submit accepts orders right now"""
+        return True
+
+    @abstractmethod
+    async def submit(self, order: Order) -> None:
+        """Queue an order for processing.
+
+        May wait while the queue is full, which slows producers down to the
+        rate the processing keeps up with.
+        """
+        pass
@@ -1,6 +1,92 @@
+import base64
+import json
+import re
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from domain.order import Order
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+from domain.order import ORDER_STATUSES, Order
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize_product(text: str) -> List[str]:
+    """Split a product name or search query into lowercase search terms"""
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+
+def encode_quantity_cursor(order: Order) -> str:
+    """Opaque pagination cursor pointing just past an order in quantity order"""
+    raw = json.dumps([order.quantity, order.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_quantity_cursor(cursor: str) -> Tuple[int, str]:
+    """Decode a cursor produced by encode_quantity_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        quantity, id = json.loads(base64.urlsafe_b64decode(padded))
+        return int(quantity), str(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def product_match_score(terms: Sequence[str], product: str) -> float:
+    """Relevance of a product name to query terms; 0.0 unless every term matches.
+
+    Each term matches a product word equal to it (weight 1) or starting
+    with it (weight len(term) / len(word)).
+    """
+    words = tokenize_product(product)
+    score = 0.0
+    for term in terms:
+        best = max(
+            (1.0 if word == term else len(term) / len(word)
+             for word in words if word.startswith(term)),
+            default=0.0,
+        )
+        if not best:
+            return 0.0
+        score += best
+    return score
+
+
+def rank_by_product_match(orders: Iterable[Order], terms: Sequence[str], limit: int) -> List[Order]:
+    """The ``limit`` best matches, highest score first, shorter products first on ties"""
+    scored = []
+    for order in orders:
+        score = product_match_score(terms, order.product)
+        if score:
+            scored.append((score, -len(order.product), order))
+    scored.sort(key=lambda entry: entry[:2], reverse=True)
+    return [order for _, _, order in scored[:limit]]
+
+
+def bucket_by_created_at(orders: Iterable[Order], bucket_seconds: int) -> List[Dict[str, Any]]:
+    """Count and quantity sum of orders per epoch-aligned bucket, oldest first"""
+    buckets: Dict[int, List[int]] = {}
+    for order in orders:
+        totals = buckets.setdefault(int(order.created_at // bucket_seconds), [0, 0])
+        totals[0] += 1
+        totals[1] += order.quantity
+    return [
+        {"start": key * bucket_seconds, "count": count, "quantity": quantity}
+        for key, (count, quantity) in sorted(buckets.items())
+    ]
+
+
+def status_transition(order: Optional[Order], status: str) -> Tuple[str, Optional[Order]]:
+    """Outcome of moving one order to status, and the updated order to store if any.
+
+    The outcome is ``updated``, ``unchanged``, ``not_found`` or
+    ``invalid_transition``.
+    """
+    if order is None:
+        return "not_found", None
+    if order.status == status:
+        return "unchanged", None
+    try:
+        return "updated", order.with_status(status)
+    except ValueError:
+        return "invalid_transition", None
 
 
 class OrderRepository(ABC):
@@ -25,3 +111,207 @@ class OrderRepository(ABC):
     async def delete(self, id: str) -> None:
         """Delete order by ID"""
         pass
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of orders, reporting per id whether it existed.
+
+        The default deletes one at a time; adapters with a batch API should
+        override it.
+        """
+        results: Dict[str, bool] = {}
+        for id in dict.fromkeys(ids):
+            try:
+                await self.delete(id)
+                results[id] = True
+            except ValueError:
+                results[id] = False
+        return results
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find order by ID, returning only the requested fields.
+
+        Adapters that can fetch partial records should override this.
+        """
+        order = await self.find_by_id(id)
+        return order.to_dict(fields) if order else None
+
+    async def ping(self) -> None:
+        """Reach the backing store, raising if it is unavailable.
+
+        Used by health checks. The default looks up an id that never
+        exists; decorators that can answer without the store (caches)
+        must forward to the repository they wrap.
+        """
+        await self.find_by_id("__health__")
+
+    async def iter_all(self) -> AsyncIterator[Order]:
+        """Iterate over all orders.
+
+        Adapters that can stream from their backing store should override
+        this instead of materializing find_all().
+        """
+        for order in await self.find_all():
+            yield order
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders by id, after the cursor id.
+
+        Returns the page and the cursor of the next page, if any. The
+        default sorts find_all(); adapters should page their storage.
+        """
+        orders = sorted(
+            (order for order in await self.find_all() if cursor is None or order.id > cursor),
+            key=lambda order: order.id,
+        )
+        page = orders[:limit]
+        return page, page[-1].id if page and len(orders) > limit else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all orders, returning only the requested fields.
+
+        Adapters that can fetch partial records should override this.
+        """
+        orders = await self.find_all()
+        return [order.to_dict(fields) for order in orders]
+
+    async def search_by_product(self, query: str, limit: int = 20) -> List[Order]:
+        """Find orders whose product matches every query term, best first.
+
+        Each term matches a product word equal to it or starting with it;
+        exact matches rank above prefix matches. The default scans
+        find_all(); adapters should override it with an index.
+        """
+        terms = tokenize_product(query)
+        if not terms:
+            return []
+        return rank_by_product_match(await self.find_all(), terms, limit)
+
+    async def find_by_quantity_range(
+        self,
+        min_quantity: Optional[int] = None,
+        max_quantity: Optional[int] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Find orders with min_quantity <= quantity <= max_quantity.
+
+        Results are ordered by (quantity, id), ascending unless descending is
+        set. Returns one page and the cursor of the next page, if any. The
+        default scans find_all(); adapters should override it with an index.
+        """
+        after = decode_quantity_cursor(cursor) if cursor else None
+        keyed = []
+        for order in await self.find_all():
+            key = (order.quantity, order.id)
+            if min_quantity is not None and order.quantity < min_quantity:
+                continue
+            if max_quantity is not None and order.quantity > max_quantity:
+                continue
+            if after is not None and (key <= after if not descending else key >= after):
+                continue
+            keyed.append((key, order))
+        keyed.sort(key=lambda entry: entry[0], reverse=descending)
+        page = [order for _, order in keyed[:limit]]
+        next_cursor = encode_quantity_cursor(page[-1]) if len(keyed) > limit else None
+        return page, next_cursor
+
+    async def top_n_by_quantity(self, n: int) -> List[Order]:
+        """Get the n orders with the largest quantity"""
+        orders, _ = await self.find_by_quantity_range(limit=n, descending=True)
+        return orders
+
+    async def find_by_user_id(self, user_id: str) -> List[Order]:
+        """Find the orders of one user.
+
+        The default scans find_all(); adapters should override it with an index.
+        """
+        orders = await self.find_all()
+        return [order for order in orders if order.user_id == user_id]
+
+    async def delete_by_user_id(self, user_id: str) -> List[str]:
+        """Delete every order of one user, returning the deleted ids"""
+        orders = await self.find_by_user_id(user_id)
+        results = await self.delete_many([order.id for order in orders])
+        return [id for id, deleted in results.items() if deleted]
+
+    async def find_by_created_range(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Order]:
+        """Find orders with since <= created_at < until, oldest first.
+
+        Orders without a creation time are never returned. The default
+        scans find_all(); adapters should override it with a time index.
+        """
+        orders = sorted(
+            (order for order in await self.find_all()
+             if order.created_at is not None
+             and (since is None or order.created_at >= since)
+             and (until is None or order.created_at < until)),
+            key=lambda order: (order.created_at, order.id),
+        )
+        return orders[:limit] if limit is not None else orders
+
+    async def created_timeseries(
+        self,
+        bucket_seconds: int,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Order count and quantity sum per epoch-aligned time bucket.
+
+        Returns one ``{"start", "count", "quantity"}`` entry per non-empty
+        bucket, oldest first, counting orders with since <= created_at <
+        until. The default goes through find_by_created_range().
+        """
+        return bucket_by_created_at(await self.find_by_created_range(since, until), bucket_seconds)
+
+    async def find_by_status(
+        self, status: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders with this status, by id after the cursor id.
+
+        Returns the page and the cursor of the next page, if any. The
+        default scans find_all(); adapters should override it with an index.
+        """
+        matches = sorted(
+            (
+                order for order in await self.find_all()
+                if order.status == status and (cursor is None or order.id > cursor)
+            ),
+            key=lambda order: order.id,
+        )
+        page = matches[:limit]
+        return page, page[-1].id if page and len(matches) > limit else None
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of orders in each status.
+
+        The default scans find_all(); adapters should keep counts instead.
+        """
+        counts = dict.fromkeys(ORDER_STATUSES, 0)
+        for order in await self.find_all():
+            counts[order.status] = counts.get(order.status, 0) + 1
+        return counts
+
+    async def update_status(self, ids: Sequence[str], status: str) -> Dict[str, str]:
+        """Move a batch of orders to status, reporting the outcome per id.
+
+        Outcomes are those of status_transition(). The default applies the
+        orders one at a time; adapters should override it to apply the
+        whole batch atomically.
+        """
+        results: Dict[str, str] = {}
+        for id in dict.fromkeys(ids):
+            outcome, updated = status_transition(await self.find_by_id(id), status)
+            if updated is not None:
+                await self.create(updated)
+            results[id] = outcome
+        return results
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from domain.user import User
 
 
@@ -25,3 +25,91 @@ class UserRepository(ABC):
     async def delete(self, id: str) -> None:
         """Delete user by ID"""
         pass
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of users, reporting per id whether it existed.
+
+        The default deletes one at a time; adapters with a batch API should
+        override it.
+        """
+        results: Dict[str, bool] = {}
+        for id in dict.fromkeys(ids):
+            try:
+                await self.delete(id)
+                results[id] = True
+            except ValueError:
+                results[id] = False
+        return results
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find user by ID, returning only the requested fields.
+
+        Adapters that can fetch partial records should override this.
+        """
+        user = await self.find_by_id(id)
+        return user.to_dict(fields) if user else None
+
+    async def ping(self) -> None:
+        """Reach the backing store, raising if it is unavailable.
+
+        Used by health checks. The default looks up an id that never
+        exists; decorators that can answer without the store (caches)
+        must forward to the repository they wrap.
+        """
+        await self.find_by_id("__health__")
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        """Iterate over all users.
+
+        Adapters that can stream from their backing store should override
+        this instead of materializing find_all().
+        """
+        for user in await self.find_all():
+            yield user
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[User], Optional[str]]:
+        """One page of users by id, after the cursor id.
+
+        Returns the page and the cursor of the next page, if any. The
+        default sorts find_all(); adapters should page their storage.
+        """
+        users = sorted(
+            (user for user in await self.find_all() if cursor is None or user.id > cursor),
+            key=lambda user: user.id,
+        )
+        page = users[:limit]
+        return page, page[-1].id if page and len(users) > limit else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all users, returning only the requested fields.
+
+        Adapters that can fetch partial records should override this.
+        """
+        users = await self.find_all()
+        return [user.to_dict(fields) for user in users]
+
+    async def find_by_email(self, email: str) -> List[User]:
+        """Find users with exactly this email.
+
+        The default scans find_all(); adapters should override it with an index.
+        """
+        users = await self.find_all()
+        return [user for user in users if user.email == email]
+
+    async def find_by_name_prefix(
+        self, prefix: str, limit: Optional[int] = None
+    ) -> List[User]:
+        """Find users whose name starts with prefix (case-insensitive), by name.
+
+        The default scans find_all(); adapters should override it with an index.
+        """
+        key = prefix.casefold()
+        users = sorted(
+            (user for user in await self.find_all() if user.name.casefold().startswith(key)),
+            key=lambda user: (user.name.casefold(), user.id),
+        )
+        return users[:limit] if limit is not None else users
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Tuple
+from domain.order import Order
+from domain.user import User
+
+
+class UserWithOrderSummary:
+    """Denormalized read row: a user with the totals of their orders"""
+
+    FIELDS = ("id", "name", "email", "order_count", "total_quantity")
+
+    def __init__(
+        self, id: str, name: str, email: str, order_count: int = 0, total_quantity: int = 0
+    ):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.order_count = order_count
+        self.total_quantity = total_quantity
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict:
+        """Convert the row to a dictionary, optionally with only the given fields"""
+        if fields is not None:
+            return {field: getattr(self, field) for field in fields}
+        return {
+            "id": self.id,
+            "name": self.name,
+            "email": self.email,
+            "order_count": self.order_count,
+            "total_quantity": self.total_quantity,
+        }
+
+
+class UserSummaryReadModel(ABC):
+    """Interface for the users-with-order-summary read model.
+
+    The write use cases report every change, so rows are kept up to date
+    incrementally and reads never join users with orders.
+    """
+
+    @abstractmethod
+    async def user_saved(self, user: User) -> None:
+        """A user was created or replaced"""
+        pass
+
+    @abstractmethod
+    async def user_deleted(self, user_id: str) -> None:
+        """A user was deleted"""
+        pass
+
+    @abstractmethod
+    async def order_saved(self, order: Order) -> None:
+        """An order was created or replaced"""
+        pass
+
+    @abstractmethod
+    async def order_deleted(self, order_id: str) -> None:
+        """An order was deleted"""
+        pass
+
+    @abstractmethod
+    async def page(
+        self, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[UserWithOrderSummary], Optional[str]]:
+        """One page of rows by user id, and the cursor of the next page if any"""
+        pass
+
+    @abstractmethod
+    async def rebuild(self, users: AsyncIterable[User], orders: AsyncIterable[Order]) -> None:
+        """Replace every row with ones computed from full listings.
+
+        Changes reported while the listings are read must not be lost.
+        """
+        pass
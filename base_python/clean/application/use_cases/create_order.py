@@ -1,24 +1,79 @@
-import uuid
-from typing import Dict, Any
+import logging
+import time
+from typing import Callable, Dict, Any, List, Optional, Sequence
 from domain.order import Order
+from application.ports.id_generator import IdGenerator, UUID4IdGenerator
+from application.ports.order_queue import OrderQueue
 from application.ports.order_repository import OrderRepository
+from application.ports.user_summary_read_model import UserSummaryReadModel
+
+logger = logging.getLogger(__name__)
 
 
 class CreateOrderUseCase:
     """Use case for creating orders"""
 
-    def __init__(self, order_repository: OrderRepository):
+    def __init__(
+        self,
+        order_repository: OrderRepository,
+        id_generator: Optional[IdGenerator] = None,
+        read_model: Optional[UserSummaryReadModel] = None,
+        clock: Callable[[], float] = time.time,
+        order_queue: Optional[OrderQueue] = None,
+    ):
         self._order_repository = order_repository
+        self._id_generator = id_generator or UUID4IdGenerator()
+        self._read_model = read_model
+        self._clock = clock
+        self._order_queue = order_queue
+
+    def _build(self, order_id: str, input_data: Dict[str, Any], validated: bool) -> Order:
+        return Order(
+            order_id,
+            input_data.get("user_id"),
+            input_data.get("product"),
+            input_data.get("quantity"),
+            input_data.get("status", "pending"),
+            self._clock(),
+            validated=validated,
+        )
+
+    async def _saved(self, order: Order) -> None:
+        if self._read_model is not None:
+            await self._read_model.order_saved(order)
+        if self._order_queue is None or order.status != "pending":
+            return
+        # The order is already stored; before start-up or during shutdown it
+        # just stays pending rather than failing the request
+        if not self._order_queue.running:
+            logger.info(f"Order processing is not running; order {order.id} stays pending")
+            return
+        await self._order_queue.submit(order)
 
-    async def execute(self, input_data: Dict[str, Any]) -> Order:
-        """Execute order creation"""
-        user_id = input_data.get("user_id")
-        product = input_data.get("product")
-        quantity = input_data.get("quantity")
-        status = input_data.get("status", "pending")
+    async def execute(self, input_data: Dict[str, Any], validated: bool = False) -> Order:
+        """Execute order creation.
 
-        order_id = input_data.get("id") or str(uuid.uuid4())
-        order = Order(order_id, user_id, product, quantity, status)
+        ``validated`` means input_data already passed the request schema,
+        which checks every order rule, so the entity skips its own checks.
+        """
+        order_id = input_data.get("id") or self._id_generator.new_id()
+        order = self._build(order_id, input_data, validated)
 
         await self._order_repository.create(order)
+        await self._saved(order)
         return order
+
+    async def execute_many(
+        self, inputs: Sequence[Dict[str, Any]], validated: bool = False
+    ) -> List[Order]:
+        """Create a batch of orders; every input is validated before any is stored"""
+        ids = self._id_generator.new_ids(len(inputs))
+        orders = [
+            self._build(data.get("id") or order_id, data, validated)
+            for order_id, data in zip(ids, inputs)
+        ]
+
+        for order in orders:
+            await self._order_repository.create(order)
+            await self._saved(order)
+        return orders
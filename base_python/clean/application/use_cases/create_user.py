@@ -1,22 +1,52 @@
-import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence
 from domain.user import User
+from application.ports.id_generator import IdGenerator, UUID4IdGenerator
 from application.ports.user_repository import UserRepository
+from application.ports.user_summary_read_model import UserSummaryReadModel
 
 
 class CreateUserUseCase:
     """Use case for creating users"""
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        id_generator: Optional[IdGenerator] = None,
+        read_model: Optional[UserSummaryReadModel] = None,
+    ):
         self._user_repository = user_repository
+        self._id_generator = id_generator or UUID4IdGenerator()
+        self._read_model = read_model
 
-    async def execute(self, input_data: Dict[str, Any]) -> User:
-        """Execute user creation"""
+    async def execute(self, input_data: Dict[str, Any], validated: bool = False) -> User:
+        """Execute user creation.
+
+        ``validated`` means input_data already passed the request schema,
+        which checks every user rule, so the entity skips its own checks.
+        """
         name = input_data.get("name")
         email = input_data.get("email")
 
-        user_id = str(uuid.uuid4())
-        user = User(user_id, name, email)
+        user_id = self._id_generator.new_id()
+        user = User(user_id, name, email, validated=validated)
 
         await self._user_repository.create(user)
+        if self._read_model is not None:
+            await self._read_model.user_saved(user)
         return user
+
+    async def execute_many(
+        self, inputs: Sequence[Dict[str, Any]], validated: bool = False
+    ) -> List[User]:
+        """Create a batch of users; every input is validated before any is stored"""
+        ids = self._id_generator.new_ids(len(inputs))
+        users = [
+            User(user_id, data.get("name"), data.get("email"), validated=validated)
+            for user_id, data in zip(ids, inputs)
+        ]
+
+        for user in users:
+            await self._user_repository.create(user)
+            if self._read_model is not None:
+                await self._read_model.user_saved(user)
+        return users
@@ -1,11 +1,18 @@
+from typing import Any, Dict, Optional, Sequence
 from application.ports.order_repository import OrderRepository
+from application.ports.user_summary_read_model import UserSummaryReadModel
 
 
 class DeleteOrderUseCase:
     """Use case for deleting orders"""
 
-    def __init__(self, order_repository: OrderRepository):
+    def __init__(
+        self,
+        order_repository: OrderRepository,
+        read_model: Optional[UserSummaryReadModel] = None,
+    ):
         self._order_repository = order_repository
+        self._read_model = read_model
 
     async def execute(self, id: str) -> None:
         """Execute order deletion"""
@@ -15,3 +22,17 @@ class DeleteOrderUseCase:
             raise ValueError("Order not found")
 
         await self._order_repository.delete(id)
+        if self._read_model is not None:
+            await self._read_model.order_deleted(id)
+
+    async def execute_many(self, ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Delete a batch of orders, returning the outcome for each id"""
+        deleted = await self._order_repository.delete_many(ids)
+        if self._read_model is not None:
+            for id, existed in deleted.items():
+                if existed:
+                    await self._read_model.order_deleted(id)
+        return {
+            id: {"status": "deleted" if existed else "not_found"}
+            for id, existed in deleted.items()
+        }
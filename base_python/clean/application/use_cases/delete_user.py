@@ -1,17 +1,64 @@
+from typing import Any, Dict, List, Optional, Sequence
+from application.ports.order_repository import OrderRepository
 from application.ports.user_repository import UserRepository
+from application.ports.user_summary_read_model import UserSummaryReadModel
 
 
 class DeleteUserUseCase:
-    """Use case for deleting users"""
+    """Use case for deleting users, optionally with their orders"""
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        order_repository: Optional[OrderRepository] = None,
+        read_model: Optional[UserSummaryReadModel] = None,
+    ):
         self._user_repository = user_repository
+        self._order_repository = order_repository
+        self._read_model = read_model
 
-    async def execute(self, id: str) -> None:
-        """Execute user deletion"""
+    async def _delete_orders(self, id: str) -> List[str]:
+        if self._order_repository is None:
+            raise ValueError("Cascading delete needs an order repository")
+        order_ids = await self._order_repository.delete_by_user_id(id)
+        if self._read_model is not None:
+            for order_id in order_ids:
+                await self._read_model.order_deleted(order_id)
+        return order_ids
+
+    async def execute(self, id: str, cascade: bool = False) -> List[str]:
+        """Execute user deletion, returning the ids of cascaded orders"""
         user = await self._user_repository.find_by_id(id)
 
         if not user:
             raise ValueError("User not found")
 
+        # Orders go first so a failure never leaves orphans behind
+        order_ids = await self._delete_orders(id) if cascade else []
         await self._user_repository.delete(id)
+        if self._read_model is not None:
+            await self._read_model.user_deleted(id)
+        return order_ids
+
+    async def execute_many(
+        self, ids: Sequence[str], cascade: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """Delete a batch of users, returning the outcome for each id"""
+        ids = list(dict.fromkeys(ids))
+        cascaded: Dict[str, List[str]] = {}
+        if cascade:
+            for id in ids:
+                cascaded[id] = await self._delete_orders(id)
+
+        deleted = await self._user_repository.delete_many(ids)
+        if self._read_model is not None:
+            for id in ids:
+                if deleted.get(id):
+                    await self._read_model.user_deleted(id)
+        results: Dict[str, Dict[str, Any]] = {}
+        for id in ids:
+            outcome: Dict[str, Any] = {"status": "deleted" if deleted.get(id) else "not_found"}
+            if cascade:
+                outcome["orders_deleted"] = cascaded[id]
+            results[id] = outcome
+        return results
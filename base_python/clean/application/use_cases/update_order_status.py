@@ -0,0 +1,21 @@
+from typing import Any, Dict, Sequence
+from domain.order import ORDER_STATUSES
+from application.ports.order_repository import OrderRepository
+
+
+class UpdateOrderStatusUseCase:
+    """Use case for moving orders to a new status"""
+
+    def __init__(self, order_repository: OrderRepository):
+        self._order_repository = order_repository
+
+    async def execute_many(self, ids: Sequence[str], status: str) -> Dict[str, Dict[str, Any]]:
+        """Move a batch of orders to status, returning the outcome for each id.
+
+        Outcomes are ``updated``, ``unchanged``, ``not_found`` and
+        ``invalid_transition``; the repository applies the batch at once.
+        """
+        if status not in ORDER_STATUSES:
+            raise ValueError(f"Status must be one of: {', '.join(ORDER_STATUSES)}")
+        outcomes = await self._order_repository.update_status(ids, status)
+        return {id: {"result": outcome} for id, outcome in outcomes.items()}
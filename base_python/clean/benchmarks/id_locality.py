@@ -0,0 +1,112 @@
+"""
+Insert-locality benchmark for ID generation strategies.
+
+Compares random UUIDv4 IDs with time-ordered UUIDv7 and ULID IDs on:
+
+- generation cost, one at a time and through the bulk ``new_ids`` path;
+- a sorted in-memory index (bisect.insort into a list, as the repository
+  indexes do), reporting how many inserts land at the tail;
+- a SQLite table keyed by a TEXT primary key, reporting insert time and
+  the resulting database size.
+
+Run from the clean/ directory:
+
+    python -m benchmarks.id_locality --rows 200000 --batch 500
+"""
+
+import argparse
+import bisect
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List
+
+from application.ports.id_generator import IdGenerator, UUID4IdGenerator
+from infrastructure.ids.time_ordered import ULIDIdGenerator, UUID7IdGenerator
+
+GENERATORS: Dict[str, IdGenerator] = {
+    "uuid4": UUID4IdGenerator(),
+    "uuid7": UUID7IdGenerator(),
+    "ulid": ULIDIdGenerator(),
+}
+
+
+def generate(generator: IdGenerator, rows: int, batch: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    for _ in range(rows):
+        generator.new_id()
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(rows // batch):
+        generator.new_ids(batch)
+    bulk = time.perf_counter() - started
+    return {
+        "single_us": single / rows * 1e6,
+        "bulk_us": bulk / (rows // batch * batch) * 1e6,
+    }
+
+
+def sorted_index(ids: List[str]) -> Dict[str, float]:
+    index: List[str] = []
+    tail_inserts = 0
+    started = time.perf_counter()
+    for value in ids:
+        position = bisect.bisect_right(index, value)
+        if position == len(index):
+            tail_inserts += 1
+        index.insert(position, value)
+    elapsed = time.perf_counter() - started
+    return {"insert_s": elapsed, "tail_pct": tail_inserts / len(ids) * 100}
+
+
+def sqlite_primary_key(ids: List[str], batch: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ids.db")
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute(
+            "CREATE TABLE orders (id TEXT PRIMARY KEY, product TEXT, quantity INTEGER) WITHOUT ROWID"
+        )
+        started = time.perf_counter()
+        for start in range(0, len(ids), batch):
+            with connection:
+                connection.executemany(
+                    "INSERT INTO orders VALUES (?, 'widget', 1)",
+                    ((value,) for value in ids[start : start + batch]),
+                )
+        elapsed = time.perf_counter() - started
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        pages = connection.execute("PRAGMA page_count").fetchone()[0]
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        connection.close()
+    return {"insert_s": elapsed, "size_mb": pages * page_size / 1e6}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    args = parser.parse_args()
+
+    print(
+        f"{'generator':<10} {'new_id us':>10} {'new_ids us':>11} "
+        f"{'index s':>9} {'tail %':>8} {'sqlite s':>9} {'sqlite MB':>10}"
+    )
+    for name in args.generators:
+        generator = GENERATORS[name]
+        generation = generate(generator, args.rows, args.batch)
+        ids = generator.new_ids(args.rows)
+        index = sorted_index(ids)
+        sqlite = sqlite_primary_key(ids, args.batch)
+        print(
+            f"{name:<10} {generation['single_us']:>10.2f} {generation['bulk_us']:>11.2f} "
+            f"{index['insert_s']:>9.3f} {index['tail_pct']:>8.1f} "
+            f"{sqlite['insert_s']:>9.3f} {sqlite['size_mb']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
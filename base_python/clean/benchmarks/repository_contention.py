@@ -0,0 +1,126 @@
+"""
+Multi-threaded contention benchmark for the in-memory user repositories.
+
+Compares ThreadSafeInMemoryUserRepository (lock striping) with the same
+repository guarded by a single global lock, under a mixed workload of
+point reads, creates, deletes and occasional full snapshots.
+
+Run from the clean/ directory:
+
+    python -m benchmarks.repository_contention --threads 1 2 4 8 --ops 20000
+"""
+
+import argparse
+import random
+import threading
+import time
+import uuid
+from typing import List
+
+from domain.user import User
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from infrastructure.repositories.thread_safe_user_repository import (
+    ThreadSafeInMemoryUserRepository,
+)
+
+
+def run_sync(coro):
+    """Drive a repository coroutine that never suspends"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("Repository coroutine suspended unexpectedly")
+
+
+class GlobalLockUserRepository(InMemoryUserRepository):
+    """Baseline: every operation takes the same lock"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    async def create(self, user: User) -> None:
+        with self._lock:
+            await super().create(user)
+
+    async def find_by_id(self, id: str):
+        with self._lock:
+            return await super().find_by_id(id)
+
+    async def find_all(self):
+        with self._lock:
+            return await super().find_all()
+
+    async def delete(self, id: str) -> None:
+        with self._lock:
+            await super().delete(id)
+
+
+def worker(repository, ids: List[str], ops: int, seed: int, hold: float) -> None:
+    rng = random.Random(seed)
+    own: List[str] = []
+    for _ in range(ops):
+        roll = rng.random()
+        if roll < 0.80:
+            run_sync(repository.find_by_id(rng.choice(ids)))
+        elif roll < 0.93:
+            user_id = str(uuid.uuid4())
+            run_sync(repository.create(User(user_id, "Bench User", "bench@example.com")))
+            own.append(user_id)
+        elif roll < 0.99 and own:
+            run_sync(repository.delete(own.pop()))
+        else:
+            run_sync(repository.find_all())
+        if hold:
+            # Simulated request work between repository calls (releases the GIL)
+            time.sleep(hold)
+
+
+def bench(factory, threads: int, ops: int, preload: int, hold: float) -> float:
+    repository = factory()
+    ids = []
+    for i in range(preload):
+        user_id = str(uuid.uuid4())
+        run_sync(repository.create(User(user_id, f"User {i}", f"user{i}@example.com")))
+        ids.append(user_id)
+
+    per_thread = ops // threads
+    pool = [
+        threading.Thread(target=worker, args=(repository, ids, per_thread, seed, hold))
+        for seed in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repository lock contention benchmark")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--ops", type=int, default=20000, help="total operations per run")
+    parser.add_argument("--preload", type=int, default=1000, help="users created up front")
+    parser.add_argument("--hold-us", type=float, default=0.0,
+                        help="simulated work between operations, in microseconds")
+    parser.add_argument("--stripes", type=int, default=16)
+    args = parser.parse_args()
+
+    hold = args.hold_us / 1_000_000
+    candidates = {
+        "global lock": GlobalLockUserRepository,
+        f"striped ({args.stripes})": lambda: ThreadSafeInMemoryUserRepository(args.stripes),
+    }
+
+    print(f"{'threads':>8}  " + "  ".join(f"{name:>16}" for name in candidates))
+    for threads in args.threads:
+        results = [bench(factory, threads, args.ops, args.preload, hold)
+                   for factory in candidates.values()]
+        print(f"{threads:>8}  " + "  ".join(f"{ops:>12,.0f} op/s" for ops in results))
+
+
+if __name__ == "__main__":
+    main()
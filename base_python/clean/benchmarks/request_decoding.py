@@ -0,0 +1,109 @@
+"""
+Request decoding benchmark.
+
+Compares two ways of turning a raw JSON body into validated entities:
+
+- ``dict``: ``json.loads`` into untyped dicts, then ``.get`` lookups and the
+  entity constructor (how the create routes worked before the schemas);
+- ``schema``: one pydantic-core pass from bytes to checked dicts using the
+  compiled request schemas, then the entity constructor with
+  ``validated=True``, as the create routes do.
+
+Each batch is a JSON array of N create-user or create-order payloads, as
+sent to the batch create routes (at most MAX_BATCH_SIZE items); results
+are reported per item. Run from the clean/ directory:
+
+    python -m benchmarks.request_decoding --sizes 1,10,100,1000
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, List
+
+from domain.order import Order
+from domain.user import User
+from infrastructure.http.schemas import create_orders_schema, create_users_schema
+
+
+def user_payloads(count: int) -> bytes:
+    return json.dumps(
+        [{"name": f"User {i}", "email": f"user{i}@example.com"} for i in range(count)]
+    ).encode()
+
+
+def order_payloads(count: int) -> bytes:
+    return json.dumps(
+        [
+            {"user_id": f"user-{i % 97}", "product": f"Product {i}", "quantity": i % 9 + 1}
+            for i in range(count)
+        ]
+    ).encode()
+
+
+def users_via_dict(raw: bytes) -> List[User]:
+    return [User(str(i), data.get("name"), data.get("email")) for i, data in enumerate(json.loads(raw))]
+
+
+def users_via_schema(raw: bytes) -> List[User]:
+    return [
+        User(str(i), data["name"], data["email"], validated=True)
+        for i, data in enumerate(create_users_schema.validate_json(raw))
+    ]
+
+
+def orders_via_dict(raw: bytes) -> List[Order]:
+    return [
+        Order(str(i), data.get("user_id"), data.get("product"), data.get("quantity"), data.get("status", "pending"))
+        for i, data in enumerate(json.loads(raw))
+    ]
+
+
+def orders_via_schema(raw: bytes) -> List[Order]:
+    return [
+        Order(
+            str(i),
+            data["user_id"],
+            data["product"],
+            data["quantity"],
+            data.get("status", "pending"),
+            validated=True,
+        )
+        for i, data in enumerate(create_orders_schema.validate_json(raw))
+    ]
+
+
+def measure(decode: Callable[[bytes], list], raw: bytes, size: int, items: int) -> float:
+    """Best-of-three microseconds per item, over at least ``items`` items"""
+    repeats = max(1, items // size)
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            decode(raw)
+        best = min(best, time.perf_counter() - started)
+    return best / (repeats * size) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1,10,100,1000")
+    parser.add_argument("--items", type=int, default=50000, help="items decoded per measurement")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    cases = {
+        "user": (user_payloads, users_via_dict, users_via_schema),
+        "order": (order_payloads, orders_via_dict, orders_via_schema),
+    }
+    print(f"{'entity':<8}{'batch':>8}{'dict us/item':>15}{'schema us/item':>17}{'speedup':>10}")
+    for entity, (payloads, via_dict, via_schema) in cases.items():
+        for size in sizes:
+            raw = payloads(size)
+            baseline = measure(via_dict, raw, size, args.items)
+            compiled = measure(via_schema, raw, size, args.items)
+            print(f"{entity:<8}{size:>8}{baseline:>15.3f}{compiled:>17.3f}{baseline / compiled:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
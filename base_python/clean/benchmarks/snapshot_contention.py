@@ -0,0 +1,72 @@
+"""
+Multi-threaded contention benchmark for the stores under the striped repository.
+
+Runs the mixed workload of benchmarks.repository_contention against
+ThreadSafeInMemoryUserRepository backed by:
+
+- ``dict``: a plain dict, the striping baseline;
+- ``snapshot``: the SnapshotStore, whose writers publish with one
+  compare-and-swap and never wait on each other;
+- ``snapshot, write lock``: the same store with every write serialized
+  by one lock, as it was before;
+
+next to the single global lock repository. Run from the clean/ directory:
+
+    python -m benchmarks.snapshot_contention --threads 1 2 4 8 --ops 20000 --hold-us 50
+"""
+
+import argparse
+import threading
+
+from benchmarks.repository_contention import GlobalLockUserRepository, bench
+from infrastructure.repositories.snapshot_store import SnapshotStore
+from infrastructure.repositories.thread_safe_user_repository import (
+    ThreadSafeInMemoryUserRepository,
+)
+
+
+class WriteLockedSnapshotStore(SnapshotStore):
+    """Baseline: every write to the store takes one lock"""
+
+    def __init__(self):
+        super().__init__()
+        self._write_lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        with self._write_lock:
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        with self._write_lock:
+            super().__delitem__(key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store contention benchmark")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--ops", type=int, default=20000, help="total operations per run")
+    parser.add_argument("--preload", type=int, default=1000, help="users created up front")
+    parser.add_argument("--hold-us", type=float, default=0.0,
+                        help="simulated work between operations, in microseconds")
+    parser.add_argument("--stripes", type=int, default=16)
+    args = parser.parse_args()
+
+    hold = args.hold_us / 1_000_000
+    candidates = {
+        "global lock": GlobalLockUserRepository,
+        "dict": lambda: ThreadSafeInMemoryUserRepository(args.stripes, {}),
+        "snapshot": lambda: ThreadSafeInMemoryUserRepository(args.stripes, SnapshotStore()),
+        "snapshot, write lock": lambda: ThreadSafeInMemoryUserRepository(
+            args.stripes, WriteLockedSnapshotStore()
+        ),
+    }
+
+    print(f"{'threads':>8}  " + "  ".join(f"{name:>20}" for name in candidates))
+    for threads in args.threads:
+        results = [bench(factory, threads, args.ops, args.preload, hold)
+                   for factory in candidates.values()]
+        print(f"{threads:>8}  " + "  ".join(f"{ops:>16,.0f} op/s" for ops in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Listing benchmark for the in-memory order repository's storage.
+
+Compares the default SnapshotStore with a plain dict (the previous
+storage) on what a paging client pays per request, a full find_all, and
+the cost a persistent tree adds to every write.
+
+Run from the clean/ directory:
+
+    python -m benchmarks.snapshot_listing --sizes 10000 100000 --page 50
+"""
+
+import argparse
+import time
+
+from domain.order import Order
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.snapshot_store import SnapshotStore
+from benchmarks.repository_contention import run_sync
+
+
+def timed(function, repeat: int) -> float:
+    """Mean seconds per call"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat
+
+
+def bench(store_factory, size: int, page: int, repeat: int):
+    repository = InMemoryOrderRepository(store_factory())
+    orders = [Order(f"order-{i:09d}", "user-1", "Widget", 1) for i in range(size)]
+    started = time.perf_counter()
+    for order in orders:
+        run_sync(repository.create(order))
+    write = (time.perf_counter() - started) / size
+    middle = orders[size // 2].id
+    first_page = timed(lambda: run_sync(repository.find_page(middle, page)), repeat)
+    find_all = timed(lambda: run_sync(repository.find_all()), max(1, repeat // 100))
+    return write, first_page, find_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot listing benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    candidates = {"dict": dict, "SnapshotStore": SnapshotStore}
+    print(f"{'size':>9}  {'store':>14}  {'create':>10}  {'find_page':>10}  {'find_all':>10}")
+    for size in args.sizes:
+        for name, factory in candidates.items():
+            write, page, full = bench(factory, size, args.page, args.repeat)
+            print(
+                f"{size:>9,}  {name:>14}  {write * 1e6:>8.2f}us"
+                f"  {page * 1e6:>8.1f}us  {full * 1e3:>8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
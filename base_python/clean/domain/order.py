@@ -1,16 +1,45 @@
-from typing import Dict
+import re
+from typing import Dict, Iterable, Optional
+
+from domain.text import stripped_min_length_pattern
+
+# Business rules, shared with the request schemas that pre-check them
+PRODUCT_MIN_LENGTH = 2
+# At least PRODUCT_MIN_LENGTH characters once surrounding whitespace is stripped
+PRODUCT_PATTERN = stripped_min_length_pattern(PRODUCT_MIN_LENGTH)
+_PRODUCT_REGEX = re.compile(PRODUCT_PATTERN)
+ORDER_STATUSES = ("pending", "completed")
+# Status changes an order may go through
+STATUS_TRANSITIONS = {"pending": ("completed",), "completed": ()}
 
 
 class Order:
     """Order entity with business rules"""
 
-    def __init__(self, id: str, user_id: str, product: str, quantity: int, status: str = "pending"):
+    FIELDS = ("id", "user_id", "product", "quantity", "status", "created_at")
+
+    def __init__(
+        self,
+        id: str,
+        user_id: str,
+        product: str,
+        quantity: int,
+        status: str = "pending",
+        created_at: Optional[float] = None,
+        *,
+        validated: bool = False,
+    ):
         self.id = id
         self.user_id = user_id
         self.product = product
         self.quantity = quantity
         self.status = status
-        self._validate()
+        # Creation time in seconds since the epoch, if known
+        self.created_at = created_at
+        # validated: the values already passed these rules (the request
+        # schemas check every one), so they are not checked a second time
+        if not validated:
+            self._validate()
 
     def _validate(self) -> None:
         """Validate order data"""
@@ -20,21 +49,35 @@ class Order:
         if not self.user_id:
             raise ValueError("User ID is required")
 
-        if not self.product or len(self.product.strip()) < 2:
+        if not isinstance(self.product, str) or _PRODUCT_REGEX.fullmatch(self.product) is None:
             raise ValueError("Product must be at least 2 characters long")
 
         if self.quantity <= 0:
             raise ValueError("Quantity must be greater than 0")
         
-        if self.status not in ["pending", "completed"]:
+        if self.status not in ORDER_STATUSES:
             raise ValueError("Status must be either 'pending' or 'completed'")
 
-    def to_dict(self) -> Dict:
-        """Convert order to dictionary"""
+        if self.created_at is not None and (
+            not isinstance(self.created_at, (int, float)) or self.created_at < 0
+        ):
+            raise ValueError("Creation time must be a non-negative timestamp")
+
+    def with_status(self, status: str) -> "Order":
+        """A copy of the order moved to status, if that transition is allowed"""
+        if status not in STATUS_TRANSITIONS.get(self.status, ()):
+            raise ValueError(f"Cannot change status from '{self.status}' to '{status}'")
+        return Order(self.id, self.user_id, self.product, self.quantity, status, self.created_at)
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict:
+        """Convert order to dictionary, optionally with only the given fields"""
+        if fields is not None:
+            return {field: getattr(self, field) for field in fields}
         return {
             "id": self.id,
             "user_id": self.user_id,
             "product": self.product,
             "quantity": self.quantity,
             "status": self.status,
+            "created_at": self.created_at,
         }
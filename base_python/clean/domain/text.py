@@ -0,0 +1,16 @@
+# Every character str.isspace() (and so str.strip()) treats as whitespace,
+# spelled out because the \s of Python's re and of pydantic-core's Rust
+# regex engine differ (\x1c-\x1f), and the domain rules and the request
+# schemas must accept exactly the same strings
+WHITESPACE = r"\t-\r\x1c-\x20\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+
+
+def stripped_min_length_pattern(min_length: int) -> str:
+    """Pattern of strings at least min_length (>= 2) long once stripped.
+
+    Written for both engines: anchored with ^ and $ and matched whole
+    (``re.fullmatch``), so a trailing newline is never skipped by $.
+    """
+    if min_length < 2:
+        raise ValueError("min_length must be at least 2")
+    return rf"(?s)^[{WHITESPACE}]*[^{WHITESPACE}].{{{min_length - 2},}}[^{WHITESPACE}][{WHITESPACE}]*$"
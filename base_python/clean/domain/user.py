@@ -1,22 +1,37 @@
 import re
-from typing import Dict
+from typing import Dict, Iterable, Optional
+
+from domain.text import WHITESPACE, stripped_min_length_pattern
+
+# Business rules, shared with the request schemas that pre-check them
+NAME_MIN_LENGTH = 2
+# At least NAME_MIN_LENGTH characters once surrounding whitespace is stripped
+NAME_PATTERN = stripped_min_length_pattern(NAME_MIN_LENGTH)
+EMAIL_PATTERN = rf"^[^{WHITESPACE}@]+@[^{WHITESPACE}@]+\.[^{WHITESPACE}@]+$"
+_NAME_REGEX = re.compile(NAME_PATTERN)
+_EMAIL_REGEX = re.compile(EMAIL_PATTERN)
 
 
 class User:
     """User entity with business rules"""
 
-    def __init__(self, id: str, name: str, email: str):
+    FIELDS = ("id", "name", "email")
+
+    def __init__(self, id: str, name: str, email: str, *, validated: bool = False):
         self.id = id
         self.name = name
         self.email = email
-        self._validate()
+        # validated: the values already passed these rules (the request
+        # schemas check every one), so they are not checked a second time
+        if not validated:
+            self._validate()
 
     def _validate(self) -> None:
         """Validate user data"""
         if not self.id:
             raise ValueError("User ID is required")
 
-        if not self.name or len(self.name.strip()) < 2:
+        if not isinstance(self.name, str) or _NAME_REGEX.fullmatch(self.name) is None:
             raise ValueError("Name must be at least 2 characters long")
 
         if not self._is_valid_email():
@@ -24,9 +39,10 @@ class User:
 
     def _is_valid_email(self) -> bool:
         """Check if email is valid"""
-        email_regex = r"^[^\s@]+@[^\s@]+\.[^\s@]+$"
-        return re.match(email_regex, self.email) is not None
+        return isinstance(self.email, str) and _EMAIL_REGEX.fullmatch(self.email) is not None
 
-    def to_dict(self) -> Dict:
-        """Convert user to dictionary"""
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict:
+        """Convert user to dictionary, optionally with only the given fields"""
+        if fields is not None:
+            return {field: getattr(self, field) for field in fields}
         return {"id": self.id, "name": self.name, "email": self.email}
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+import threading
+from contextlib import suppress
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """Coroutines run on one event loop thread for a WSGI application.
+
+    WSGI has no lifespan hook, so ``start`` is meant to be called on every
+    request: the first call in each process starts the thread and later
+    ones return at once. Starting on a request rather than when the app is
+    created means creating apps (in tests, or in a pre-fork server master)
+    leaves no thread behind, and each worker process gets its own. ``stop``
+    cancels the tasks and joins the thread; the tasks are not started again
+    afterwards.
+    """
+
+    def __init__(self, name: str = "background"):
+        self.name = name
+        self._factories: List[Callable[[], Awaitable[None]]] = []
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._loop_ready = threading.Event()
+
+    def add(self, factory: Callable[[], Awaitable[None]]) -> None:
+        """Run factory() as a task once the thread starts"""
+        self._factories.append(factory)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the tasks once per process; later calls do nothing"""
+        if self._pid == os.getpid() or self._stopped:
+            return
+        with self._lock:
+            if self._pid == os.getpid() or self._stopped:
+                return
+            self._pid = os.getpid()
+            self._loop_ready.clear()
+            self._thread = threading.Thread(
+                target=asyncio.run, args=(self._main(),), name=self.name, daemon=True
+            )
+            self._thread.start()
+
+    async def _main(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        tasks = [asyncio.create_task(factory()) for factory in self._factories]
+        self._loop_ready.set()
+        try:
+            await self._stop_event.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    logger.warning(f"Background task failed: {outcome!r}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel the tasks and wait up to timeout for the thread to end"""
+        with self._lock:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+        if thread is None or self._pid != os.getpid():
+            return
+        self._loop_ready.wait(timeout)
+        if self._loop is not None:
+            # The loop is already closed if every task ended on its own
+            with suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+        thread.join(timeout)
@@ -1,30 +1,181 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from typing import Optional
+import asyncio
+import json
+import re
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Dict, List, Optional, Sequence
 from application.use_cases.create_user import CreateUserUseCase
 from application.use_cases.delete_user import DeleteUserUseCase
 from application.use_cases.create_order import CreateOrderUseCase
 from application.use_cases.delete_order import DeleteOrderUseCase
+from application.use_cases.update_order_status import UpdateOrderStatusUseCase
+from application.ports.id_generator import IdGenerator
+from infrastructure.ids.time_ordered import UUID7IdGenerator
 from infrastructure.repositories.in_memory_user_repository import (
     InMemoryUserRepository,
 )
 from infrastructure.repositories.in_memory_order_repository import (
     InMemoryOrderRepository,
 )
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.spilling_store import entity_store_from_env
 from application.ports.user_repository import UserRepository
 from application.ports.order_repository import OrderRepository
+from application.ports.user_summary_read_model import UserSummaryReadModel, UserWithOrderSummary
+from infrastructure.repositories.in_memory_user_summary_read_model import (
+    InMemoryUserSummaryReadModel,
+)
+from shared.http.load_shedding import LoadShedder, LoadSheddingMiddleware
+from shared.http.compression import CompressionMiddleware
+from shared.http.profiling import ProfilingMiddleware, RequestProfiler
+from shared.http.tracing import TracingMiddleware
+from shared.http.health import HealthMonitor, LivenessMiddleware
+from shared.http.warmup import WarmUp
+from infrastructure.processing.order_processor import OrderProcessor
+from infrastructure.http.schemas import (
+    MAX_BATCH_SIZE,
+    create_order_schema,
+    create_orders_schema,
+    create_user_schema,
+    create_users_schema,
+    decode_request,
+    request_body_openapi,
+    update_order_status_schema,
+)
+from infrastructure.tracing.instrumentation import (
+    instrument_repository,
+    instrument_use_case,
+)
+from shared.tracing.tracer import tracer_from_env
+from domain.user import User
+from domain.order import ORDER_STATUSES, Order
 import os
 
 
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Parse a ?fields=a,b sparse fieldset, rejecting unknown fields"""
+    if fields is None:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if not requested or unknown:
+        invalid = ", ".join(unknown) if unknown else repr(fields)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {invalid}. Allowed: {', '.join(allowed)}",
+        )
+    return requested
+
+
+_BUCKET_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_BUCKET_PATTERN = re.compile(r"^(\d+)([smhd])$")
+MAX_TIMESERIES_BUCKETS = 10000
+
+
+def parse_bucket(bucket: str) -> int:
+    """Parse a bucket width such as 30s, 5m, 1h or 1d into seconds"""
+    match = _BUCKET_PATTERN.match(bucket)
+    if not match or int(match.group(1)) == 0:
+        raise HTTPException(
+            status_code=400, detail="Invalid bucket: use <n>s, <n>m, <n>h or <n>d"
+        )
+    return int(match.group(1)) * _BUCKET_UNITS[match.group(2)]
+
+
+def parse_ids(data: dict) -> List[str]:
+    """Validate a {"ids": [...]} batch request body"""
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not ids or not all(isinstance(id, str) for id in ids):
+        raise HTTPException(status_code=400, detail='Body must be {"ids": ["<id>", ...]}')
+    if len(ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} ids per request")
+    return ids
+
+
+async def stream_json_array(
+    items: AsyncIterator[Dict], chunk_size: int = 100
+) -> AsyncIterator[bytes]:
+    """Encode an async stream of dicts as one JSON array, a chunk at a time"""
+    chunk = []
+    first = True
+    async for item in items:
+        chunk.append(json.dumps(item, separators=(",", ":")))
+        if len(chunk) >= chunk_size:
+            yield (b"[" if first else b",") + ",".join(chunk).encode()
+            chunk, first = [], False
+    if chunk:
+        yield (b"[" if first else b",") + ",".join(chunk).encode()
+        first = False
+    yield b"[]" if first else b"]"
+
+
 def create_fastapi_app(
     custom_user_repository: Optional[UserRepository] = None,
     custom_order_repository: Optional[OrderRepository] = None,
+    load_shedder: Optional[LoadShedder] = None,
+    compression_minimum_size: int = 1024,
+    profiler: Optional[RequestProfiler] = None,
+    tracer=None,
+    id_generator: Optional[IdGenerator] = None,
+    warm_up: Optional[WarmUp] = None,
+    preload_ids: Optional[Dict[str, Sequence[str]]] = None,
+    health_monitor: Optional[HealthMonitor] = None,
+    change_log: Optional[ChangeLog] = None,
+    read_model: Optional[UserSummaryReadModel] = None,
+    order_processor: Optional[OrderProcessor] = None,
 ) -> FastAPI:
     """FastAPI application factory"""
 
-    app = FastAPI(title="Clean Architecture API")
+    # Startup warm-up runs in the background; /ready stays 503 until it is done
+    warm_up = warm_up or WarmUp()
+    # Dependency checks run on an interval; /health/deep serves the cached result
+    health_monitor = health_monitor or HealthMonitor(
+        interval=float(os.environ.get("HEALTH_CHECK_INTERVAL", "10"))
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        tasks = [asyncio.create_task(warm_up.run()), asyncio.create_task(health_monitor.run())]
+        if order_processor is not None:
+            order_processor.start()
+        yield
+        # Drain queued orders before the repositories go away
+        if order_processor is not None:
+            await order_processor.stop(
+                float(os.environ.get("ORDER_PROCESSING_DRAIN_TIMEOUT", "10"))
+            )
+        # Stop the shard worker processes once nothing can reach them
+        if shard_pool is not None:
+            await asyncio.to_thread(shard_pool.close)
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    app = FastAPI(title="Clean Architecture API", lifespan=lifespan)
+
+    # Negotiated gzip/brotli for list payloads; health probes are skipped
+    app.add_middleware(CompressionMiddleware, minimum_size=compression_minimum_size)
+
+    # On-demand (admin-guarded) and 1-in-N sampled request profiling
+    profiler = profiler or RequestProfiler.from_env()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    # Per-route concurrency limits, shedding excess load with 503
+    load_shedder = load_shedder or LoadShedder()
+    app.add_middleware(LoadSheddingMiddleware, shedder=load_shedder)
+
+    # Tracing is only wired in when a tracer is configured, so it costs
+    # nothing when disabled
+    tracer = tracer if tracer is not None else tracer_from_env("clean-architecture")
+    if tracer is not None:
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+
+    # Liveness is answered outermost with a prebuilt response
+    app.add_middleware(LivenessMiddleware)
 
     # Setup templates
     templates_dir = os.path.join(os.path.dirname(__file__), "templates")
@@ -40,14 +191,112 @@ def create_fastapi_app(
         templates = None
 
     # Initialize repositories
-    user_repository = custom_user_repository or InMemoryUserRepository()
-    order_repository = custom_order_repository or InMemoryOrderRepository()
+    # REPOSITORY_BACKEND=dynamodb swaps in the DynamoDB adapters (imported
+    # lazily so in-memory deployments do not need boto3)
+    if os.environ.get("REPOSITORY_BACKEND") == "dynamodb" and not (
+        custom_user_repository or custom_order_repository
+    ):
+        from infrastructure.repositories.dynamodb import dynamodb_repositories_from_env
+
+        custom_user_repository, custom_order_repository = dynamodb_repositories_from_env()
+    # REPOSITORY_BACKEND=partitioned shards the in-memory repositories
+    # across REPOSITORY_SHARDS worker processes (default: one per core)
+    shard_pool = None
+    if os.environ.get("REPOSITORY_BACKEND") == "partitioned" and not (
+        custom_user_repository or custom_order_repository
+    ):
+        from infrastructure.repositories.shard_pool import ShardPool, partitioned_repositories
+
+        shards = os.environ.get("REPOSITORY_SHARDS")
+        shard_pool = ShardPool(int(shards) if shards else None)
+        custom_user_repository, custom_order_repository = partitioned_repositories(shard_pool)
+    # The built-in repositories publish their writes to one change feed.
+    # Other backends (DynamoDB, partitioned, custom) do not, so the feed is
+    # switched off for them rather than served empty, unless the caller
+    # passes a change_log it publishes to itself
+    change_feed_enabled = change_log is not None or not (
+        custom_user_repository or custom_order_repository
+    )
+    change_log = change_log or ChangeLog()
+    # REPOSITORY_MAX_ENTRIES / REPOSITORY_MAX_BYTES bound the in-memory
+    # repositories, spilling cold entities to disk
+    user_repository = instrument_repository(
+        custom_user_repository
+        or InMemoryUserRepository(entity_store_from_env(User, "users"), change_log),
+        tracer,
+        "UserRepository",
+    )
+    order_repository = instrument_repository(
+        custom_order_repository
+        or InMemoryOrderRepository(entity_store_from_env(Order, "orders"), change_log),
+        tracer,
+        "OrderRepository",
+    )
+
+    # Background completion of pending orders, enabled by
+    # ORDER_PROCESSING_WORKERS (off by default)
+    order_processor = order_processor or OrderProcessor.from_env(order_repository)
+
+    # Time-ordered IDs keep sorted indexes append-mostly
+    id_generator = id_generator or UUID7IdGenerator()
+
+    # Users joined with their order totals, maintained by the use cases
+    read_model = read_model or InMemoryUserSummaryReadModel()
 
     # Initialize use cases
-    create_user_use_case = CreateUserUseCase(user_repository)
-    delete_user_use_case = DeleteUserUseCase(user_repository)
-    create_order_use_case = CreateOrderUseCase(order_repository)
-    delete_order_use_case = DeleteOrderUseCase(order_repository)
+    create_user_use_case = instrument_use_case(
+        CreateUserUseCase(user_repository, id_generator, read_model), tracer
+    )
+    delete_user_use_case = instrument_use_case(
+        DeleteUserUseCase(user_repository, order_repository, read_model), tracer
+    )
+    create_order_use_case = instrument_use_case(
+        CreateOrderUseCase(
+            order_repository, id_generator, read_model, order_queue=order_processor
+        ),
+        tracer,
+    )
+    delete_order_use_case = instrument_use_case(
+        DeleteOrderUseCase(order_repository, read_model), tracer
+    )
+    update_order_status_use_case = instrument_use_case(
+        UpdateOrderStatusUseCase(order_repository), tracer
+    )
+
+    # Warm-up tasks: compile templates and the OpenAPI schema up front and
+    # optionally fault hot entities into memory
+    def compile_templates():
+        for name in os.listdir(templates_dir):
+            if name.endswith(".html"):
+                templates.get_template(name)
+
+    if templates is not None:
+        warm_up.add("templates", compile_templates)
+    warm_up.add("openapi", app.openapi)
+
+    # Seed the read model from repositories that may already hold data
+    async def build_read_model():
+        await read_model.rebuild(user_repository.iter_all(), order_repository.iter_all())
+
+    warm_up.add("user_summary", build_read_model)
+
+    async def check_user_repository():
+        await user_repository.ping()
+
+    async def check_order_repository():
+        await order_repository.ping()
+
+    health_monitor.add("user_repository", check_user_repository)
+    health_monitor.add("order_repository", check_order_repository)
+
+    if preload_ids:
+        async def preload_entities():
+            for user_id in preload_ids.get("users", ()):
+                await user_repository.find_by_id(user_id)
+            for order_id in preload_ids.get("orders", ()):
+                await order_repository.find_by_id(order_id)
+
+        warm_up.add("preload", preload_entities, required=False)
 
     # Health check - Web UI
     @app.get("/health", response_class=HTMLResponse)
@@ -64,6 +313,62 @@ def create_fastapi_app(
     def health_check_api():
         return {"status": "healthy", "message": "health from clean architecture"}
 
+    # Deep health - cached dependency checks, never calls a backend itself
+    @app.get("/health/deep")
+    def deep_health():
+        report = health_monitor.snapshot()
+        return JSONResponse(report, status_code=200 if report["status"] == "healthy" else 503)
+
+    # Readiness - separate from liveness, only 200 once warm-up has finished
+    @app.get("/ready")
+    def readiness():
+        return JSONResponse(warm_up.status(), status_code=200 if warm_up.ready else 503)
+
+    # Load shedding counters - API
+    @app.get("/api/metrics/load-shedding")
+    def load_shedding_metrics():
+        return load_shedder.stats()
+
+    # Order processing queue depth, throughput and latency - API
+    @app.get("/api/metrics/order-processing")
+    def order_processing_metrics():
+        return order_processor.stats() if order_processor is not None else {"running": False}
+
+    # Change feed - API, long-polled with ?wait=
+    @app.get("/api/changes")
+    async def get_changes(
+        since: int = Query(0, ge=0),
+        wait: float = Query(0, ge=0, le=60),
+        limit: int = Query(1000, ge=1, le=10000),
+    ):
+        if not change_feed_enabled:
+            raise HTTPException(
+                status_code=501, detail="The change feed requires the in-memory repositories"
+            )
+        if wait and change_log.last_seq <= since:
+            await change_log.wait_async(since, wait)
+        return change_log.since(since, limit)
+
+    # Profiling - Admin API
+    def require_admin(x_admin_token: Optional[str] = Header(None)):
+        if not profiler.is_authorized(x_admin_token):
+            raise HTTPException(status_code=403, detail="Admin token required")
+
+    @app.get("/api/admin/profiles", dependencies=[Depends(require_admin)])
+    def list_profiles():
+        return profiler.list()
+
+    @app.get("/api/admin/profiles/hot-stacks", dependencies=[Depends(require_admin)])
+    def hot_stacks(limit: int = Query(50, ge=1, le=1000)):
+        return profiler.hot_stacks(limit)
+
+    @app.get("/api/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+    def get_profile(profile_id: str):
+        profile = profiler.get(profile_id)
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return profile
+
     # User endpoints - Web UI
     @app.get("/users", response_class=HTMLResponse)
     async def get_users_page(request: Request):
@@ -79,30 +384,97 @@ def create_fastapi_app(
         )
 
     # User endpoints - API
-    @app.post("/api/users", status_code=201)
-    async def create_user(data: dict):
+    @app.post("/api/users", status_code=201, openapi_extra=request_body_openapi(create_user_schema))
+    async def create_user(request: Request):
         try:
-            user = await create_user_use_case.execute(data)
+            data = decode_request(create_user_schema, await request.body())
+            user = await create_user_use_case.execute(data, validated=True)
             return user.to_dict()
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+    # Batch create: one ID reservation for the whole batch, and nothing is
+    # stored unless every user is valid
+    @app.post(
+        "/api/users/batch", status_code=201, openapi_extra=request_body_openapi(create_users_schema)
+    )
+    async def create_users(request: Request):
+        try:
+            data = decode_request(create_users_schema, await request.body())
+            users = await create_user_use_case.execute_many(data, validated=True)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return [user.to_dict() for user in users]
+
+    # Declared before /api/users/{user_id} so "summary" is not taken as an id
+    @app.get("/api/users/summary")
+    async def get_user_summaries(
+        response: Response,
+        fields: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=1000),
+        cursor: Optional[str] = None,
+    ):
+        projection = parse_fields(fields, UserWithOrderSummary.FIELDS)
+        rows, next_cursor = await read_model.page(limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return [row.to_dict(projection) for row in rows]
+
     @app.get("/api/users/{user_id}")
-    async def get_user(user_id: str):
+    async def get_user(user_id: str, fields: Optional[str] = None):
+        projection = parse_fields(fields, User.FIELDS)
+        if projection is not None:
+            user = await user_repository.find_by_id_projected(user_id, projection)
+            if not user:
+                raise HTTPException(status_code=404, detail="User not found")
+            return user
         user = await user_repository.find_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return user.to_dict()
 
     @app.get("/api/users")
-    async def get_users_api():
-        users = await user_repository.find_all()
-        return [user.to_dict() for user in users]
+    async def get_users_api(
+        response: Response,
+        fields: Optional[str] = None,
+        email: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1),
+        cursor: Optional[str] = None,
+    ):
+        projection = parse_fields(fields, User.FIELDS)
+        if email is not None:
+            users = await user_repository.find_by_email(email)
+            if name_prefix is not None:
+                key = name_prefix.casefold()
+                users = [user for user in users if user.name.casefold().startswith(key)]
+            return [user.to_dict(projection) for user in users[:limit]]
+        if name_prefix is not None:
+            users = await user_repository.find_by_name_prefix(name_prefix, limit)
+            return [user.to_dict(projection) for user in users]
+        if limit is not None or cursor is not None:
+            # Pages by id, read off a snapshot rather than a full copy
+            users, next_cursor = await user_repository.find_page(cursor, limit or 50)
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return [user.to_dict(projection) for user in users]
+        if projection is not None:
+            return await user_repository.find_all_projected(projection)
+        # Streamed so large (possibly disk-backed) repositories are never
+        # materialized in full
+        users = (user.to_dict() async for user in user_repository.iter_all())
+        return StreamingResponse(stream_json_array(users), media_type="application/json")
+
+    @app.delete("/api/users")
+    async def delete_users(data: dict, cascade: bool = False):
+        results = await delete_user_use_case.execute_many(parse_ids(data), cascade)
+        deleted = sum(1 for outcome in results.values() if outcome["status"] == "deleted")
+        return {"results": results, "deleted": deleted, "not_found": len(results) - deleted}
 
     @app.delete("/api/users/{user_id}", status_code=204)
-    async def delete_user(user_id: str):
+    async def delete_user(user_id: str, cascade: bool = False):
         try:
-            await delete_user_use_case.execute(user_id)
+            await delete_user_use_case.execute(user_id, cascade)
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
@@ -121,25 +493,145 @@ def create_fastapi_app(
         )
 
     # Order endpoints - API
-    @app.post("/api/orders", status_code=201)
-    async def create_order(data: dict):
+    @app.post("/api/orders", status_code=201, openapi_extra=request_body_openapi(create_order_schema))
+    async def create_order(request: Request):
         try:
-            order = await create_order_use_case.execute(data)
+            data = decode_request(create_order_schema, await request.body())
+            order = await create_order_use_case.execute(data, validated=True)
             return order.to_dict()
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+    @app.post(
+        "/api/orders/batch",
+        status_code=201,
+        openapi_extra=request_body_openapi(create_orders_schema),
+    )
+    async def create_orders(request: Request):
+        try:
+            data = decode_request(create_orders_schema, await request.body())
+            orders = await create_order_use_case.execute_many(data, validated=True)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return [order.to_dict() for order in orders]
+
+    @app.get("/api/orders/search")
+    async def search_orders(
+        q: str,
+        limit: int = Query(20, ge=1, le=100),
+        fields: Optional[str] = None,
+    ):
+        projection = parse_fields(fields, Order.FIELDS)
+        if not q.strip():
+            raise HTTPException(status_code=400, detail="Query must not be empty")
+        orders = await order_repository.search_by_product(q, limit)
+        return [order.to_dict(projection) for order in orders]
+
+    @app.get("/api/orders/timeseries")
+    async def get_order_timeseries(
+        bucket: str = "1m",
+        since: Optional[float] = Query(None, ge=0),
+        until: Optional[float] = Query(None, ge=0),
+    ):
+        bucket_seconds = parse_bucket(bucket)
+        if since is not None and until is not None:
+            if until <= since:
+                raise HTTPException(status_code=400, detail="until must be after since")
+            if (until - since) / bucket_seconds > MAX_TIMESERIES_BUCKETS:
+                raise HTTPException(status_code=400, detail="Too many buckets for the range")
+        buckets = await order_repository.created_timeseries(bucket_seconds, since, until)
+        return {"bucket_seconds": bucket_seconds, "buckets": buckets}
+
+    @app.get("/api/orders/status")
+    async def get_order_status_counts():
+        return await order_repository.count_by_status()
+
+    @app.patch("/api/orders/status", openapi_extra=request_body_openapi(update_order_status_schema))
+    async def update_order_status(request: Request):
+        try:
+            data = decode_request(update_order_status_schema, await request.body())
+            results = await update_order_status_use_case.execute_many(data["ids"], data["status"])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        counts = {outcome: 0 for outcome in ("updated", "unchanged", "not_found", "invalid_transition")}
+        for outcome in results.values():
+            counts[outcome["result"]] += 1
+        return {"results": results, **counts}
+
     @app.get("/api/orders/{order_id}")
-    async def get_order(order_id: str):
+    async def get_order(order_id: str, fields: Optional[str] = None):
+        projection = parse_fields(fields, Order.FIELDS)
+        if projection is not None:
+            order = await order_repository.find_by_id_projected(order_id, projection)
+            if not order:
+                raise HTTPException(status_code=404, detail="Order not found")
+            return order
         order = await order_repository.find_by_id(order_id)
         if not order:
             raise HTTPException(status_code=404, detail="Order not found")
         return order.to_dict()
 
     @app.get("/api/orders")
-    async def get_orders_api():
-        orders = await order_repository.find_all()
-        return [order.to_dict() for order in orders]
+    async def get_orders_api(
+        response: Response,
+        fields: Optional[str] = None,
+        min_quantity: Optional[int] = None,
+        max_quantity: Optional[int] = None,
+        sort: Optional[str] = Query(None, pattern="^-?quantity$"),
+        limit: int = Query(50, ge=1, le=1000),
+        cursor: Optional[str] = None,
+        since: Optional[float] = Query(None, ge=0),
+        until: Optional[float] = Query(None, ge=0),
+        status: Optional[str] = None,
+    ):
+        projection = parse_fields(fields, Order.FIELDS)
+        if status is not None:
+            if status not in ORDER_STATUSES:
+                raise HTTPException(
+                    status_code=400, detail=f"status must be one of: {', '.join(ORDER_STATUSES)}"
+                )
+            if (
+                min_quantity is not None or max_quantity is not None or sort
+                or since is not None or until is not None
+            ):
+                raise HTTPException(
+                    status_code=400, detail="status cannot be combined with other filters"
+                )
+            orders, next_cursor = await order_repository.find_by_status(status, cursor, limit)
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return [order.to_dict(projection) for order in orders]
+        if since is not None or until is not None:
+            if min_quantity is not None or max_quantity is not None or sort or cursor:
+                raise HTTPException(
+                    status_code=400, detail="since/until cannot be combined with quantity filters"
+                )
+            orders = await order_repository.find_by_created_range(since, until, limit)
+            return [order.to_dict(projection) for order in orders]
+        if min_quantity is not None or max_quantity is not None or sort or cursor:
+            try:
+                orders, next_cursor = await order_repository.find_by_quantity_range(
+                    min_quantity,
+                    max_quantity,
+                    limit=limit,
+                    cursor=cursor,
+                    descending=sort == "-quantity",
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return [order.to_dict(projection) for order in orders]
+        if projection is not None:
+            return await order_repository.find_all_projected(projection)
+        orders = (order.to_dict() async for order in order_repository.iter_all())
+        return StreamingResponse(stream_json_array(orders), media_type="application/json")
+
+    @app.delete("/api/orders")
+    async def delete_orders(data: dict):
+        results = await delete_order_use_case.execute_many(parse_ids(data))
+        deleted = sum(1 for outcome in results.values() if outcome["status"] == "deleted")
+        return {"results": results, "deleted": deleted, "not_found": len(results) - deleted}
 
     @app.delete("/api/orders/{order_id}", status_code=204)
     async def delete_order(order_id: str):
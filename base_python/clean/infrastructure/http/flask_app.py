@@ -1,22 +1,70 @@
 import asyncio
 import logging
+import os
+import threading
+import time
 from datetime import datetime
-from flask import Flask, request, jsonify, Response
-from typing import Optional, Tuple, Union
-from application.use_cases.create_user import CreateUserInput
+from flask import Flask, request, jsonify, Response, g
+from typing import Dict, Optional, Sequence, Tuple, Union
 from application.use_cases.create_user import CreateUserUseCase
 from application.use_cases.delete_user import DeleteUserUseCase
-from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from domain.user import User
+from application.ports.id_generator import IdGenerator
+from infrastructure.ids.time_ordered import UUID7IdGenerator
+from infrastructure.repositories.thread_safe_user_repository import (
+    ThreadSafeInMemoryUserRepository,
+)
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.spilling_store import entity_store_from_env
 from application.ports.user_repository import UserRepository
+from shared.http.load_shedding import LoadShedder
+from shared.http.profiling import ProfilerBusyError, RequestProfiler
+from shared.http.health import HealthMonitor, LivenessWSGIMiddleware
+from shared.http.warmup import WarmUp
+from infrastructure.http.schemas import MAX_BATCH_SIZE, create_user_schema, decode_request
+from infrastructure.http.background import BackgroundTasks
+from infrastructure.tracing.instrumentation import (
+    instrument_repository,
+    instrument_use_case,
+)
+from shared.tracing.tracer import Tracer, parse_traceparent, tracer_from_env
+from shared.http.compression import (
+    DEFAULT_EXCLUDED_PATHS,
+    choose_encoding,
+    compress_body,
+    compress_stream,
+    is_compressible,
+)
 
 
 
 logger = logging.getLogger(__name__)
 
-def create_flask_app(custom_user_repository: Optional[UserRepository] = None) -> Flask:
+def create_flask_app(
+    custom_user_repository: Optional[UserRepository] = None,
+    load_shedder: Optional[LoadShedder] = None,
+    compression_minimum_size: int = 1024,
+    profiler: Optional[RequestProfiler] = None,
+    tracer=None,
+    id_generator: Optional[IdGenerator] = None,
+    warm_up: Optional[WarmUp] = None,
+    preload_ids: Optional[Dict[str, Sequence[str]]] = None,
+    health_monitor: Optional[HealthMonitor] = None,
+    change_log: Optional[ChangeLog] = None,
+) -> Flask:
     """Flask application factory that can be used in any environment"""
     
     app = Flask(__name__)
+    load_shedder = load_shedder or LoadShedder()
+    profiler = profiler or RequestProfiler.from_env()
+    tracer = tracer if tracer is not None else tracer_from_env("clean-architecture")
+    # Flask has no lifespan hook: the background tasks are started by the
+    # first request of each process, before any hook can turn it away, so
+    # building an app starts no thread. Stop them with
+    # app.extensions['background_tasks'].stop()
+    background_tasks = BackgroundTasks('flask-background')
+    app.extensions['background_tasks'] = background_tasks
+    app.before_request(background_tasks.start)
     
     @app.before_request
     def log_request():
@@ -25,14 +73,158 @@ def create_flask_app(custom_user_repository: Optional[UserRepository] = None) ->
         logger.info(f'[{timestamp}] {request.method} {request.url}')
         logger.debug(f'Request headers: {dict(request.headers)}')
         
-        if request.is_json and request.get_json():
-            logger.debug(f'Request body: {request.get_json()}')
+        # Logged raw: the handlers decode the body themselves, and parsing it
+        # here as well would cost a second JSON pass on every request
+        if request.is_json and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'Request body: {request.get_data(as_text=True)}')
+    
+    @app.before_request
+    def limit_concurrency():
+        """Load shedding middleware: per-route concurrency limit"""
+        if request.url_rule is None:
+            return None
+        limiter = load_shedder.limiter_for(request.method, request.url_rule.rule)
+        if limiter is None:
+            return None
+        if not limiter.acquire():
+            logger.warning(f'Shedding request: {request.method} {request.path}')
+            response = jsonify({'error': 'Service overloaded, retry later'})
+            response.headers['Retry-After'] = str(load_shedder.retry_after)
+            return response, 503
+        g.limiter = limiter
+        g.limiter_started = time.perf_counter()
+        return None
+    
+    @app.after_request
+    def record_status(response: Response) -> Response:
+        g.response_status = response.status_code
+        return response
+    
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        """Compression middleware: negotiated gzip/brotli"""
+        if (
+            request.path in DEFAULT_EXCLUDED_PATHS
+            or response.direct_passthrough
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or not is_compressible(response.mimetype)
+        ):
+            return response
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+        
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < compression_minimum_size:
+                return response
+            response.set_data(compress_body(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    @app.teardown_request
+    def release_concurrency(error: Optional[BaseException]) -> None:
+        limiter = g.pop('limiter', None)
+        if limiter is not None:
+            ok = error is None and g.get('response_status', 500) < 500
+            limiter.release(time.perf_counter() - g.limiter_started, ok=ok)
+    
+    @app.before_request
+    def start_profiling():
+        """Profiling middleware: on-demand or 1-in-N sampled"""
+        flag = request.headers.get('X-Profile') or request.args.get('profile')
+        mode = profiler.requested_mode(flag, request.headers.get('X-Admin-Token'))
+        if mode is None and not profiler.take_sample():
+            return None
+        # Each request runs on its own thread, the one profiled
+        try:
+            g.profile_session = profiler.start(mode or 'sample', threads=[threading.get_ident()])
+        except ProfilerBusyError as e:
+            return jsonify({'error': str(e)}), 409
+        g.profile_store = mode is not None
+        return None
+    
+    @app.after_request
+    def add_profile_id(response: Response) -> Response:
+        if g.get('profile_store'):
+            response.headers['X-Profile-Id'] = g.profile_session.id
+        return response
+    
+    @app.teardown_request
+    def finish_profiling(error: Optional[BaseException]) -> None:
+        session = g.pop('profile_session', None)
+        if session is not None:
+            profiler.finish(session, request.method, request.path, store=g.profile_store)
+    
+    if tracer is not None:
+        @app.before_request
+        def start_request_span():
+            """Tracing middleware: one server span per request"""
+            parent = {}
+            if isinstance(tracer, Tracer):
+                parent = parse_traceparent(request.headers.get('traceparent'))
+            span_context = tracer.start_as_current_span(
+                f'{request.method} {request.path}',
+                attributes={'http.method': request.method, 'http.target': request.path},
+                **parent,
+            )
+            g.request_span = span_context.__enter__()
+            g.request_span_context = span_context
+            if request.url_rule is not None:
+                g.request_span.update_name(f'{request.method} {request.url_rule.rule}')
+                g.request_span.set_attribute('http.route', request.url_rule.rule)
+        
+        @app.after_request
+        def record_response(response: Response) -> Response:
+            span = g.get('request_span')
+            if span is not None:
+                span.set_attribute('http.status_code', response.status_code)
+                if response.content_length is not None:
+                    span.set_attribute('http.response_size', response.content_length)
+            return response
+        
+        @app.teardown_request
+        def end_request_span(error: Optional[BaseException]) -> None:
+            span_context = g.pop('request_span_context', None)
+            if span_context is not None:
+                if error is None:
+                    span_context.__exit__(None, None, None)
+                else:
+                    span_context.__exit__(type(error), error, error.__traceback__)
+    
+    def require_admin() -> Optional[Tuple[Response, int]]:
+        if not profiler.is_authorized(request.headers.get('X-Admin-Token')):
+            return jsonify({'error': 'Admin token required'}), 403
+        return None
     
     # Initialize dependencies
     logger.info('Initializing Flask application dependencies')
-    user_repository = custom_user_repository or InMemoryUserRepository()
-    create_user_use_case = CreateUserUseCase(user_repository)
-    delete_user_use_case = DeleteUserUseCase(user_repository)
+    # Only the built-in repository publishes to the change feed; with a
+    # custom one the feed is switched off rather than served empty, unless
+    # the caller passes a change_log it publishes to itself
+    change_feed_enabled = change_log is not None or custom_user_repository is None
+    change_log = change_log or ChangeLog()
+    # Flask serves requests from multiple threads
+    user_repository = instrument_repository(
+        custom_user_repository
+        or ThreadSafeInMemoryUserRepository(
+            store=entity_store_from_env(User, 'users'), change_log=change_log
+        ),
+        tracer,
+        'UserRepository',
+    )
+    # Time-ordered IDs keep sorted indexes append-mostly
+    id_generator = id_generator or UUID7IdGenerator()
+    create_user_use_case = instrument_use_case(
+        CreateUserUseCase(user_repository, id_generator), tracer
+    )
+    delete_user_use_case = instrument_use_case(DeleteUserUseCase(user_repository), tracer)
     
     @app.route('/health', methods=['GET'])
     def health_check() -> Tuple[Response, int]:
@@ -42,6 +234,17 @@ def create_flask_app(custom_user_repository: Optional[UserRepository] = None) ->
         logger.info('Health check responded with status: healthy')
         return response, 200
     
+    @app.route('/health/deep', methods=['GET'])
+    def deep_health_check() -> Tuple[Response, int]:
+        """Cached dependency checks, refreshed in the background"""
+        report = health_monitor.snapshot()
+        return jsonify(report), 200 if report['status'] == 'healthy' else 503
+    
+    @app.route('/ready', methods=['GET'])
+    def readiness_check() -> Tuple[Response, int]:
+        """Readiness endpoint, 503 until the startup warm-up has finished"""
+        return jsonify(warm_up.status()), 200 if warm_up.ready else 503
+    
     @app.route('/version', methods=['GET'])
     def version_check() -> Tuple[Response, int]:
         """Version endpoint"""
@@ -50,17 +253,58 @@ def create_flask_app(custom_user_repository: Optional[UserRepository] = None) ->
         logger.info(f'Version check responded with: {version}')
         return jsonify({'version': version}), 200
     
+    @app.route('/metrics/load-shedding', methods=['GET'])
+    def load_shedding_metrics() -> Tuple[Response, int]:
+        """Load shedding counters endpoint"""
+        return jsonify(load_shedder.stats()), 200
+    
+    @app.route('/changes', methods=['GET'])
+    def get_changes() -> Tuple[Response, int]:
+        """Change feed after ?since=<seq>, long-polled for up to ?wait=<s> seconds"""
+        if not change_feed_enabled:
+            return jsonify({'error': 'The change feed requires the in-memory repository'}), 501
+        try:
+            since = int(request.args.get('since', 0))
+            wait = float(request.args.get('wait', 0))
+            limit = int(request.args.get('limit', 1000))
+        except ValueError:
+            return jsonify({'error': 'since, wait and limit must be numbers'}), 400
+        if since < 0 or not 0 <= wait <= 60 or not 1 <= limit <= 10000:
+            return jsonify({'error': 'since >= 0, 0 <= wait <= 60, 1 <= limit <= 10000'}), 400
+        if wait and change_log.last_seq <= since:
+            change_log.wait(since, wait)
+        return jsonify(change_log.since(since, limit)), 200
+    
+    @app.route('/admin/profiles', methods=['GET'])
+    def list_profiles() -> Tuple[Response, int]:
+        """List stored request profiles (admin only)"""
+        return require_admin() or (jsonify(profiler.list()), 200)
+    
+    @app.route('/admin/profiles/hot-stacks', methods=['GET'])
+    def hot_stacks() -> Tuple[Response, int]:
+        """Hottest stacks aggregated from sampled requests (admin only)"""
+        limit = request.args.get('limit', 50, type=int)
+        return require_admin() or (jsonify(profiler.hot_stacks(limit)), 200)
+    
+    @app.route('/admin/profiles/<profile_id>', methods=['GET'])
+    def get_profile(profile_id: str) -> Tuple[Response, int]:
+        """Get one stored request profile (admin only)"""
+        denied = require_admin()
+        if denied:
+            return denied
+        profile = profiler.get(profile_id)
+        if not profile:
+            return jsonify({'error': 'Profile not found'}), 404
+        return jsonify(profile), 200
+    
     @app.route('/users', methods=['POST'])
     def create_user() -> Tuple[Response, int]:
         """Create user endpoint"""
         try:
             logger.info('Creating new user')
-            data = request.get_json()
-            
-            if not data:
-                return jsonify({'error': 'Request body is required'}), 400
+            data = decode_request(create_user_schema, request.get_data())
             
-            user = asyncio.run(create_user_use_case.execute(data))
+            user = asyncio.run(create_user_use_case.execute(data, validated=True))
             logger.info(f'User created successfully: {user.id}')
             return jsonify(user.to_dict()), 201
             
@@ -94,6 +338,19 @@ def create_flask_app(custom_user_repository: Optional[UserRepository] = None) ->
         logger.info(f'User found: {user.id}')
         return jsonify(user.to_dict()), 200
     
+    @app.route('/users', methods=['DELETE'])
+    def delete_users() -> Tuple[Response, int]:
+        """Batch delete endpoint, body {"ids": [...]}"""
+        ids = (request.get_json(silent=True) or {}).get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(id, str) for id in ids):
+            return jsonify({'error': 'Body must be {"ids": ["<id>", ...]}'}), 400
+        if len(ids) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} ids per request'}), 400
+        logger.info(f'Deleting {len(ids)} users')
+        results = asyncio.run(delete_user_use_case.execute_many(ids))
+        deleted = sum(1 for outcome in results.values() if outcome['status'] == 'deleted')
+        return jsonify({'results': results, 'deleted': deleted, 'not_found': len(results) - deleted}), 200
+    
     @app.route('/users/<user_id>', methods=['DELETE'])
     def delete_user(user_id: str) -> Tuple[Union[str, Response], int]:
         """Delete user endpoint"""
@@ -113,4 +370,28 @@ def create_flask_app(custom_user_repository: Optional[UserRepository] = None) ->
             logger.error(f'Error deleting user: {error_msg}')
             return jsonify({'error': error_msg}), 500
     
+    # Run with the other background tasks; /ready answers 503 until it is done
+    warm_up = warm_up or WarmUp()
+    if preload_ids:
+        async def preload_users():
+            for user_id in preload_ids.get('users', ()):
+                await user_repository.find_by_id(user_id)
+        
+        warm_up.add('preload', preload_users, required=False)
+    background_tasks.add(warm_up.run)
+    
+    # Dependency checks run on an interval; /health/deep serves the cached result
+    health_monitor = health_monitor or HealthMonitor(
+        interval=float(os.environ.get('HEALTH_CHECK_INTERVAL', '10'))
+    )
+    
+    async def check_user_repository():
+        await user_repository.ping()
+    
+    health_monitor.add('user_repository', check_user_repository)
+    background_tasks.add(health_monitor.run)
+    
+    # Liveness is answered before Flask with a prebuilt response
+    app.wsgi_app = LivenessWSGIMiddleware(app.wsgi_app)
+    
     return app
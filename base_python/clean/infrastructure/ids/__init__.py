@@ -0,0 +1 @@
+# ID generators package
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from abc import abstractmethod
+from typing import Callable, List
+
+from application.ports.id_generator import IdGenerator
+
+CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Two Crockford characters per 10-bit chunk halves the encoding loop
+_CROCKFORD_PAIRS = [a + b for a in CROCKFORD_BASE32 for b in CROCKFORD_BASE32]
+
+
+class TimeOrderedIdGenerator(IdGenerator):
+    """Base for IDs made of a millisecond timestamp, a counter and random bits.
+
+    IDs sort by creation time and are strictly increasing within a process:
+    the first ID of a millisecond starts its counter at a random value
+    (top bit clear, to leave room for increments) and every following ID
+    increments it. A counter overflow carries into the timestamp, so IDs
+    keep increasing even if the clock stalls or steps backwards.
+    """
+
+    COUNTER_BITS = 0
+    RANDOM_BITS = 0
+
+    def __init__(self, clock: Callable[[], int] = time.time_ns):
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Last issued (timestamp << COUNTER_BITS) | counter
+        self._last = -1
+
+    def _reserve(self, count: int) -> int:
+        """Reserve count consecutive timestamp+counter values, returning the first"""
+        now_ms = self._clock() // 1_000_000
+        with self._lock:
+            if now_ms > self._last >> self.COUNTER_BITS:
+                seed = int.from_bytes(os.urandom((self.COUNTER_BITS + 7) // 8), "big")
+                seed &= (1 << (self.COUNTER_BITS - 1)) - 1
+                first = (now_ms << self.COUNTER_BITS) | seed
+            else:
+                first = self._last + 1
+            self._last = first + count - 1
+        return first
+
+    def _random_tails(self, count: int) -> List[int]:
+        if not self.RANDOM_BITS:
+            return [0] * count
+        size = self.RANDOM_BITS // 8
+        data = os.urandom(size * count)
+        return [int.from_bytes(data[i : i + size], "big") for i in range(0, size * count, size)]
+
+    @abstractmethod
+    def _format(self, value: int, tail: int) -> str:
+        """Encode a timestamp+counter value and RANDOM_BITS of random tail"""
+
+    def new_id(self) -> str:
+        tail = int.from_bytes(os.urandom(self.RANDOM_BITS // 8), "big") if self.RANDOM_BITS else 0
+        return self._format(self._reserve(1), tail)
+
+    def new_ids(self, count: int) -> List[str]:
+        """Bulk fast path: one clock read, one lock and one urandom call per batch"""
+        if count <= 0:
+            return []
+        first = self._reserve(count)
+        tails = self._random_tails(count)
+        return [self._format(first + i, tails[i]) for i in range(count)]
+
+
+class UUID7IdGenerator(TimeOrderedIdGenerator):
+    """RFC 9562 UUIDv7: 48-bit Unix milliseconds, 42-bit counter, 32 random bits"""
+
+    COUNTER_BITS = 42
+    RANDOM_BITS = 32
+
+    def _format(self, value: int, tail: int) -> str:
+        timestamp, counter = value >> 42, value & ((1 << 42) - 1)
+        number = (
+            (timestamp & 0xFFFFFFFFFFFF) << 80
+            | 0x7 << 76  # version
+            | (counter >> 30) << 64
+            | 0b10 << 62  # variant
+            | (counter & 0x3FFFFFFF) << 32
+            | tail
+        )
+        h = f"{number:032x}"
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+_ULID_SHIFTS = range(120, -10, -10)
+
+
+class ULIDIdGenerator(TimeOrderedIdGenerator):
+    """ULID: 48-bit Unix milliseconds and 80 bits incremented within a millisecond"""
+
+    COUNTER_BITS = 80
+
+    def _format(self, value: int, tail: int) -> str:
+        # 128 bits padded to 130 are 13 chunks of 10 bits
+        value &= (1 << 128) - 1
+        pairs = _CROCKFORD_PAIRS
+        return "".join([pairs[(value >> shift) & 1023] for shift in _ULID_SHIFTS])
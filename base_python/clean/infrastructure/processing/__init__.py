@@ -0,0 +1 @@
+# Background order processing package
@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import suppress
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from domain.order import Order
+from application.ports.order_queue import OrderQueue
+from application.ports.order_repository import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+# The work done for one order before it is marked completed; raising
+# leaves the order pending
+ProcessingStep = Callable[[Order], Awaitable[None]]
+
+
+async def complete_immediately(order: Order) -> None:
+    """Default processing step: nothing to do before completing"""
+
+
+class LatencyStats:
+    """Count, EWMA and maximum of a latency, reported in milliseconds"""
+
+    def __init__(self):
+        self.count = 0
+        self._ewma = 0.0
+        self._max = 0.0
+
+    def observe(self, latency: float) -> None:
+        self.count += 1
+        self._ewma = latency if self.count == 1 else 0.9 * self._ewma + 0.1 * latency
+        self._max = max(self._max, latency)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "ewma_ms": round(self._ewma * 1000, 3),
+            "max_ms": round(self._max * 1000, 3),
+        }
+
+
+class OrderProcessor(OrderQueue):
+    """Bounded asyncio queue of pending orders drained by a pool of workers.
+
+    Each worker runs ``step`` on one order at a time, so at most ``workers``
+    orders are processed concurrently. Processed ids are collected and
+    marked completed with one ``update_status`` call per batch, flushed
+    when ``batch_size`` ids are waiting or ``batch_interval`` seconds after
+    the first one. ``submit`` waits while ``queue_size`` orders are queued,
+    which pushes back on whoever creates orders. ``stop`` stops accepting
+    orders, lets the workers drain the queue (up to ``drain_timeout``) and
+    flushes the last batch. A batch whose ``update_status`` call fails is
+    put back and retried after ``retry_delay`` seconds, doubling on each
+    consecutive failure; ids that fail ``flush_retries`` times are given
+    up. Orders still queued when the timeout expires, whose step failed or
+    that were given up stay pending.
+    """
+
+    def __init__(
+        self,
+        order_repository: OrderRepository,
+        step: ProcessingStep = complete_immediately,
+        workers: int = 4,
+        queue_size: int = 1000,
+        batch_size: int = 100,
+        batch_interval: float = 0.05,
+        step_timeout: Optional[float] = 30.0,
+        flush_retries: int = 3,
+        retry_delay: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._order_repository = order_repository
+        self._step = step
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.step_timeout = step_timeout
+        self.flush_retries = flush_retries
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._queue: "asyncio.Queue[Tuple[Order, float]]" = asyncio.Queue(queue_size)
+        # Processed order ids waiting to be marked completed
+        self._batch: List[str] = []
+        self._batch_ready = asyncio.Event()
+        # Failed update_status calls per id still being retried
+        self._flush_failures: Dict[str, int] = {}
+        self._consecutive_failures = 0
+        self._tasks: List[asyncio.Task] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._accepting = False
+        self._in_flight = 0
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.completed = 0
+        self.batches = 0
+        self.given_up = 0
+        self.wait_latency = LatencyStats()
+        self.step_latency = LatencyStats()
+
+    @classmethod
+    def from_env(cls, order_repository: OrderRepository) -> Optional["OrderProcessor"]:
+        """Configure from ORDER_PROCESSING_*; None unless ORDER_PROCESSING_WORKERS > 0"""
+        workers = int(os.environ.get("ORDER_PROCESSING_WORKERS", "0"))
+        if workers <= 0:
+            return None
+        return cls(
+            order_repository,
+            workers=workers,
+            queue_size=int(os.environ.get("ORDER_PROCESSING_QUEUE_SIZE", "1000")),
+            batch_size=int(os.environ.get("ORDER_PROCESSING_BATCH_SIZE", "100")),
+            batch_interval=float(os.environ.get("ORDER_PROCESSING_BATCH_INTERVAL", "0.05")),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(self) -> None:
+        """Start the workers and the batch flusher on the running loop"""
+        if self._tasks:
+            return
+        self._accepting = True
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def submit(self, order: Order) -> None:
+        """Queue an order, waiting for room while the queue is full"""
+        if not self._accepting:
+            raise RuntimeError("Order processor is not running")
+        await self._queue.put((order, self._clock()))
+        self.submitted += 1
+
+    async def _process(self, order: Order) -> None:
+        started = self._clock()
+        try:
+            if self.step_timeout is None:
+                await self._step(order)
+            else:
+                await asyncio.wait_for(self._step(order), self.step_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Processing order {order.id} failed: {e!r}")
+            return
+        finally:
+            self.step_latency.observe(self._clock() - started)
+        self.processed += 1
+        self._batch.append(order.id)
+        if len(self._batch) == 1 or len(self._batch) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def _work(self) -> None:
+        while True:
+            order, enqueued_at = await self._queue.get()
+            self._in_flight += 1
+            try:
+                self.wait_latency.observe(self._clock() - enqueued_at)
+                await self._process(order)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _flush(self) -> bool:
+        """Complete the waiting batch; False if it failed and was put back"""
+        ids, self._batch = self._batch, []
+        if not ids:
+            return True
+        try:
+            outcomes = await self._order_repository.update_status(ids, "completed")
+        except asyncio.CancelledError:
+            # Completing again later is harmless: applied ids come back unchanged
+            self._batch[:0] = ids
+            raise
+        except Exception as e:
+            self._consecutive_failures += 1
+            retry, given_up = [], []
+            for id in ids:
+                failures = self._flush_failures.get(id, 0) + 1
+                if failures > self.flush_retries:
+                    self._flush_failures.pop(id, None)
+                    given_up.append(id)
+                else:
+                    self._flush_failures[id] = failures
+                    retry.append(id)
+            self._batch[:0] = retry
+            logger.warning(f"Completing {len(ids)} orders failed: {e!r}")
+            if given_up:
+                self.failed += len(given_up)
+                self.given_up += len(given_up)
+                logger.error(
+                    f"Gave up completing {len(given_up)} orders after "
+                    f"{self.flush_retries} retries; they stay pending: {given_up}"
+                )
+            return not retry
+        self._consecutive_failures = 0
+        for id in ids:
+            self._flush_failures.pop(id, None)
+        self.batches += 1
+        self.completed += sum(1 for outcome in outcomes.values() if outcome == "updated")
+        return True
+
+    async def _back_off(self) -> None:
+        await asyncio.sleep(self.retry_delay * 2 ** (self._consecutive_failures - 1))
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await self._batch_ready.wait()
+            # Give a partial batch up to batch_interval to fill
+            if len(self._batch) < self.batch_size:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wait_for_full_batch(), self.batch_interval)
+            self._batch_ready.clear()
+            if not await self._flush():
+                await self._back_off()
+                self._batch_ready.set()
+
+    async def _wait_for_full_batch(self) -> None:
+        while len(self._batch) < self.batch_size:
+            self._batch_ready.clear()
+            await self._batch_ready.wait()
+
+    async def stop(self, drain_timeout: Optional[float] = 10.0) -> None:
+        """Stop accepting orders, drain the queue and flush the last batch"""
+        if not self._tasks:
+            return
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Order processing drain timed out; {self._queue.qsize()} orders left pending"
+            )
+        for task in [*self._tasks, self._flusher]:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks, self._flusher = [], None
+        # Bounded: every retry brings the failing ids closer to being given up
+        while not await self._flush():
+            await self._back_off()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": self._accepting,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "in_flight": self._in_flight,
+            "pending_batch": len(self._batch),
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "completed": self.completed,
+            "batches": self.batches,
+            "given_up": self.given_up,
+            "queue_wait": self.wait_latency.to_dict(),
+            "step_latency": self.step_latency.to_dict(),
+        }
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire ``ttl`` seconds after insertion"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (value, expires at), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """The cached value, or ``default`` if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[1] <= self._clock():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._clock() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RepositoryCache:
+    """Cache-aside state shared by the caching repository decorators.
+
+    Entities are cached by id; a lookup that found nothing is cached as
+    well (for ``negative_ttl`` seconds) so repeated misses do not reach the
+    backend. Every write through the decorator bumps ``version``, which
+    keys the cached full listing and the cached pages (by version, cursor
+    and limit), and drops the written ids. A read that
+    started before a write never fills the cache with what it fetched,
+    so a slow read cannot reinstate a value the write replaced.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        cache_find_all: bool = False,
+        max_pages: int = 256,
+    ):
+        self.negative_ttl = negative_ttl
+        self.cache_find_all = cache_find_all
+        self._entities = TTLCache(max_entries, ttl)
+        # (version, entities) of the last full listing
+        self._listing = TTLCache(1, ttl)
+        # (version, cursor, limit) -> (page, next cursor)
+        self._pages = TTLCache(max_pages, ttl)
+        self.version = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.listing_hits = 0
+        self.listing_misses = 0
+        self.page_hits = 0
+        self.page_misses = 0
+
+    def lookup(self, id: str) -> Tuple[bool, Any]:
+        """(found in cache, entity or None)"""
+        value = self._entities.get(id)
+        if value is _MISSING:
+            self.misses += 1
+            return False, None
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return True, value
+
+    def fill(self, id: str, entity: Any, version: int) -> None:
+        if version != self.version:
+            return
+        if entity is None:
+            self._entities.put(id, None, self.negative_ttl)
+        else:
+            self._entities.put(id, entity)
+
+    def listing(self) -> Optional[List[Any]]:
+        """The cached full listing if it is still current"""
+        if not self.cache_find_all:
+            return None
+        cached = self._listing.get("all", None)
+        if cached is None or cached[0] != self.version:
+            self.listing_misses += 1
+            return None
+        self.listing_hits += 1
+        return cached[1]
+
+    def fill_listing(self, entities: List[Any], version: int) -> None:
+        if self.cache_find_all and version == self.version:
+            self._listing.put("all", (version, entities))
+
+    def page(
+        self, cursor: Optional[str], limit: int
+    ) -> Optional[Tuple[List[Any], Optional[str]]]:
+        """The cached page after cursor if it is still current"""
+        if not self.cache_find_all:
+            return None
+        cached = self._pages.get((self.version, cursor, limit), None)
+        if cached is None:
+            self.page_misses += 1
+            return None
+        self.page_hits += 1
+        return cached
+
+    def fill_page(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        page: Tuple[List[Any], Optional[str]],
+        version: int,
+    ) -> None:
+        if self.cache_find_all and version == self.version:
+            self._pages.put((version, cursor, limit), page)
+
+    def invalidate(self, ids: Iterable[str]) -> None:
+        self.version += 1
+        for id in ids:
+            self._entities.invalidate(id)
+        self._listing.clear()
+        # Keyed by the old version, so unreachable already; free them
+        self._pages.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        listings = self.listing_hits + self.listing_misses
+        pages = self.page_hits + self.page_misses
+        return {
+            "entries": len(self._entities),
+            "version": self.version,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            "listing_hits": self.listing_hits,
+            "listing_misses": self.listing_misses,
+            "listing_hit_ratio": self.listing_hits / listings if listings else 0.0,
+            "page_hits": self.page_hits,
+            "page_misses": self.page_misses,
+            "page_hit_ratio": self.page_hits / pages if pages else 0.0,
+        }
@@ -0,0 +1,177 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from domain.order import Order
+from infrastructure.repositories.caching import RepositoryCache
+from application.ports.order_repository import OrderRepository
+
+
+class CachingOrderRepository(OrderRepository):
+    """Cache-aside decorator for any OrderRepository.
+
+    ``find_by_id`` (and projections of cached orders) are served from a
+    bounded LRU/TTL cache, including cached misses. ``create``, the deletes
+    and status updates invalidate the affected ids. With ``cache_find_all``
+    the full listing and ``find_page`` pages are cached too, until the next
+    write through this decorator or the TTL, whichever comes first; writes
+    made elsewhere are only seen once entries expire. Search and range queries go straight to the
+    wrapped repository.
+    """
+
+    def __init__(
+        self,
+        repository: OrderRepository,
+        max_entries: int = 10000,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        cache_find_all: bool = False,
+    ):
+        self._repository = repository
+        self._cache = RepositoryCache(max_entries, ttl, negative_ttl, cache_find_all)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    async def create(self, order: Order) -> None:
+        """Create a new order"""
+        try:
+            await self._repository.create(order)
+        finally:
+            self._cache.invalidate([order.id])
+
+    async def find_by_id(self, id: str) -> Optional[Order]:
+        """Find order by ID, from the cache when possible"""
+        cached, order = self._cache.lookup(id)
+        if cached:
+            return order
+        version = self._cache.version
+        order = await self._repository.find_by_id(id)
+        self._cache.fill(id, order, version)
+        return order
+
+    async def ping(self) -> None:
+        """Probe the wrapped repository; a cached miss proves nothing"""
+        await self._repository.ping()
+
+    async def find_all(self) -> List[Order]:
+        """Get all orders, from the cached listing when it is current"""
+        orders = self._cache.listing()
+        if orders is not None:
+            return list(orders)
+        version = self._cache.version
+        orders = await self._repository.find_all()
+        self._cache.fill_listing(orders, version)
+        return list(orders)
+
+    async def iter_all(self) -> AsyncIterator[Order]:
+        """Iterate over all orders.
+
+        With listing caching the listing is loaded (and cached) in full;
+        otherwise the wrapped repository is streamed.
+        """
+        if not self._cache.cache_find_all:
+            async for order in self._repository.iter_all():
+                yield order
+            return
+        for order in await self.find_all():
+            yield order
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders by id, from the cached pages when current"""
+        page = self._cache.page(cursor, limit)
+        if page is not None:
+            return list(page[0]), page[1]
+        version = self._cache.version
+        orders, next_cursor = await self._repository.find_page(cursor, limit)
+        self._cache.fill_page(cursor, limit, (orders, next_cursor), version)
+        return list(orders), next_cursor
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find order by ID, returning only the requested fields"""
+        cached, order = self._cache.lookup(id)
+        if cached:
+            return order.to_dict(fields) if order else None
+        return await self._repository.find_by_id_projected(id, fields)
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all orders, returning only the requested fields"""
+        orders = self._cache.listing()
+        if orders is not None:
+            return [order.to_dict(fields) for order in orders]
+        return await self._repository.find_all_projected(fields)
+
+    async def search_by_product(self, query: str, limit: int = 20) -> List[Order]:
+        """Find orders whose product matches every query term, best first"""
+        return await self._repository.search_by_product(query, limit)
+
+    async def find_by_quantity_range(
+        self,
+        min_quantity: Optional[int] = None,
+        max_quantity: Optional[int] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Find orders with min_quantity <= quantity <= max_quantity"""
+        return await self._repository.find_by_quantity_range(
+            min_quantity, max_quantity, limit, cursor, descending
+        )
+
+    async def top_n_by_quantity(self, n: int) -> List[Order]:
+        """Get the n orders with the largest quantity"""
+        return await self._repository.top_n_by_quantity(n)
+
+    async def find_by_user_id(self, user_id: str) -> List[Order]:
+        """Find the orders of one user"""
+        return await self._repository.find_by_user_id(user_id)
+
+    async def find_by_created_range(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Order]:
+        """Find orders with since <= created_at < until"""
+        return await self._repository.find_by_created_range(since, until, limit)
+
+    async def created_timeseries(
+        self,
+        bucket_seconds: int,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Order count and quantity per time bucket"""
+        return await self._repository.created_timeseries(bucket_seconds, since, until)
+
+    async def find_by_status(
+        self, status: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders with this status"""
+        return await self._repository.find_by_status(status, cursor, limit)
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of orders in each status"""
+        return await self._repository.count_by_status()
+
+    async def update_status(self, ids: Sequence[str], status: str) -> Dict[str, str]:
+        """Move a batch of orders to status"""
+        try:
+            return await self._repository.update_status(ids, status)
+        finally:
+            self._cache.invalidate(ids)
+
+    async def delete(self, id: str) -> None:
+        """Delete order by ID"""
+        try:
+            await self._repository.delete(id)
+        finally:
+            self._cache.invalidate([id])
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of orders, reporting per id whether it existed"""
+        try:
+            return await self._repository.delete_many(ids)
+        finally:
+            self._cache.invalidate(ids)
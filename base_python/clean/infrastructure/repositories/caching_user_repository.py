@@ -0,0 +1,127 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from domain.user import User
+from infrastructure.repositories.caching import RepositoryCache
+from application.ports.user_repository import UserRepository
+
+
+class CachingUserRepository(UserRepository):
+    """Cache-aside decorator for any UserRepository.
+
+    ``find_by_id`` (and projections of cached users) are served from a
+    bounded LRU/TTL cache, including cached misses. ``create`` and the
+    deletes invalidate the affected ids. With ``cache_find_all`` the full
+    listing and ``find_page`` pages are cached too, until the next write
+    through this decorator or the TTL, whichever comes first; writes made
+    elsewhere are only seen once entries expire. Index queries go straight
+    to the wrapped repository.
+    """
+
+    def __init__(
+        self,
+        repository: UserRepository,
+        max_entries: int = 10000,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        cache_find_all: bool = False,
+    ):
+        self._repository = repository
+        self._cache = RepositoryCache(max_entries, ttl, negative_ttl, cache_find_all)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    async def create(self, user: User) -> None:
+        """Create a new user"""
+        try:
+            await self._repository.create(user)
+        finally:
+            self._cache.invalidate([user.id])
+
+    async def find_by_id(self, id: str) -> Optional[User]:
+        """Find user by ID, from the cache when possible"""
+        cached, user = self._cache.lookup(id)
+        if cached:
+            return user
+        version = self._cache.version
+        user = await self._repository.find_by_id(id)
+        self._cache.fill(id, user, version)
+        return user
+
+    async def ping(self) -> None:
+        """Probe the wrapped repository; a cached miss proves nothing"""
+        await self._repository.ping()
+
+    async def find_all(self) -> List[User]:
+        """Get all users, from the cached listing when it is current"""
+        users = self._cache.listing()
+        if users is not None:
+            return list(users)
+        version = self._cache.version
+        users = await self._repository.find_all()
+        self._cache.fill_listing(users, version)
+        return list(users)
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        """Iterate over all users.
+
+        With listing caching the listing is loaded (and cached) in full;
+        otherwise the wrapped repository is streamed.
+        """
+        if not self._cache.cache_find_all:
+            async for user in self._repository.iter_all():
+                yield user
+            return
+        for user in await self.find_all():
+            yield user
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[User], Optional[str]]:
+        """One page of users by id, from the cached pages when current"""
+        page = self._cache.page(cursor, limit)
+        if page is not None:
+            return list(page[0]), page[1]
+        version = self._cache.version
+        users, next_cursor = await self._repository.find_page(cursor, limit)
+        self._cache.fill_page(cursor, limit, (users, next_cursor), version)
+        return list(users), next_cursor
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find user by ID, returning only the requested fields"""
+        cached, user = self._cache.lookup(id)
+        if cached:
+            return user.to_dict(fields) if user else None
+        return await self._repository.find_by_id_projected(id, fields)
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all users, returning only the requested fields"""
+        users = self._cache.listing()
+        if users is not None:
+            return [user.to_dict(fields) for user in users]
+        return await self._repository.find_all_projected(fields)
+
+    async def find_by_email(self, email: str) -> List[User]:
+        """Find users with exactly this email"""
+        return await self._repository.find_by_email(email)
+
+    async def find_by_name_prefix(
+        self, prefix: str, limit: Optional[int] = None
+    ) -> List[User]:
+        """Find users whose name starts with prefix"""
+        return await self._repository.find_by_name_prefix(prefix, limit)
+
+    async def delete(self, id: str) -> None:
+        """Delete user by ID"""
+        try:
+            await self._repository.delete(id)
+        finally:
+            self._cache.invalidate([id])
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of users, reporting per id whether it existed"""
+        try:
+            return await self._repository.delete_many(ids)
+        finally:
+            self._cache.invalidate(ids)
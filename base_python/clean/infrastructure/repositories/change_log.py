@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ChangeLog:
+    """Ordered, bounded log of repository mutations.
+
+    Every change gets the next sequence number and is kept in a ring buffer
+    of ``capacity`` entries, so memory stays constant and lookups by
+    sequence number are O(1). Consumers read the changes after the last
+    sequence they saw and can block until a newer one arrives, from a
+    thread (``wait``) or a coroutine (``wait_async``). A waiting coroutine
+    only holds a future, so idle consumers cost nothing until a write.
+
+    ``operation`` is ``create`` (a new entity, or an existing one replaced
+    by creating it again), ``update`` (an in-place change such as an order
+    status transition) or ``delete``. Creates and updates carry the full
+    entity as ``data``; deletes carry none.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._buffer: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._last_seq = 0
+        self._condition = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def _first_seq(self) -> int:
+        return max(1, self._last_seq - self.capacity + 1)
+
+    def append(
+        self, entity: str, operation: str, entity_id: str, data: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Record a change and wake every waiting consumer"""
+        with self._condition:
+            self._last_seq += 1
+            seq = self._last_seq
+            self._buffer[seq % self.capacity] = {
+                "seq": seq,
+                "entity": entity,
+                "operation": operation,
+                "id": entity_id,
+                "data": data,
+                "timestamp": time.time(),
+            }
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        return seq
+
+    def since(self, seq: int, limit: int = 1000) -> Dict[str, Any]:
+        """Changes after ``seq``, oldest first.
+
+        ``truncated`` means changes the consumer has not seen were already
+        overwritten (or the log restarted), so it must resync from a full
+        read before continuing from ``next``.
+        """
+        with self._condition:
+            last = self._last_seq
+            first = self._first_seq()
+            truncated = seq > last or (last > 0 and seq + 1 < first)
+            start = max(seq + 1, first) if seq <= last else last + 1
+            end = min(last, start + limit - 1)
+            changes = [self._buffer[s % self.capacity] for s in range(start, end + 1)]
+        return {
+            "changes": changes,
+            "next": changes[-1]["seq"] if changes else min(seq, last),
+            "last_seq": last,
+            "truncated": truncated,
+        }
+
+    def wait(self, seq: int, timeout: float) -> bool:
+        """Block the calling thread until a change newer than seq exists"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._last_seq > seq, timeout)
+
+    async def wait_async(self, seq: int, timeout: float) -> bool:
+        """Wait without blocking the event loop until a change newer than seq exists"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._condition:
+            if self._last_seq > seq:
+                return True
+            self._async_waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            with self._condition:
+                if (loop, future) in self._async_waiters:
+                    self._async_waiters.remove((loop, future))
+            return False
@@ -0,0 +1,128 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+# Global secondary indexes the adapters query
+USERS_EMAIL_INDEX = "email-index"
+ORDERS_USER_ID_INDEX = "user_id-index"
+
+
+class DynamoDBConnection:
+    """Shared DynamoDB client whose blocking calls run off the event loop.
+
+    One low-level client (thread-safe, with a connection pool of
+    ``max_pool_connections``) is shared by every repository using the
+    connection. Calls run on a dedicated thread pool of the same size, so
+    the event loop never blocks and each thread can hold a pooled
+    connection.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        max_pool_connections: int = 32,
+    ):
+        self.client = client or boto3.client(
+            "dynamodb",
+            endpoint_url=endpoint_url,
+            region_name=region_name,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                retries={"mode": "adaptive", "max_attempts": 5},
+            ),
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_pool_connections, thread_name_prefix="dynamodb"
+        )
+
+    async def call(self, operation: str, **arguments) -> Dict[str, Any]:
+        """Run one client operation (e.g. ``get_item``) in the pool"""
+        loop = asyncio.get_running_loop()
+        method = functools.partial(getattr(self.client, operation), **arguments)
+        return await loop.run_in_executor(self._executor, method)
+
+    async def pages(self, operation: str, **arguments) -> AsyncIterator[Dict[str, Any]]:
+        """Follow LastEvaluatedKey through a paginated Scan or Query"""
+        while True:
+            page = await self.call(operation, **arguments)
+            yield page
+            last_key = page.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            arguments["ExclusiveStartKey"] = last_key
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def create_tables(client, users_table: str = "Users", orders_table: str = "Orders") -> None:
+    """Create the tables and indexes the adapters expect, and wait for them.
+
+    Meant for local stand-ins and tests; deployed tables are provisioned
+    with the infrastructure.
+    """
+    definitions = [
+        (users_table, "email", USERS_EMAIL_INDEX),
+        (orders_table, "user_id", ORDERS_USER_ID_INDEX),
+    ]
+    for table_name, index_key, index_name in definitions:
+        client.create_table(
+            TableName=table_name,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "id", "AttributeType": "S"},
+                {"AttributeName": index_key, "AttributeType": "S"},
+            ],
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": index_name,
+                    "KeySchema": [
+                        {"AttributeName": index_key, "KeyType": "HASH"},
+                        {"AttributeName": "id", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+        )
+    for table_name, _, _ in definitions:
+        client.get_waiter("table_exists").wait(TableName=table_name)
+
+
+def dynamodb_repositories_from_env() -> Tuple[Any, Any]:
+    """DynamoDB user and order repositories sharing one connection.
+
+    Configured by DYNAMODB_ENDPOINT_URL (e.g. a DynamoDB Local stand-in),
+    DYNAMODB_USERS_TABLE / DYNAMODB_ORDERS_TABLE (default Users / Orders)
+    and DYNAMODB_MAX_POOL_CONNECTIONS. Setting DYNAMODB_CACHE_MAX_ENTRIES
+    puts a cache-aside decorator in front of each repository, with entries
+    living DYNAMODB_CACHE_TTL seconds (default 60).
+    """
+    from infrastructure.repositories.caching_order_repository import CachingOrderRepository
+    from infrastructure.repositories.caching_user_repository import CachingUserRepository
+    from infrastructure.repositories.dynamodb_order_repository import DynamoDBOrderRepository
+    from infrastructure.repositories.dynamodb_user_repository import DynamoDBUserRepository
+
+    connection = DynamoDBConnection(
+        endpoint_url=os.environ.get("DYNAMODB_ENDPOINT_URL") or None,
+        max_pool_connections=int(os.environ.get("DYNAMODB_MAX_POOL_CONNECTIONS", "32")),
+    )
+    user_repository = DynamoDBUserRepository(
+        connection, os.environ.get("DYNAMODB_USERS_TABLE", "Users")
+    )
+    order_repository = DynamoDBOrderRepository(
+        connection, os.environ.get("DYNAMODB_ORDERS_TABLE", "Orders")
+    )
+    max_entries = os.environ.get("DYNAMODB_CACHE_MAX_ENTRIES")
+    if max_entries:
+        ttl = float(os.environ.get("DYNAMODB_CACHE_TTL", "60"))
+        user_repository = CachingUserRepository(user_repository, int(max_entries), ttl)
+        order_repository = CachingOrderRepository(order_repository, int(max_entries), ttl)
+    return user_repository, order_repository
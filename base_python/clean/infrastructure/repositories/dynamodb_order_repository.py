@@ -0,0 +1,175 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from botocore.exceptions import ClientError
+from domain.order import Order
+from infrastructure.repositories.dynamodb import ORDERS_USER_ID_INDEX, DynamoDBConnection
+from shared.dynamodb import projection_arguments
+from application.ports.order_repository import OrderRepository
+
+
+# Number attributes and the type they decode to
+_NUMBER_TYPES = {"quantity": int, "created_at": float}
+
+
+def _to_item(order: Order) -> Dict[str, Any]:
+    item = {
+        "id": {"S": order.id},
+        "user_id": {"S": order.user_id},
+        "product": {"S": order.product},
+        "quantity": {"N": str(order.quantity)},
+        "status": {"S": order.status},
+    }
+    if order.created_at is not None:
+        item["created_at"] = {"N": repr(order.created_at)}
+    return item
+
+
+def _from_item(item: Dict[str, Any]) -> Order:
+    return Order(
+        item["id"]["S"],
+        item["user_id"]["S"],
+        item["product"]["S"],
+        int(item["quantity"]["N"]),
+        item["status"]["S"],
+        float(item["created_at"]["N"]) if "created_at" in item else None,
+    )
+
+
+def _value(field: str, attribute: Dict[str, Any]) -> Any:
+    return _NUMBER_TYPES[field](attribute["N"]) if "N" in attribute else attribute["S"]
+
+
+def _project(item: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    return {field: _value(field, item[field]) if field in item else None for field in fields}
+
+
+class DynamoDBOrderRepository(OrderRepository):
+    """DynamoDB implementation of OrderRepository.
+
+    Lookups by user use the ``user_id-index`` GSI; full reads page through
+    Scan instead of loading the table in one response.
+    """
+
+    def __init__(self, connection: DynamoDBConnection, table_name: str = "Orders"):
+        self._connection = connection
+        self._table_name = table_name
+
+    async def create(self, order: Order) -> None:
+        """Create a new order"""
+        await self._connection.call("put_item", TableName=self._table_name, Item=_to_item(order))
+
+    async def find_by_id(self, id: str) -> Optional[Order]:
+        """Find order by ID"""
+        response = await self._connection.call(
+            "get_item", TableName=self._table_name, Key={"id": {"S": id}}
+        )
+        item = response.get("Item")
+        return _from_item(item) if item else None
+
+    async def find_all(self) -> List[Order]:
+        """Get all orders"""
+        return [order async for order in self.iter_all()]
+
+    async def iter_all(self) -> AsyncIterator[Order]:
+        """Iterate over all orders one Scan page at a time"""
+        async for page in self._connection.pages("scan", TableName=self._table_name):
+            for item in page["Items"]:
+                yield _from_item(item)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find order by ID, reading only the requested attributes"""
+        response = await self._connection.call(
+            "get_item",
+            TableName=self._table_name,
+            Key={"id": {"S": id}},
+            # With the key projected, an existing item always comes back,
+            # even if it has none of the requested attributes
+            **projection_arguments(list(dict.fromkeys(["id", *fields]))),
+        )
+        item = response.get("Item")
+        return _project(item, fields) if item else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all orders, reading only the requested attributes"""
+        pages = self._connection.pages(
+            "scan", TableName=self._table_name, **projection_arguments(fields)
+        )
+        return [_project(item, fields) async for page in pages for item in page["Items"]]
+
+    async def find_by_user_id(self, user_id: str) -> List[Order]:
+        """Find the orders of one user using the user_id GSI"""
+        pages = self._connection.pages(
+            "query",
+            TableName=self._table_name,
+            IndexName=ORDERS_USER_ID_INDEX,
+            KeyConditionExpression="user_id = :user_id",
+            ExpressionAttributeValues={":user_id": {"S": user_id}},
+        )
+        return [_from_item(item) async for page in pages for item in page["Items"]]
+
+    async def find_by_created_range(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Order]:
+        """Find orders with since <= created_at < until, filtered server-side.
+
+        There is no time index on the table, so this is still a full Scan,
+        but only matching orders are returned over the network.
+        """
+        conditions = ["attribute_exists(#created_at)"]
+        values: Dict[str, Any] = {}
+        if since is not None:
+            conditions.append("#created_at >= :since")
+            values[":since"] = {"N": repr(float(since))}
+        if until is not None:
+            conditions.append("#created_at < :until")
+            values[":until"] = {"N": repr(float(until))}
+        arguments: Dict[str, Any] = {
+            "TableName": self._table_name,
+            "FilterExpression": " AND ".join(conditions),
+            "ExpressionAttributeNames": {"#created_at": "created_at"},
+        }
+        if values:
+            arguments["ExpressionAttributeValues"] = values
+        pages = self._connection.pages("scan", **arguments)
+        orders = sorted(
+            [_from_item(item) async for page in pages for item in page["Items"]],
+            key=lambda order: (order.created_at, order.id),
+        )
+        return orders[:limit] if limit is not None else orders
+
+    async def delete(self, id: str) -> None:
+        """Delete order by ID"""
+        try:
+            await self._connection.call(
+                "delete_item",
+                TableName=self._table_name,
+                Key={"id": {"S": id}},
+                ConditionExpression="attribute_exists(id)",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ValueError("Order not found") from None
+            raise
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of orders concurrently, reporting per id whether it existed.
+
+        BatchWriteItem cannot tell whether an item existed, so the batch is
+        sent as conditional deletes in parallel over the connection pool.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+
+        async def delete_one(id: str) -> bool:
+            try:
+                await self.delete(id)
+                return True
+            except ValueError:
+                return False
+
+        outcomes = await asyncio.gather(*(delete_one(id) for id in unique_ids))
+        return dict(zip(unique_ids, outcomes))
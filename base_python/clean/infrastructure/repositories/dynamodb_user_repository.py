@@ -0,0 +1,118 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from botocore.exceptions import ClientError
+from domain.user import User
+from infrastructure.repositories.dynamodb import USERS_EMAIL_INDEX, DynamoDBConnection
+from shared.dynamodb import projection_arguments
+from application.ports.user_repository import UserRepository
+
+
+def _to_item(user: User) -> Dict[str, Any]:
+    return {"id": {"S": user.id}, "name": {"S": user.name}, "email": {"S": user.email}}
+
+
+def _from_item(item: Dict[str, Any]) -> User:
+    return User(item["id"]["S"], item["name"]["S"], item["email"]["S"])
+
+
+def _project(item: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    return {field: item[field]["S"] if field in item else None for field in fields}
+
+
+class DynamoDBUserRepository(UserRepository):
+    """DynamoDB implementation of UserRepository.
+
+    Lookups by email use the ``email-index`` GSI; full reads page through
+    Scan instead of loading the table in one response.
+    """
+
+    def __init__(self, connection: DynamoDBConnection, table_name: str = "Users"):
+        self._connection = connection
+        self._table_name = table_name
+
+    async def create(self, user: User) -> None:
+        """Create a new user"""
+        await self._connection.call("put_item", TableName=self._table_name, Item=_to_item(user))
+
+    async def find_by_id(self, id: str) -> Optional[User]:
+        """Find user by ID"""
+        response = await self._connection.call(
+            "get_item", TableName=self._table_name, Key={"id": {"S": id}}
+        )
+        item = response.get("Item")
+        return _from_item(item) if item else None
+
+    async def find_all(self) -> List[User]:
+        """Get all users"""
+        return [user async for user in self.iter_all()]
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        """Iterate over all users one Scan page at a time"""
+        async for page in self._connection.pages("scan", TableName=self._table_name):
+            for item in page["Items"]:
+                yield _from_item(item)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find user by ID, reading only the requested attributes"""
+        response = await self._connection.call(
+            "get_item",
+            TableName=self._table_name,
+            Key={"id": {"S": id}},
+            # With the key projected, an existing item always comes back,
+            # even if it has none of the requested attributes
+            **projection_arguments(list(dict.fromkeys(["id", *fields]))),
+        )
+        item = response.get("Item")
+        return _project(item, fields) if item else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all users, reading only the requested attributes"""
+        pages = self._connection.pages(
+            "scan", TableName=self._table_name, **projection_arguments(fields)
+        )
+        return [_project(item, fields) async for page in pages for item in page["Items"]]
+
+    async def find_by_email(self, email: str) -> List[User]:
+        """Find users with exactly this email using the email GSI"""
+        pages = self._connection.pages(
+            "query",
+            TableName=self._table_name,
+            IndexName=USERS_EMAIL_INDEX,
+            KeyConditionExpression="email = :email",
+            ExpressionAttributeValues={":email": {"S": email}},
+        )
+        return [_from_item(item) async for page in pages for item in page["Items"]]
+
+    async def delete(self, id: str) -> None:
+        """Delete user by ID"""
+        try:
+            await self._connection.call(
+                "delete_item",
+                TableName=self._table_name,
+                Key={"id": {"S": id}},
+                ConditionExpression="attribute_exists(id)",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ValueError("User not found") from None
+            raise
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of users concurrently, reporting per id whether it existed.
+
+        BatchWriteItem cannot tell whether an item existed, so the batch is
+        sent as conditional deletes in parallel over the connection pool.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+
+        async def delete_one(id: str) -> bool:
+            try:
+                await self.delete(id)
+                return True
+            except ValueError:
+                return False
+
+        outcomes = await asyncio.gather(*(delete_one(id) for id in unique_ids))
+        return dict(zip(unique_ids, outcomes))
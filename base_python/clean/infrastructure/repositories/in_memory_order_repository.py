@@ -1,28 +1,380 @@
-from typing import Dict, List, Optional
-from domain.order import Order
-from application.ports.order_repository import OrderRepository
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, MutableMapping, Optional, Sequence, Tuple
+from domain.order import ORDER_STATUSES, Order
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.snapshot_store import SnapshotStore
+from infrastructure.repositories.spilling_store import SpillingStore
+from application.ports.order_repository import (
+    OrderRepository,
+    bucket_by_created_at,
+    decode_quantity_cursor,
+    encode_quantity_cursor,
+    status_transition,
+    tokenize_product,
+)
+
+
+# Width of the creation-time index buckets
+TIME_BUCKET_SECONDS = 60
 
 
 class InMemoryOrderRepository(OrderRepository):
     """In-memory implementation of OrderRepository"""
 
-    def __init__(self):
-        self._orders: Dict[str, Order] = {}
+    def __init__(
+        self,
+        store: Optional[MutableMapping[str, Order]] = None,
+        change_log: Optional[ChangeLog] = None,
+    ):
+        # Entity storage: a SnapshotStore by default, so listings read an
+        # O(1) snapshot instead of copying; a SpillingStore bounds memory by
+        # spilling to disk
+        self._orders: MutableMapping[str, Order] = store if store is not None else SnapshotStore()
+        # Optional feed of creates and deletes for downstream consumers
+        self._change_log = change_log
+        # Inverted index over Order.product: term -> {order id: term frequency}
+        self._product_index: Dict[str, Dict[str, int]] = {}
+        # Sorted vocabulary of the inverted index, for prefix expansion
+        self._product_terms: List[str] = []
+        # Secondary index on Order.quantity: sorted (quantity, id) pairs
+        self._quantity_index: List[Tuple[int, str]] = []
+        # user_id -> ids of that user's orders (dict used as an ordered set)
+        self._user_index: Dict[str, Dict[str, None]] = {}
+        # Creation-time index: minute -> ids of the orders created in it,
+        # with each minute's quantity sum and the sorted minutes alongside
+        self._time_buckets: Dict[int, Dict[str, None]] = {}
+        self._bucket_quantities: Dict[int, int] = {}
+        self._bucket_keys: List[int] = []
+        # status -> sorted ids of the orders in that status
+        self._status_index: Dict[str, List[str]] = {}
+
+    def _index_product(self, order: Order) -> None:
+        for term, count in Counter(tokenize_product(order.product)).items():
+            postings = self._product_index.get(term)
+            if postings is None:
+                postings = self._product_index[term] = {}
+                insort(self._product_terms, term)
+            postings[order.id] = count
+
+    def _unindex_product(self, order: Order) -> None:
+        for term in set(tokenize_product(order.product)):
+            postings = self._product_index.get(term)
+            if postings is None:
+                continue
+            postings.pop(order.id, None)
+            if not postings:
+                del self._product_index[term]
+                del self._product_terms[bisect_left(self._product_terms, term)]
+
+    def _term_matches(self, term: str) -> Dict[str, float]:
+        """Best match weight per order id for one query term"""
+        matches: Dict[str, float] = {}
+        position = bisect_left(self._product_terms, term)
+        while position < len(self._product_terms):
+            word = self._product_terms[position]
+            if not word.startswith(term):
+                break
+            weight = 1.0 if word == term else len(term) / len(word)
+            for order_id in self._product_index[word]:
+                if matches.get(order_id, 0.0) < weight:
+                    matches[order_id] = weight
+            position += 1
+        return matches
+
+    def _unindex_quantity(self, order: Order) -> None:
+        entry = (order.quantity, order.id)
+        position = bisect_left(self._quantity_index, entry)
+        if position < len(self._quantity_index) and self._quantity_index[position] == entry:
+            del self._quantity_index[position]
+
+    def _unindex_user(self, order: Order) -> None:
+        ids = self._user_index.get(order.user_id)
+        if ids is not None:
+            ids.pop(order.id, None)
+            if not ids:
+                del self._user_index[order.user_id]
+
+    def _index_time(self, order: Order) -> None:
+        if order.created_at is None:
+            return
+        key = int(order.created_at // TIME_BUCKET_SECONDS)
+        bucket = self._time_buckets.get(key)
+        if bucket is None:
+            bucket = self._time_buckets[key] = {}
+            self._bucket_quantities[key] = 0
+            insort(self._bucket_keys, key)
+        bucket[order.id] = None
+        self._bucket_quantities[key] += order.quantity
+
+    def _unindex_time(self, order: Order) -> None:
+        if order.created_at is None:
+            return
+        key = int(order.created_at // TIME_BUCKET_SECONDS)
+        bucket = self._time_buckets.get(key)
+        if bucket is None or order.id not in bucket:
+            return
+        del bucket[order.id]
+        self._bucket_quantities[key] -= order.quantity
+        if not bucket:
+            del self._time_buckets[key]
+            del self._bucket_quantities[key]
+            del self._bucket_keys[bisect_left(self._bucket_keys, key)]
+
+    def _bucket_range(self, since: Optional[float], until: Optional[float]) -> range:
+        """Positions in _bucket_keys of the minutes overlapping [since, until)"""
+        keys = self._bucket_keys
+        start = bisect_left(keys, int(since // TIME_BUCKET_SECONDS)) if since is not None else 0
+        stop = (
+            bisect_right(keys, int(until // TIME_BUCKET_SECONDS))
+            if until is not None else len(keys)
+        )
+        return range(start, stop)
+
+    def _unindex_status(self, order: Order) -> None:
+        ids = self._status_index.get(order.status)
+        if ids is None:
+            return
+        position = bisect_left(ids, order.id)
+        if position < len(ids) and ids[position] == order.id:
+            del ids[position]
+
+    def _index(self, order: Order) -> None:
+        self._index_product(order)
+        insort(self._quantity_index, (order.quantity, order.id))
+        self._user_index.setdefault(order.user_id, {})[order.id] = None
+        self._index_time(order)
+        insort(self._status_index.setdefault(order.status, []), order.id)
+
+    def _unindex(self, order: Order) -> None:
+        self._unindex_product(order)
+        self._unindex_quantity(order)
+        self._unindex_user(order)
+        self._unindex_time(order)
+        self._unindex_status(order)
+
+    def _record(self, operation: str, id: str, order: Optional[Order] = None) -> None:
+        if self._change_log is not None:
+            self._change_log.append(
+                "order", operation, id, order.to_dict() if order is not None else None
+            )
 
     async def create(self, order: Order) -> None:
         """Create a new order"""
+        existing = self._orders.get(order.id)
+        if existing is not None:
+            self._unindex(existing)
         self._orders[order.id] = order
+        self._index(order)
+        self._record("create", order.id, order)
 
     async def find_by_id(self, id: str) -> Optional[Order]:
         """Find order by ID"""
         return self._orders.get(id)
 
     async def find_all(self) -> List[Order]:
-        """Get all orders"""
+        """Get all orders, in the store's order: by id for the default SnapshotStore"""
         return list(self._orders.values())
 
+    async def iter_all(self) -> AsyncIterator[Order]:
+        """Iterate over all orders lazily, from a snapshot or streamed from disk"""
+        values = self._orders.values()
+        if not isinstance(self._orders, (SnapshotStore, SpillingStore)):
+            # Plain dicts cannot be iterated while other requests mutate them
+            values = list(values)
+        for order in values:
+            yield order
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders by id, read from a snapshot of the store"""
+        if not isinstance(self._orders, SnapshotStore):
+            return await super().find_page(cursor, limit)
+        return self._orders.snapshot().page(cursor, limit)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find order by ID, returning only the requested fields"""
+        order = self._orders.get(id)
+        return order.to_dict(fields) if order else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all orders, returning only the requested fields"""
+        return [order.to_dict(fields) for order in self._orders.values()]
+
+    async def search_by_product(self, query: str, limit: int = 20) -> List[Order]:
+        """Find orders matching every query term using the inverted index"""
+        terms = list(dict.fromkeys(tokenize_product(query)))
+        if not terms:
+            return []
+        per_term = [self._term_matches(term) for term in terms]
+        # AND the terms, walking the smallest match set and probing the others
+        per_term.sort(key=len)
+        scores: Dict[str, float] = {}
+        for order_id, weight in per_term[0].items():
+            score = weight
+            for matches in per_term[1:]:
+                other = matches.get(order_id)
+                if other is None:
+                    break
+                score += other
+            else:
+                scores[order_id] = score
+        best = heapq.nlargest(
+            limit,
+            scores,
+            key=lambda order_id: (scores[order_id], -len(self._orders[order_id].product)),
+        )
+        return [self._orders[order_id] for order_id in best]
+
+    async def find_by_quantity_range(
+        self,
+        min_quantity: Optional[int] = None,
+        max_quantity: Optional[int] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Find orders in a quantity range using the sorted index"""
+        index = self._quantity_index
+        # [start, stop) is the slice of the index inside the range
+        start = 0 if min_quantity is None else bisect_left(index, (min_quantity,))
+        stop = len(index) if max_quantity is None else bisect_left(index, (max_quantity + 1,))
+        if cursor:
+            after = decode_quantity_cursor(cursor)
+            if descending:
+                stop = min(stop, bisect_left(index, after))
+            else:
+                start = max(start, bisect_right(index, after))
+
+        if descending:
+            positions = range(stop - 1, max(start, stop - limit) - 1, -1)
+            has_more = stop - limit > start
+        else:
+            positions = range(start, min(stop, start + limit))
+            has_more = start + limit < stop
+        page = [self._orders[index[position][1]] for position in positions]
+        next_cursor = encode_quantity_cursor(page[-1]) if has_more and page else None
+        return page, next_cursor
+
+    async def top_n_by_quantity(self, n: int) -> List[Order]:
+        """Get the n orders with the largest quantity from the sorted index"""
+        index = self._quantity_index
+        return [self._orders[id] for _, id in reversed(index[max(0, len(index) - n):])]
+
+    async def find_by_user_id(self, user_id: str) -> List[Order]:
+        """Find the orders of one user using the user_id index"""
+        return [self._orders[id] for id in self._user_index.get(user_id, ())]
+
+    async def find_by_created_range(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Order]:
+        """Find orders with since <= created_at < until from the minute buckets"""
+        return self._created_range(since, until, limit)
+
+    def _created_range(
+        self, since: Optional[float], until: Optional[float], limit: Optional[int] = None
+    ) -> List[Order]:
+        """find_by_created_range without awaiting, for callers already holding locks"""
+        orders: List[Order] = []
+        for position in self._bucket_range(since, until):
+            bucket = [
+                order for order in
+                (self._orders[id] for id in self._time_buckets[self._bucket_keys[position]])
+                if (since is None or order.created_at >= since)
+                and (until is None or order.created_at < until)
+            ]
+            bucket.sort(key=lambda order: (order.created_at, order.id))
+            orders.extend(bucket)
+            if limit is not None and len(orders) >= limit:
+                return orders[:limit]
+        return orders
+
+    async def created_timeseries(
+        self,
+        bucket_seconds: int,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Order count and quantity per bucket, rolled up from the minute buckets.
+
+        Minutes wholly inside the range contribute their running totals
+        without touching any order; only the partially covered edge minutes
+        are read order by order.
+        """
+        if bucket_seconds % TIME_BUCKET_SECONDS:
+            return bucket_by_created_at(self._created_range(since, until), bucket_seconds)
+        buckets: Dict[int, List[int]] = {}
+        for position in self._bucket_range(since, until):
+            minute = self._bucket_keys[position]
+            start = minute * TIME_BUCKET_SECONDS
+            if (since is None or start >= since) and (
+                until is None or start + TIME_BUCKET_SECONDS <= until
+            ):
+                count = len(self._time_buckets[minute])
+                quantity = self._bucket_quantities[minute]
+            else:
+                count = quantity = 0
+                for id in self._time_buckets[minute]:
+                    order = self._orders[id]
+                    if (since is None or order.created_at >= since) and (
+                        until is None or order.created_at < until
+                    ):
+                        count += 1
+                        quantity += order.quantity
+            if count:
+                totals = buckets.setdefault(start // bucket_seconds, [0, 0])
+                totals[0] += count
+                totals[1] += quantity
+        return [
+            {"start": key * bucket_seconds, "count": count, "quantity": quantity}
+            for key, (count, quantity) in sorted(buckets.items())
+        ]
+
+    async def find_by_status(
+        self, status: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders with this status from the status index"""
+        ids = self._status_index.get(status, [])
+        start = bisect_right(ids, cursor) if cursor else 0
+        page = [self._orders[id] for id in ids[start:start + limit]]
+        more = start + limit < len(ids)
+        return page, page[-1].id if page and more else None
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of orders in each status, read off the status index"""
+        counts = dict.fromkeys(ORDER_STATUSES, 0)
+        counts.update((status, len(ids)) for status, ids in self._status_index.items() if ids)
+        return counts
+
+    async def update_status(self, ids: Sequence[str], status: str) -> Dict[str, str]:
+        """Move a batch of orders to status in one step.
+
+        Nothing here suspends, so no other coroutine sees part of the batch
+        applied. Orders are replaced, never mutated, so readers holding an
+        order keep a consistent copy.
+        """
+        results: Dict[str, str] = {}
+        for id in dict.fromkeys(ids):
+            existing = self._orders.get(id)
+            outcome, updated = status_transition(existing, status)
+            if updated is not None:
+                self._unindex(existing)
+                self._orders[id] = updated
+                self._index(updated)
+                self._record("update", id, updated)
+            results[id] = outcome
+        return results
+
     async def delete(self, id: str) -> None:
         """Delete order by ID"""
         if id not in self._orders:
             raise ValueError("Order not found")
-        del self._orders[id]
+        self._unindex(self._orders.pop(id))
+        self._record("delete", id)
@@ -1,28 +1,120 @@
-from typing import Dict, List, Optional
+from bisect import bisect_left, insort
+from typing import Any, AsyncIterator, Dict, List, MutableMapping, Optional, Sequence, Tuple
 from domain.user import User
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.snapshot_store import SnapshotStore
+from infrastructure.repositories.spilling_store import SpillingStore
 from application.ports.user_repository import UserRepository
 
 
 class InMemoryUserRepository(UserRepository):
     """In-memory implementation of UserRepository"""
 
-    def __init__(self):
-        self._users: Dict[str, User] = {}
+    def __init__(
+        self,
+        store: Optional[MutableMapping[str, User]] = None,
+        change_log: Optional[ChangeLog] = None,
+    ):
+        # Entity storage: a SnapshotStore by default, so listings read an
+        # O(1) snapshot instead of copying; a SpillingStore bounds memory by
+        # spilling to disk
+        self._users: MutableMapping[str, User] = store if store is not None else SnapshotStore()
+        # Optional feed of creates and deletes for downstream consumers
+        self._change_log = change_log
+        # email -> ids of users with that email (dict used as an ordered set)
+        self._email_index: Dict[str, Dict[str, None]] = {}
+        # (casefolded name, id), kept sorted for prefix range scans
+        self._name_index: List[Tuple[str, str]] = []
+
+    def _index(self, user: User) -> None:
+        self._email_index.setdefault(user.email, {})[user.id] = None
+        insort(self._name_index, (user.name.casefold(), user.id))
+
+    def _unindex(self, user: User) -> None:
+        ids = self._email_index.get(user.email)
+        if ids is not None:
+            ids.pop(user.id, None)
+            if not ids:
+                del self._email_index[user.email]
+        entry = (user.name.casefold(), user.id)
+        position = bisect_left(self._name_index, entry)
+        if position < len(self._name_index) and self._name_index[position] == entry:
+            del self._name_index[position]
+
+    def _record(self, operation: str, id: str, user: Optional[User] = None) -> None:
+        if self._change_log is not None:
+            self._change_log.append(
+                "user", operation, id, user.to_dict() if user is not None else None
+            )
 
     async def create(self, user: User) -> None:
         """Create a new user"""
+        existing = self._users.get(user.id)
+        if existing is not None:
+            self._unindex(existing)
         self._users[user.id] = user
+        self._index(user)
+        self._record("create", user.id, user)
 
     async def find_by_id(self, id: str) -> Optional[User]:
         """Find user by ID"""
         return self._users.get(id)
 
     async def find_all(self) -> List[User]:
-        """Get all users"""
+        """Get all users, in the store's order: by id for the default SnapshotStore"""
         return list(self._users.values())
 
+    async def iter_all(self) -> AsyncIterator[User]:
+        """Iterate over all users lazily, from a snapshot or streamed from disk"""
+        values = self._users.values()
+        if not isinstance(self._users, (SnapshotStore, SpillingStore)):
+            # Plain dicts cannot be iterated while other requests mutate them
+            values = list(values)
+        for user in values:
+            yield user
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[User], Optional[str]]:
+        """One page of users by id, read from a snapshot of the store"""
+        if not isinstance(self._users, SnapshotStore):
+            return await super().find_page(cursor, limit)
+        return self._users.snapshot().page(cursor, limit)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find user by ID, returning only the requested fields"""
+        user = self._users.get(id)
+        return user.to_dict(fields) if user else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all users, returning only the requested fields"""
+        return [user.to_dict(fields) for user in self._users.values()]
+
+    async def find_by_email(self, email: str) -> List[User]:
+        """Find users with exactly this email using the hash index"""
+        ids = self._email_index.get(email, ())
+        return [self._users[id] for id in ids]
+
+    async def find_by_name_prefix(
+        self, prefix: str, limit: Optional[int] = None
+    ) -> List[User]:
+        """Find users whose name starts with prefix using the sorted index"""
+        key = prefix.casefold()
+        users = []
+        position = bisect_left(self._name_index, (key, ""))
+        while position < len(self._name_index) and (limit is None or len(users) < limit):
+            name, id = self._name_index[position]
+            if not name.startswith(key):
+                break
+            users.append(self._users[id])
+            position += 1
+        return users
+
     async def delete(self, id: str) -> None:
         """Delete user by ID"""
         if id not in self._users:
             raise ValueError("User not found")
-        del self._users[id]
+        self._unindex(self._users.pop(id))
+        self._record("delete", id)
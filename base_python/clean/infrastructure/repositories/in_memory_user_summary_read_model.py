@@ -0,0 +1,125 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import AsyncIterable, Dict, List, Optional, Tuple
+from domain.order import Order
+from domain.user import User
+from application.ports.user_summary_read_model import UserSummaryReadModel, UserWithOrderSummary
+
+
+class InMemoryUserSummaryReadModel(UserSummaryReadModel):
+    """In-memory implementation of UserSummaryReadModel.
+
+    Rows are kept by user id next to a sorted id list, so a page is a
+    bisect plus a slice. Each order's contribution is remembered, which
+    makes replacing or deleting an order exact without reading it back.
+    Totals of orders whose user has no row (not created yet, or deleted
+    without a cascade) are held aside and folded in if the row appears.
+    Changes reported while ``rebuild`` reads the repositories are replayed
+    onto the rebuilt rows; every change is idempotent, so replaying one the
+    listings already reflected is harmless.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, UserWithOrderSummary] = {}
+        # Row ids, sorted; time-ordered ids make this creation order
+        self._ids: List[str] = []
+        # order id -> (user id, quantity) it currently contributes
+        self._orders: Dict[str, Tuple[str, int]] = {}
+        # user id -> [order count, total quantity] for users without a row
+        self._detached: Dict[str, List[int]] = {}
+        # Changes seen during a rebuild, as (method name, argument)
+        self._replay: Optional[List[Tuple[str, object]]] = None
+        self._lock = threading.Lock()
+
+    def _adjust(self, user_id: str, count: int, quantity: int) -> None:
+        row = self._rows.get(user_id)
+        if row is not None:
+            row.order_count += count
+            row.total_quantity += quantity
+            return
+        totals = self._detached.setdefault(user_id, [0, 0])
+        totals[0] += count
+        totals[1] += quantity
+        if totals[0] == 0:
+            del self._detached[user_id]
+
+    def _save_user(self, user: User) -> None:
+        row = self._rows.get(user.id)
+        if row is not None:
+            row.name = user.name
+            row.email = user.email
+            return
+        count, quantity = self._detached.pop(user.id, (0, 0))
+        self._rows[user.id] = UserWithOrderSummary(user.id, user.name, user.email, count, quantity)
+        insort(self._ids, user.id)
+
+    def _delete_user(self, user_id: str) -> None:
+        row = self._rows.pop(user_id, None)
+        if row is None:
+            return
+        del self._ids[bisect_left(self._ids, user_id)]
+        # Orders that outlive the user stay counted until deleted
+        if row.order_count:
+            self._detached[user_id] = [row.order_count, row.total_quantity]
+
+    def _save_order(self, order: Order) -> None:
+        previous = self._orders.get(order.id)
+        if previous is not None:
+            self._adjust(previous[0], -1, -previous[1])
+        self._orders[order.id] = (order.user_id, order.quantity)
+        self._adjust(order.user_id, 1, order.quantity)
+
+    def _delete_order(self, order_id: str) -> None:
+        previous = self._orders.pop(order_id, None)
+        if previous is not None:
+            self._adjust(previous[0], -1, -previous[1])
+
+    def _apply(self, method: str, argument) -> None:
+        with self._lock:
+            getattr(self, method)(argument)
+            if self._replay is not None:
+                self._replay.append((method, argument))
+
+    async def user_saved(self, user: User) -> None:
+        self._apply("_save_user", user)
+
+    async def user_deleted(self, user_id: str) -> None:
+        self._apply("_delete_user", user_id)
+
+    async def order_saved(self, order: Order) -> None:
+        self._apply("_save_order", order)
+
+    async def order_deleted(self, order_id: str) -> None:
+        self._apply("_delete_order", order_id)
+
+    async def page(
+        self, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[UserWithOrderSummary], Optional[str]]:
+        """One page of rows after the ``cursor`` user id"""
+        with self._lock:
+            start = bisect_right(self._ids, cursor) if cursor else 0
+            ids = self._ids[start:start + limit]
+            # Copies, so callers never see a row change under them
+            rows = [UserWithOrderSummary(**self._rows[id].to_dict()) for id in ids]
+            more = start + limit < len(self._ids)
+        return rows, rows[-1].id if rows and more else None
+
+    async def rebuild(self, users: AsyncIterable[User], orders: AsyncIterable[Order]) -> None:
+        with self._lock:
+            self._replay = []
+        fresh = InMemoryUserSummaryReadModel()
+        try:
+            async for user in users:
+                fresh._save_user(user)
+            async for order in orders:
+                fresh._save_order(order)
+        except BaseException:
+            with self._lock:
+                self._replay = None
+            raise
+        with self._lock:
+            for method, argument in self._replay:
+                getattr(fresh, method)(argument)
+            self._replay = None
+            self._rows, self._ids = fresh._rows, fresh._ids
+            self._orders, self._detached = fresh._orders, fresh._detached
@@ -0,0 +1,184 @@
+import asyncio
+from itertools import chain
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from domain.order import Order
+from infrastructure.repositories.shard_pool import ShardPool, merge_id_pages
+from application.ports.order_repository import (
+    OrderRepository,
+    encode_quantity_cursor,
+    rank_by_product_match,
+    tokenize_product,
+)
+
+
+class PartitionedOrderRepository(OrderRepository):
+    """OrderRepository hash-partitioned by order id across a ShardPool.
+
+    Point operations go to the owning shard; listings, searches and range
+    queries run on every shard in parallel and are merged here, each shard
+    using its own indexes. Listings are grouped by shard, not in global
+    insertion order.
+    """
+
+    def __init__(self, pool: ShardPool):
+        self._pool = pool
+
+    async def create(self, order: Order) -> None:
+        """Create a new order"""
+        await self._pool.call_for(order.id, "orders", "create", order)
+
+    async def find_by_id(self, id: str) -> Optional[Order]:
+        """Find order by ID"""
+        return await self._pool.call_for(id, "orders", "find_by_id", id)
+
+    async def find_all(self) -> List[Order]:
+        """Get all orders from every shard"""
+        return list(chain.from_iterable(await self._pool.scatter("orders", "find_all")))
+
+    async def iter_all(self) -> AsyncIterator[Order]:
+        """Iterate over all orders, one shard at a time"""
+        for shard in range(self._pool.shards):
+            for order in await self._pool.call(shard, "orders", "find_all"):
+                yield order
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Merge one page by id from every shard"""
+        return merge_id_pages(await self._pool.scatter("orders", "find_page", cursor, limit), limit)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find order by ID, projected inside the shard"""
+        return await self._pool.call_for(id, "orders", "find_by_id_projected", id, list(fields))
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all orders, projected inside each shard"""
+        pages = await self._pool.scatter("orders", "find_all_projected", list(fields))
+        return list(chain.from_iterable(pages))
+
+    async def search_by_product(self, query: str, limit: int = 20) -> List[Order]:
+        """Search every shard's inverted index and re-rank the candidates"""
+        terms = list(dict.fromkeys(tokenize_product(query)))
+        if not terms:
+            return []
+        # Each shard returns its own best ``limit``, which always contain
+        # the global best ``limit``
+        pages = await self._pool.scatter("orders", "search_by_product", query, limit)
+        return rank_by_product_match(chain.from_iterable(pages), terms, limit)
+
+    async def find_by_quantity_range(
+        self,
+        min_quantity: Optional[int] = None,
+        max_quantity: Optional[int] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Merge one page from every shard's quantity index.
+
+        Cursors point at a (quantity, id) key, so the same cursor resumes
+        every shard.
+        """
+        pages = await self._pool.scatter(
+            "orders", "find_by_quantity_range", min_quantity, max_quantity, limit, cursor, descending
+        )
+        orders = sorted(
+            chain.from_iterable(page for page, _ in pages),
+            key=lambda order: (order.quantity, order.id),
+            reverse=descending,
+        )
+        more = len(orders) > limit or any(next_cursor for _, next_cursor in pages)
+        page = orders[:limit]
+        return page, encode_quantity_cursor(page[-1]) if page and more else None
+
+    async def find_by_user_id(self, user_id: str) -> List[Order]:
+        """Find the orders of one user on every shard's user index"""
+        pages = await self._pool.scatter("orders", "find_by_user_id", user_id)
+        return list(chain.from_iterable(pages))
+
+    async def find_by_created_range(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Order]:
+        """Merge every shard's oldest ``limit`` orders in the time range"""
+        pages = await self._pool.scatter("orders", "find_by_created_range", since, until, limit)
+        orders = sorted(
+            chain.from_iterable(pages), key=lambda order: (order.created_at, order.id)
+        )
+        return orders[:limit] if limit is not None else orders
+
+    async def created_timeseries(
+        self,
+        bucket_seconds: int,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Sum every shard's per-bucket totals"""
+        pages = await self._pool.scatter("orders", "created_timeseries", bucket_seconds, since, until)
+        buckets: Dict[float, List[int]] = {}
+        for bucket in chain.from_iterable(pages):
+            totals = buckets.setdefault(bucket["start"], [0, 0])
+            totals[0] += bucket["count"]
+            totals[1] += bucket["quantity"]
+        return [
+            {"start": start, "count": count, "quantity": quantity}
+            for start, (count, quantity) in sorted(buckets.items())
+        ]
+
+    async def find_by_status(
+        self, status: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Merge one page from every shard's status index"""
+        pages = await self._pool.scatter("orders", "find_by_status", status, cursor, limit)
+        return merge_id_pages(pages, limit)
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """Sum every shard's status counts"""
+        counts: Dict[str, int] = {}
+        for shard_counts in await self._pool.scatter("orders", "count_by_status"):
+            for status, count in shard_counts.items():
+                counts[status] = counts.get(status, 0) + count
+        return counts
+
+    async def update_status(self, ids: Sequence[str], status: str) -> Dict[str, str]:
+        """Move a batch of orders to status, one call per shard in parallel.
+
+        Each shard applies its part atomically; the batch as a whole is not
+        atomic across shards.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        groups = self._pool.group_by_shard(unique_ids)
+        outcomes = await asyncio.gather(
+            *(
+                self._pool.call(shard, "orders", "update_status", group, status)
+                for shard, group in groups.items()
+            )
+        )
+        merged: Dict[str, str] = {}
+        for outcome in outcomes:
+            merged.update(outcome)
+        return {id: merged[id] for id in unique_ids}
+
+    async def delete(self, id: str) -> None:
+        """Delete order by ID"""
+        await self._pool.call_for(id, "orders", "delete", id)
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of orders, one call per shard in parallel"""
+        unique_ids = list(dict.fromkeys(ids))
+        groups = self._pool.group_by_shard(unique_ids)
+        outcomes = await asyncio.gather(
+            *(self._pool.call(shard, "orders", "delete_many", group) for shard, group in groups.items())
+        )
+        merged: Dict[str, bool] = {}
+        for outcome in outcomes:
+            merged.update(outcome)
+        return {id: merged[id] for id in unique_ids}
+
+    async def delete_by_user_id(self, user_id: str) -> List[str]:
+        """Delete every order of one user on all shards in parallel"""
+        return list(chain.from_iterable(await self._pool.scatter("orders", "delete_by_user_id", user_id)))
@@ -0,0 +1,85 @@
+import asyncio
+from itertools import chain
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from domain.user import User
+from infrastructure.repositories.shard_pool import ShardPool, merge_id_pages
+from application.ports.user_repository import UserRepository
+
+
+class PartitionedUserRepository(UserRepository):
+    """UserRepository hash-partitioned by user id across a ShardPool.
+
+    Point operations go to the owning shard; listings and index queries
+    run on every shard in parallel and are merged here. Listings are
+    grouped by shard, not in global insertion order.
+    """
+
+    def __init__(self, pool: ShardPool):
+        self._pool = pool
+
+    async def create(self, user: User) -> None:
+        """Create a new user"""
+        await self._pool.call_for(user.id, "users", "create", user)
+
+    async def find_by_id(self, id: str) -> Optional[User]:
+        """Find user by ID"""
+        return await self._pool.call_for(id, "users", "find_by_id", id)
+
+    async def find_all(self) -> List[User]:
+        """Get all users from every shard"""
+        return list(chain.from_iterable(await self._pool.scatter("users", "find_all")))
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        """Iterate over all users, one shard at a time"""
+        for shard in range(self._pool.shards):
+            for user in await self._pool.call(shard, "users", "find_all"):
+                yield user
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[User], Optional[str]]:
+        """Merge one page by id from every shard"""
+        return merge_id_pages(await self._pool.scatter("users", "find_page", cursor, limit), limit)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find user by ID, projected inside the shard"""
+        return await self._pool.call_for(id, "users", "find_by_id_projected", id, list(fields))
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all users, projected inside each shard"""
+        pages = await self._pool.scatter("users", "find_all_projected", list(fields))
+        return list(chain.from_iterable(pages))
+
+    async def find_by_email(self, email: str) -> List[User]:
+        """Find users with exactly this email on every shard's index"""
+        return list(chain.from_iterable(await self._pool.scatter("users", "find_by_email", email)))
+
+    async def find_by_name_prefix(
+        self, prefix: str, limit: Optional[int] = None
+    ) -> List[User]:
+        """Find users whose name starts with prefix, merged in name order"""
+        # Each shard returns its own first ``limit`` matches, which always
+        # contain the global first ``limit``
+        pages = await self._pool.scatter("users", "find_by_name_prefix", prefix, limit)
+        users = sorted(
+            chain.from_iterable(pages), key=lambda user: (user.name.casefold(), user.id)
+        )
+        return users[:limit] if limit is not None else users
+
+    async def delete(self, id: str) -> None:
+        """Delete user by ID"""
+        await self._pool.call_for(id, "users", "delete", id)
+
+    async def delete_many(self, ids: Sequence[str]) -> Dict[str, bool]:
+        """Delete a batch of users, one call per shard in parallel"""
+        unique_ids = list(dict.fromkeys(ids))
+        groups = self._pool.group_by_shard(unique_ids)
+        outcomes = await asyncio.gather(
+            *(self._pool.call(shard, "users", "delete_many", group) for shard, group in groups.items())
+        )
+        merged: Dict[str, bool] = {}
+        for outcome in outcomes:
+            merged.update(outcome)
+        return {id: merged[id] for id in unique_ids}
@@ -0,0 +1,101 @@
+import asyncio
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Worker-process state: this shard's repositories and the loop that drives them
+_repositories: Dict[str, Any] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_shard() -> None:
+    global _loop
+    from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+    from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+
+    _repositories["users"] = InMemoryUserRepository()
+    _repositories["orders"] = InMemoryOrderRepository()
+    _loop = asyncio.new_event_loop()
+
+
+def _run(kind: str, method: str, args: tuple) -> Any:
+    return _loop.run_until_complete(getattr(_repositories[kind], method)(*args))
+
+
+class ShardPool:
+    """Worker processes that each own one in-memory shard of users and orders.
+
+    Entities are placed by a stable hash of their id. Every shard is a
+    single-process executor, so its repositories see one call at a time
+    and need no locking, while different shards run on different cores.
+    Workers are started with ``spawn`` so they never inherit the server's
+    threads or locks. Arguments and results cross the process boundary
+    pickled, so the shards pay off for CPU-heavy calls (validation, index
+    maintenance, searches and aggregates over many entities), not for
+    trivial point reads.
+    """
+
+    def __init__(self, shards: Optional[int] = None):
+        context = multiprocessing.get_context("spawn")
+        self.shards = shards or os.cpu_count() or 1
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_shard)
+            for _ in range(self.shards)
+        ]
+
+    def shard_for(self, id: str) -> int:
+        # crc32 rather than hash(): str hashes are salted per process
+        return zlib.crc32(id.encode()) % self.shards
+
+    async def call(self, shard: int, kind: str, method: str, *args) -> Any:
+        """Run a repository method on one shard"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executors[shard], _run, kind, method, args)
+
+    async def call_for(self, id: str, kind: str, method: str, *args) -> Any:
+        """Run a repository method on the shard that owns id"""
+        return await self.call(self.shard_for(id), kind, method, *args)
+
+    async def scatter(self, kind: str, method: str, *args) -> List[Any]:
+        """Run a repository method on every shard in parallel, results in shard order"""
+        return await asyncio.gather(
+            *(self.call(shard, kind, method, *args) for shard in range(self.shards))
+        )
+
+    def group_by_shard(self, ids) -> Dict[int, List[str]]:
+        groups: Dict[int, List[str]] = {}
+        for id in ids:
+            groups.setdefault(self.shard_for(id), []).append(id)
+        return groups
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=True)
+
+
+def merge_id_pages(
+    pages: Sequence[Tuple[List[Any], Optional[str]]], limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Merge every shard's (page, next cursor) of an id-cursor query.
+
+    Cursors are entity ids, so the same cursor resumes every shard.
+    """
+    entities = sorted(chain.from_iterable(page for page, _ in pages), key=lambda entity: entity.id)
+    more = len(entities) > limit or any(next_cursor for _, next_cursor in pages)
+    page = entities[:limit]
+    return page, page[-1].id if page and more else None
+
+
+def partitioned_repositories(pool: ShardPool) -> Tuple[Any, Any]:
+    """Partitioned user and order repositories sharing one ShardPool.
+
+    The caller owns the pool and closes it once the repositories are no
+    longer used.
+    """
+    from infrastructure.repositories.partitioned_order_repository import PartitionedOrderRepository
+    from infrastructure.repositories.partitioned_user_repository import PartitionedUserRepository
+
+    return PartitionedUserRepository(pool), PartitionedOrderRepository(pool)
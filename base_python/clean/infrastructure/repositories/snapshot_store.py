@@ -0,0 +1,287 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, MutableMapping
+from itertools import chain
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Most entries in one tree node
+NODE_SIZE = 32
+
+_MISSING = object()
+
+
+class _Leaf:
+    __slots__ = ("keys", "values")
+
+    def __init__(self, keys: List[str], values: List[Any]):
+        self.keys = keys
+        self.values = values
+
+
+class _Branch:
+    # keys[i] is the smallest key under children[i]
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys: List[str], children: List[Any]):
+        self.keys = keys
+        self.children = children
+
+
+# Nodes are never changed once a root that reaches them is published;
+# every write copies the nodes on its path and shares the rest.
+
+def _insert(node, key: str, value: Any) -> Tuple[Any, Optional[Any], bool]:
+    """New node with key set, a split-off right sibling if it overflowed,
+    and whether the key is new"""
+    if isinstance(node, _Leaf):
+        position = bisect_left(node.keys, key)
+        if position < len(node.keys) and node.keys[position] == key:
+            values = node.values[:]
+            values[position] = value
+            return _Leaf(node.keys, values), None, False
+        keys = node.keys[:]
+        values = node.values[:]
+        keys.insert(position, key)
+        values.insert(position, value)
+        if len(keys) <= NODE_SIZE:
+            return _Leaf(keys, values), None, True
+        half = len(keys) // 2
+        return _Leaf(keys[:half], values[:half]), _Leaf(keys[half:], values[half:]), True
+
+    position = max(bisect_right(node.keys, key) - 1, 0)
+    child, sibling, added = _insert(node.children[position], key, value)
+    keys = node.keys[:]
+    children = node.children[:]
+    keys[position] = child.keys[0]
+    children[position] = child
+    if sibling is not None:
+        keys.insert(position + 1, sibling.keys[0])
+        children.insert(position + 1, sibling)
+    if len(children) <= NODE_SIZE:
+        return _Branch(keys, children), None, added
+    half = len(children) // 2
+    return (
+        _Branch(keys[:half], children[:half]),
+        _Branch(keys[half:], children[half:]),
+        added,
+    )
+
+
+def _delete(node, key: str) -> Tuple[Optional[Any], bool]:
+    """New node without key (None once empty) and whether it was there.
+
+    Nodes are not rebalanced, only dropped once empty, so a tree that
+    shrinks keeps its depth until it is emptied.
+    """
+    if isinstance(node, _Leaf):
+        position = bisect_left(node.keys, key)
+        if position == len(node.keys) or node.keys[position] != key:
+            return node, False
+        if len(node.keys) == 1:
+            return None, True
+        return (
+            _Leaf(
+                node.keys[:position] + node.keys[position + 1:],
+                node.values[:position] + node.values[position + 1:],
+            ),
+            True,
+        )
+
+    position = bisect_right(node.keys, key) - 1
+    if position < 0:
+        return node, False
+    child, removed = _delete(node.children[position], key)
+    if not removed:
+        return node, False
+    keys = node.keys[:]
+    children = node.children[:]
+    if child is None:
+        del keys[position]
+        del children[position]
+        if not children:
+            return None, True
+    else:
+        keys[position] = child.keys[0]
+        children[position] = child
+    return _Branch(keys, children), True
+
+
+def _get(node, key: str, default: Any) -> Any:
+    while node is not None:
+        if isinstance(node, _Leaf):
+            position = bisect_left(node.keys, key)
+            if position < len(node.keys) and node.keys[position] == key:
+                return node.values[position]
+            return default
+        position = bisect_right(node.keys, key) - 1
+        if position < 0:
+            return default
+        node = node.children[position]
+    return default
+
+
+def _leaves(node, after: Optional[str]) -> Iterator[Tuple[_Leaf, int]]:
+    """Leaves in key order, each with the position of its first key after ``after``"""
+    if node is None:
+        return
+    if isinstance(node, _Leaf):
+        yield node, bisect_right(node.keys, after) if after is not None else 0
+        return
+    start = max(bisect_right(node.keys, after) - 1, 0) if after is not None else 0
+    for child in node.children[start:]:
+        yield from _leaves(child, after)
+        # Every later key is past ``after``
+        after = None
+
+
+def _items(node, after: Optional[str]) -> Iterator[Tuple[str, Any]]:
+    for leaf, start in _leaves(node, after):
+        yield from zip(leaf.keys[start:], leaf.values[start:])
+
+
+def _values(node, after: Optional[str]) -> Iterator[Any]:
+    # Whole leaves at a time, so long scans run at C speed
+    return chain.from_iterable(
+        leaf.values[start:] if start else leaf.values for leaf, start in _leaves(node, after)
+    )
+
+
+class Snapshot(Mapping):
+    """Immutable view of a SnapshotStore as of one write.
+
+    Taking it is O(1) and later writes to the store never show through.
+    Entries come out in key order, lazily, and ``page`` resumes after a
+    key, so a caller can walk a large snapshot without copying it.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, root, size: int):
+        self._root = root
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: str) -> Any:
+        value = _get(self._root, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return _get(self._root, key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return _get(self._root, key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in _items(self._root, None))
+
+    def items(self, after: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        return _items(self._root, after)
+
+    def values(self, after: Optional[str] = None) -> Iterator[Any]:
+        return _values(self._root, after)
+
+    def page(self, after: Optional[str] = None, limit: int = 50) -> Tuple[List[Any], Optional[str]]:
+        """Up to ``limit`` values after the key ``after``, and the next cursor"""
+        entries = _items(self._root, after)
+        page = []
+        last = None
+        for last, value in entries:
+            page.append(value)
+            if len(page) == limit:
+                break
+        more = len(page) == limit and next(entries, None) is not None
+        return page, last if more else None
+
+
+class SnapshotStore(MutableMapping):
+    """Mapping whose every state can be captured as an O(1) Snapshot.
+
+    Entries live in a persistent B+-tree ordered by key: a write copies the
+    O(log n) nodes on its path and publishes a new root, sharing every other
+    node with earlier roots, so a snapshot is just the root it started from
+    and the tree is the only copy of the data. Point reads walk the current
+    root.
+
+    Writers build their new root without any lock and publish it with one
+    compare-and-swap, retrying if another write was published meanwhile,
+    so writes to different keys never wait on each other. Writes to the
+    same key are ordered by whoever calls the store (the thread-safe
+    repositories hold that key's stripe lock). Reads and snapshots never
+    wait, so readers iterating a snapshot do not hold up writers either.
+
+    Unlike a dict, iteration is in key order, not insertion order, so the
+    in-memory repositories list entities by id. With time-ordered IDs that
+    is close to creation order. With random or client-chosen IDs it is not,
+    and re-creating an entity no longer moves it to the end.
+    """
+
+    def __init__(self):
+        # (tree root, size), replaced as one tuple so readers never see a
+        # root with another write's size
+        self._published: Tuple[Any, int] = (None, 0)
+        # Guards only the compare-and-swap of _published, never a tree update
+        self._swap_lock = threading.Lock()
+
+    def _swap(self, expected: Tuple[Any, int], published: Tuple[Any, int]) -> bool:
+        """Publish a new (root, size) unless another write got there first"""
+        with self._swap_lock:
+            if self._published is not expected:
+                return False
+            self._published = published
+            return True
+
+    def snapshot(self) -> Snapshot:
+        """Immutable view of the store as of the last completed write"""
+        return Snapshot(*self._published)
+
+    def __getitem__(self, key: str) -> Any:
+        value = _get(self._published[0], key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return _get(self._published[0], key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return _get(self._published[0], key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._published[1]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.snapshot())
+
+    def values(self) -> Iterator[Any]:
+        """Values of a snapshot taken now, in key order, read lazily"""
+        return self.snapshot().values()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        while True:
+            expected = self._published
+            root, size = expected
+            if root is None:
+                root, added = _Leaf([key], [value]), True
+            else:
+                root, sibling, added = _insert(root, key, value)
+                if sibling is not None:
+                    root = _Branch([root.keys[0], sibling.keys[0]], [root, sibling])
+            if self._swap(expected, (root, size + added)):
+                return
+
+    def __delitem__(self, key: str) -> None:
+        while True:
+            expected = self._published
+            root, size = expected
+            root, removed = _delete(root, key) if root is not None else (None, False)
+            if not removed:
+                raise KeyError(key)
+            # Drop branches left with a single child
+            while isinstance(root, _Branch) and len(root.children) == 1:
+                root = root.children[0]
+            if self._swap(expected, (root, size - 1)):
+                return
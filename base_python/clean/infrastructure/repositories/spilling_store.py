@@ -0,0 +1,208 @@
+import dbm
+import json
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+class SpillingStore(MutableMapping):
+    """Mapping that keeps a bounded hot set in memory and spills the rest to disk.
+
+    Entries live either in the in-memory LRU or in a dbm file, never both.
+    When the hot set exceeds ``max_entries`` or ``max_bytes`` (measured as
+    encoded size), least recently used entries are encoded and written to
+    disk. Reading a spilled key faults it back in as most recently used.
+    Only the keys are always kept in memory, in insertion order, so
+    iteration order and ``len`` do not depend on where an entry lives.
+
+    ``values()`` streams entries without promoting spilled ones, so a full
+    scan neither loads everything at once nor flushes the hot set. The store
+    is internally locked and safe to share between threads.
+
+    Memory is bounded only for entity bodies. Besides the key set, the
+    repositories built on this store keep their secondary indexes in
+    memory, and those indexes hold every id and every indexed term or value
+    (emails, name and product terms, quantities, creation minutes,
+    statuses). Memory therefore still grows with the number of entities,
+    just by far less per entity.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[bytes], Any],
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        if max_entries is None and max_bytes is None:
+            raise ValueError("SpillingStore needs max_entries or max_bytes")
+        self._encode = encode
+        self._decode = decode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._directory = None
+        if path is None:
+            self._directory = tempfile.TemporaryDirectory(prefix="spill-")
+            path = os.path.join(self._directory.name, "store")
+        self.path = path
+        self._disk = dbm.open(path, "n")
+        # key -> (value, encoded size), least recently used first
+        self._hot: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._hot_bytes = 0
+        # Every key, in insertion order (dict used as an ordered set)
+        self._keys: Dict[str, None] = {}
+        self._lock = threading.RLock()
+        # Close the dbm file before its temporary directory is removed,
+        # including at interpreter exit
+        self._finalizer = weakref.finalize(self, _release, self._disk, self._directory)
+
+        self.hits = 0
+        self.faults = 0
+        self.evictions = 0
+
+    def _size(self, value: Any) -> int:
+        # Encoding is only needed to measure entries against a byte budget
+        return len(self._encode(value)) if self.max_bytes is not None else 0
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._hot) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._hot_bytes > self.max_bytes
+
+    def _evict(self) -> None:
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while len(self._hot) > 1 and self._over_budget():
+            key, (value, size) = self._hot.popitem(last=False)
+            self._disk[key] = self._encode(value)
+            self._hot_bytes -= size
+            self.evictions += 1
+
+    def _admit(self, key: str, value: Any) -> None:
+        size = self._size(value)
+        self._hot[key] = (value, size)
+        self._hot_bytes += size
+        self._evict()
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            entry = self._hot.get(key)
+            if entry is not None:
+                self._hot.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if key not in self._keys:
+                raise KeyError(key)
+            value = self._decode(self._disk[key])
+            del self._disk[key]
+            self.faults += 1
+            self._admit(key, value)
+            return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            entry = self._hot.pop(key, None)
+            if entry is not None:
+                self._hot_bytes -= entry[1]
+            elif key in self._keys:
+                del self._disk[key]
+            self._keys[key] = None
+            self._admit(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if key not in self._keys:
+                raise KeyError(key)
+            del self._keys[key]
+            entry = self._hot.pop(key, None)
+            if entry is not None:
+                self._hot_bytes -= entry[1]
+            else:
+                del self._disk[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = list(self._keys)
+        return iter(keys)
+
+    def values(self) -> Iterator[Any]:
+        """Stream every value from memory and disk without changing recency"""
+        for key in self:
+            with self._lock:
+                entry = self._hot.get(key)
+                if entry is not None:
+                    value = entry[0]
+                elif key in self._keys:
+                    value = self._decode(self._disk[key])
+                else:
+                    # Deleted since the key snapshot was taken
+                    continue
+            yield value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._keys),
+                "hot_entries": len(self._hot),
+                "hot_bytes": self._hot_bytes,
+                "spilled_entries": len(self._keys) - len(self._hot),
+                "hits": self.hits,
+                "faults": self.faults,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._finalizer()
+
+
+def _release(disk, directory) -> None:
+    disk.close()
+    if directory is not None:
+        directory.cleanup()
+
+
+def entity_store(
+    entity_class,
+    path: Optional[str] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> SpillingStore:
+    """SpillingStore for domain entities, serialized as their to_dict() JSON"""
+    return SpillingStore(
+        encode=lambda entity: json.dumps(entity.to_dict(), separators=(",", ":")).encode(),
+        decode=lambda data: entity_class(**json.loads(data)),
+        path=path,
+        max_entries=max_entries,
+        max_bytes=max_bytes,
+    )
+
+
+def entity_store_from_env(entity_class, name: str) -> Optional[SpillingStore]:
+    """Bounded store configured by REPOSITORY_MAX_ENTRIES / REPOSITORY_MAX_BYTES.
+
+    Returns None when neither is set, so the repositories keep their default
+    unbounded SnapshotStore. Spill files go to REPOSITORY_SPILL_DIR, or a
+    temporary directory. Only entity bodies are bounded; see SpillingStore.
+    """
+    max_entries = os.environ.get("REPOSITORY_MAX_ENTRIES")
+    max_bytes = os.environ.get("REPOSITORY_MAX_BYTES")
+    if not max_entries and not max_bytes:
+        return None
+    directory = os.environ.get("REPOSITORY_SPILL_DIR")
+    return entity_store(
+        entity_class,
+        path=os.path.join(directory, name) if directory else None,
+        max_entries=int(max_entries) if max_entries else None,
+        max_bytes=int(max_bytes) if max_bytes else None,
+    )
@@ -0,0 +1,50 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List
+
+
+class StripedLock:
+    """A fixed set of locks with keys hashed across them.
+
+    Operations on different keys usually take different locks and proceed in
+    parallel; ``all()`` takes every stripe, in a fixed order, for operations
+    that need the whole key space to stand still.
+    """
+
+    def __init__(self, stripes: int = 16):
+        if stripes < 1:
+            raise ValueError("At least one stripe is required")
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def _stripe(self, key: str) -> int:
+        return hash(key) % len(self._locks)
+
+    def for_key(self, key: str) -> threading.Lock:
+        """Return the lock guarding a key"""
+        return self._locks[self._stripe(key)]
+
+    @contextmanager
+    def for_keys(self, keys: Iterable[str]) -> Iterator[None]:
+        """Hold the stripes of several keys, taken in the same order as all()"""
+        locks = [self._locks[stripe] for stripe in sorted({self._stripe(key) for key in keys})]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @contextmanager
+    def all(self) -> Iterator[None]:
+        """Hold every stripe, e.g. for a consistent snapshot"""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
@@ -0,0 +1,174 @@
+import threading
+from typing import Any, AsyncIterator, Dict, List, MutableMapping, Optional, Sequence, Tuple
+from domain.order import Order
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.snapshot_store import Snapshot, SnapshotStore
+from infrastructure.repositories.spilling_store import SpillingStore
+from infrastructure.repositories.striped_lock import StripedLock
+
+
+class ThreadSafeInMemoryOrderRepository(InMemoryOrderRepository):
+    """InMemoryOrderRepository that is safe to share between server threads.
+
+    Uses the same locking scheme as ThreadSafeInMemoryUserRepository: a
+    stripe lock per id for point operations, every stripe for ``find_all``
+    snapshots, and one index lock for the product and quantity indexes.
+    """
+
+    def __init__(
+        self,
+        stripes: int = 16,
+        store: Optional[MutableMapping[str, Order]] = None,
+        change_log: Optional[ChangeLog] = None,
+    ):
+        super().__init__(store, change_log)
+        self._stripes = StripedLock(stripes)
+        self._index_lock = threading.Lock()
+
+    async def create(self, order: Order) -> None:
+        """Create a new order"""
+        with self._stripes.for_key(order.id):
+            existing = self._orders.get(order.id)
+            self._orders[order.id] = order
+            with self._index_lock:
+                if existing is not None:
+                    self._unindex(existing)
+                self._index(order)
+            # Logged under the stripe lock so the feed orders writes to one id
+            # the same way they were applied
+            self._record("create", order.id, order)
+
+    async def find_by_id(self, id: str) -> Optional[Order]:
+        """Find order by ID"""
+        with self._stripes.for_key(id):
+            return self._orders.get(id)
+
+    def _snapshot(self) -> Snapshot:
+        with self._stripes.all():
+            return self._orders.snapshot()
+
+    async def find_all(self) -> List[Order]:
+        """Get a consistent snapshot of all orders"""
+        if isinstance(self._orders, SnapshotStore):
+            return list(self._snapshot().values())
+        with self._stripes.all():
+            return list(self._orders.values())
+
+    async def iter_all(self) -> AsyncIterator[Order]:
+        """Iterate over all orders; a SpillingStore is streamed without the stripes"""
+        if isinstance(self._orders, SnapshotStore):
+            values = self._snapshot().values()
+        elif isinstance(self._orders, SpillingStore):
+            values = self._orders.values()
+        else:
+            values = await self.find_all()
+        for order in values:
+            yield order
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders by id, read from a consistent snapshot"""
+        if not isinstance(self._orders, SnapshotStore):
+            return await super().find_page(cursor, limit)
+        return self._snapshot().page(cursor, limit)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find order by ID, returning only the requested fields"""
+        with self._stripes.for_key(id):
+            order = self._orders.get(id)
+        return order.to_dict(fields) if order else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all orders, returning only the requested fields"""
+        orders = await self.find_all()
+        return [order.to_dict(fields) for order in orders]
+
+    # The in-memory index queries never suspend, so the lock is not held
+    # across a real await point.
+
+    async def search_by_product(self, query: str, limit: int = 20) -> List[Order]:
+        """Find orders matching every query term using the inverted index"""
+        with self._index_lock:
+            return await super().search_by_product(query, limit)
+
+    async def find_by_quantity_range(
+        self,
+        min_quantity: Optional[int] = None,
+        max_quantity: Optional[int] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+    ) -> Tuple[List[Order], Optional[str]]:
+        """Find orders in a quantity range using the sorted index"""
+        with self._index_lock:
+            return await super().find_by_quantity_range(
+                min_quantity, max_quantity, limit, cursor, descending
+            )
+
+    async def top_n_by_quantity(self, n: int) -> List[Order]:
+        """Get the n orders with the largest quantity from the sorted index"""
+        with self._index_lock:
+            return await super().top_n_by_quantity(n)
+
+    async def find_by_user_id(self, user_id: str) -> List[Order]:
+        """Find the orders of one user using the user_id index"""
+        with self._index_lock:
+            return await super().find_by_user_id(user_id)
+
+    async def find_by_created_range(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Order]:
+        """Find orders with since <= created_at < until from the minute buckets"""
+        with self._index_lock:
+            return await super().find_by_created_range(since, until, limit)
+
+    async def created_timeseries(
+        self,
+        bucket_seconds: int,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Order count and quantity per bucket, rolled up from the minute buckets"""
+        with self._index_lock:
+            return await super().created_timeseries(bucket_seconds, since, until)
+
+    async def find_by_status(
+        self, status: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Order], Optional[str]]:
+        """One page of orders with this status from the status index"""
+        with self._index_lock:
+            return await super().find_by_status(status, cursor, limit)
+
+    async def count_by_status(self) -> Dict[str, int]:
+        """Number of orders in each status, read off the status index"""
+        with self._index_lock:
+            return await super().count_by_status()
+
+    async def update_status(self, ids: Sequence[str], status: str) -> Dict[str, str]:
+        """Move a batch of orders to status atomically.
+
+        The stripes of every id in the batch are held, in stripe order, for
+        the whole batch, so other threads see all of it applied or none.
+        """
+        ids = list(dict.fromkeys(ids))
+        with self._stripes.for_keys(ids):
+            with self._index_lock:
+                return await super().update_status(ids, status)
+
+    async def delete(self, id: str) -> None:
+        """Delete order by ID"""
+        with self._stripes.for_key(id):
+            order = self._orders.get(id)
+            if order is None:
+                raise ValueError("Order not found")
+            with self._index_lock:
+                self._unindex(order)
+            del self._orders[id]
+            self._record("delete", id)
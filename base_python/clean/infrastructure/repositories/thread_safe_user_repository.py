@@ -0,0 +1,120 @@
+import threading
+from typing import Any, AsyncIterator, Dict, List, MutableMapping, Optional, Sequence, Tuple
+from domain.user import User
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.snapshot_store import Snapshot, SnapshotStore
+from infrastructure.repositories.spilling_store import SpillingStore
+from infrastructure.repositories.striped_lock import StripedLock
+
+
+class ThreadSafeInMemoryUserRepository(InMemoryUserRepository):
+    """InMemoryUserRepository that is safe to share between server threads.
+
+    Point operations lock only the stripe that owns the id, so requests for
+    different users do not serialize. ``find_all`` holds every stripe to get a
+    consistent snapshot: just long enough to take an O(1) SnapshotStore
+    snapshot, or while it copies any other store. The secondary indexes
+    share one short-lived lock, always taken after a stripe lock. An id is
+    added to the indexes after it is stored and removed from them before it
+    is deleted, so index lookups never point at a missing user.
+    """
+
+    def __init__(
+        self,
+        stripes: int = 16,
+        store: Optional[MutableMapping[str, User]] = None,
+        change_log: Optional[ChangeLog] = None,
+    ):
+        super().__init__(store, change_log)
+        self._stripes = StripedLock(stripes)
+        self._index_lock = threading.Lock()
+
+    async def create(self, user: User) -> None:
+        """Create a new user"""
+        with self._stripes.for_key(user.id):
+            existing = self._users.get(user.id)
+            self._users[user.id] = user
+            with self._index_lock:
+                if existing is not None:
+                    self._unindex(existing)
+                self._index(user)
+            # Logged under the stripe lock so the feed orders writes to one id
+            # the same way they were applied
+            self._record("create", user.id, user)
+
+    async def find_by_id(self, id: str) -> Optional[User]:
+        """Find user by ID"""
+        with self._stripes.for_key(id):
+            return self._users.get(id)
+
+    def _snapshot(self) -> Snapshot:
+        # The stripes are only held to take the O(1) snapshot, so it never
+        # catches a multi-id write half applied
+        with self._stripes.all():
+            return self._users.snapshot()
+
+    async def find_all(self) -> List[User]:
+        """Get a consistent snapshot of all users"""
+        if isinstance(self._users, SnapshotStore):
+            return list(self._snapshot().values())
+        with self._stripes.all():
+            return list(self._users.values())
+
+    async def iter_all(self) -> AsyncIterator[User]:
+        """Iterate over all users; a SpillingStore is streamed without the stripes"""
+        if isinstance(self._users, SnapshotStore):
+            values = self._snapshot().values()
+        elif isinstance(self._users, SpillingStore):
+            values = self._users.values()
+        else:
+            values = await self.find_all()
+        for user in values:
+            yield user
+
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[User], Optional[str]]:
+        """One page of users by id, read from a consistent snapshot"""
+        if not isinstance(self._users, SnapshotStore):
+            return await super().find_page(cursor, limit)
+        return self._snapshot().page(cursor, limit)
+
+    async def find_by_id_projected(
+        self, id: str, fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find user by ID, returning only the requested fields"""
+        with self._stripes.for_key(id):
+            user = self._users.get(id)
+        return user.to_dict(fields) if user else None
+
+    async def find_all_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Get all users, returning only the requested fields"""
+        users = await self.find_all()
+        return [user.to_dict(fields) for user in users]
+
+    # The in-memory index queries never suspend, so the lock is not held
+    # across a real await point.
+
+    async def find_by_email(self, email: str) -> List[User]:
+        """Find users with exactly this email using the hash index"""
+        with self._index_lock:
+            return await super().find_by_email(email)
+
+    async def find_by_name_prefix(
+        self, prefix: str, limit: Optional[int] = None
+    ) -> List[User]:
+        """Find users whose name starts with prefix using the sorted index"""
+        with self._index_lock:
+            return await super().find_by_name_prefix(prefix, limit)
+
+    async def delete(self, id: str) -> None:
+        """Delete user by ID"""
+        with self._stripes.for_key(id):
+            user = self._users.get(id)
+            if user is None:
+                raise ValueError("User not found")
+            with self._index_lock:
+                self._unindex(user)
+            del self._users[id]
+            self._record("delete", id)
@@ -0,0 +1 @@
+# Tracing package
@@ -0,0 +1,106 @@
+import functools
+import inspect
+from typing import Any, Dict
+
+
+def _result_attributes(operation: str, result: Any) -> Dict[str, Any]:
+    """Span attributes describing a repository or use case result"""
+    if result is None:
+        return {"result.found": False} if operation.startswith("find") else {}
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        # Paginated results: (page, next_cursor)
+        result = result[0]
+    if isinstance(result, (list, tuple)):
+        return {"result.count": len(result)}
+    if isinstance(result, bool):
+        return {"result.value": result}
+    attributes: Dict[str, Any] = {"result.found": True}
+    entity_id = getattr(result, "id", None)
+    if entity_id is None and isinstance(result, dict):
+        entity_id = result.get("id")
+    if entity_id is not None:
+        attributes["entity.id"] = entity_id
+    return attributes
+
+
+def _argument_attributes(args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Span attributes describing the entity a call is about"""
+    values = list(args) + list(kwargs.values())
+    if not values:
+        return {}
+    first = values[0]
+    if isinstance(first, str):
+        return {"entity.id": first}
+    entity_id = getattr(first, "id", None)
+    if entity_id is not None:
+        return {"entity.id": entity_id}
+    if isinstance(first, (list, tuple)):
+        return {"argument.count": len(first)}
+    return {}
+
+
+def trace_coroutine(tracer, span_name: str, function, attributes: Dict[str, Any]):
+    """Wrap a coroutine function so each call runs in its own span"""
+    operation = function.__name__
+
+    @functools.wraps(function)
+    async def traced(*args, **kwargs):
+        with tracer.start_as_current_span(span_name, attributes=attributes) as span:
+            span.set_attributes(_argument_attributes(args, kwargs))
+            result = await function(*args, **kwargs)
+            span.set_attributes(_result_attributes(operation, result))
+            return result
+
+    return traced
+
+
+class TracedRepository:
+    """Proxy that records a span around every async method of a repository.
+
+    Works for any port implementation; synchronous attributes are passed
+    through untouched.
+    """
+
+    def __init__(self, repository, tracer, name: str):
+        self._repository = repository
+        self._tracer = tracer
+        self._name = name
+
+    def __getattr__(self, attribute: str):
+        value = getattr(self._repository, attribute)
+        if attribute.startswith("_") or not inspect.iscoroutinefunction(value):
+            return value
+        traced = trace_coroutine(
+            self._tracer,
+            f"{self._name}.{attribute}",
+            value,
+            {"db.system": type(self._repository).__name__, "db.operation": attribute},
+        )
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, attribute, traced)
+        return traced
+
+
+class TracedUseCase:
+    """Proxy that records a span around a use case's execute() and execute_many()"""
+
+    def __init__(self, use_case, tracer):
+        self._use_case = use_case
+        name = type(use_case).__name__
+        for method in ("execute", "execute_many"):
+            function = getattr(use_case, method, None)
+            if function is not None:
+                setattr(self, method, trace_coroutine(tracer, f"{name}.{method}", function, {"use_case": name}))
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._use_case, attribute)
+
+
+def instrument_repository(repository, tracer, name: str):
+    """Return the repository traced with tracer, or unchanged if tracer is None"""
+    return repository if tracer is None else TracedRepository(repository, tracer, name)
+
+
+def instrument_use_case(use_case, tracer):
+    """Return the use case traced with tracer, or unchanged if tracer is None"""
+    return use_case if tracer is None else TracedUseCase(use_case, tracer)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The clean architecture imports its layers from the clean/ directory
+CLEAN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CLEAN_DIR)
+# and middleware shared with the monolith from base_python/shared
+sys.path.insert(1, os.path.dirname(CLEAN_DIR))
@@ -0,0 +1,66 @@
+"""
+Background task tests: a Flask app starts its health monitor once per
+process, on the first request, and stops it on demand.
+"""
+
+import asyncio
+import threading
+import time
+
+from shared.http.health import HealthMonitor
+from infrastructure.http.background import BackgroundTasks
+from infrastructure.http.flask_app import create_flask_app
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def background_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "flask-background"]
+
+
+def test_tasks_start_once_and_stop():
+    runs = []
+    cancelled = threading.Event()
+
+    async def task():
+        runs.append(threading.get_ident())
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    tasks = BackgroundTasks("test-background")
+    tasks.add(task)
+    for _ in range(3):
+        tasks.start()
+    wait_until(lambda: runs)
+    assert tasks.running and len(runs) == 1
+
+    tasks.stop()
+    assert cancelled.is_set() and not tasks.running
+    tasks.start()
+    assert not tasks.running and len(runs) == 1
+
+
+def test_flask_health_monitor_runs_once_per_process():
+    before = len(background_threads())
+    monitor = HealthMonitor(interval=0.01)
+    app = create_flask_app(health_monitor=monitor)
+    # Building the app starts nothing
+    assert len(background_threads()) == before
+
+    client = app.test_client()
+    for _ in range(3):
+        client.get("/health")
+    assert len(background_threads()) == before + 1
+    wait_until(lambda: monitor.snapshot()["status"] == "healthy")
+    assert client.get("/health/deep").status_code == 200
+
+    app.extensions["background_tasks"].stop()
+    assert len(background_threads()) == before
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from application.use_cases.delete_user import DeleteUserUseCase
+from domain.order import Order
+from domain.user import User
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.http.flask_app import create_flask_app
+from infrastructure.http.schemas import MAX_BATCH_SIZE
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+
+
+@pytest.fixture
+def repositories():
+    users, orders = InMemoryUserRepository(), InMemoryOrderRepository()
+
+    async def fill():
+        for i in range(3):
+            await users.create(User(f"u{i}", f"User {i}", f"user{i}@example.com"))
+        for i in range(9):
+            await orders.create(Order(f"o{i}", f"u{i % 3}", "Pen", 1))
+
+    asyncio.run(fill())
+    return users, orders
+
+
+def test_delete_many_reports_each_id_once(repositories):
+    _, orders = repositories
+
+    results = asyncio.run(orders.delete_many(["o1", "missing", "o1", "o2"]))
+    assert results == {"o1": True, "missing": False, "o2": True}
+    assert len(asyncio.run(orders.find_all())) == 7
+    assert [order.id for order in asyncio.run(orders.find_by_user_id("u1"))] == ["o4", "o7"]
+
+
+def test_cascade_deletes_only_the_users_orders(repositories):
+    users, orders = repositories
+    use_case = DeleteUserUseCase(users, orders)
+
+    results = asyncio.run(use_case.execute_many(["u0", "u9"], cascade=True))
+    assert results == {
+        "u0": {"status": "deleted", "orders_deleted": ["o0", "o3", "o6"]},
+        "u9": {"status": "not_found", "orders_deleted": []},
+    }
+    assert asyncio.run(orders.find_by_user_id("u0")) == []
+    assert "u0" not in orders._user_index
+    assert sorted(order.id for order in asyncio.run(orders.find_all())) == [
+        "o1", "o2", "o4", "o5", "o7", "o8"
+    ]
+
+    assert asyncio.run(use_case.execute("u1", cascade=True)) == ["o1", "o4", "o7"]
+    assert asyncio.run(users.find_by_id("u1")) is None
+
+
+def test_cascade_needs_an_order_repository(repositories):
+    users, _ = repositories
+
+    with pytest.raises(ValueError):
+        asyncio.run(DeleteUserUseCase(users).execute("u0", cascade=True))
+    # Nothing was deleted
+    assert asyncio.run(users.find_by_id("u0")) is not None
+
+
+def test_bulk_delete_routes(repositories):
+    users, orders = repositories
+    client = TestClient(create_fastapi_app(users, orders))
+
+    response = client.request("DELETE", "/api/orders", json={"ids": ["o8", "nope"]})
+    assert response.status_code == 200
+    assert (response.json()["deleted"], response.json()["not_found"]) == (1, 1)
+
+    response = client.request("DELETE", "/api/users?cascade=true", json={"ids": ["u2"]})
+    assert response.json()["results"] == {"u2": {"status": "deleted", "orders_deleted": ["o2", "o5"]}}
+
+    assert client.request("DELETE", "/api/users", json={"ids": []}).status_code == 400
+    assert client.request("DELETE", "/api/users", json={"ids": ["u"] * 1001}).status_code == 400
+
+
+def test_flask_bulk_delete_shares_the_batch_limit(repositories):
+    users, _ = repositories
+    client = create_flask_app(custom_user_repository=users).test_client()
+    too_many = {"ids": ["u"] * (MAX_BATCH_SIZE + 1)}
+    assert client.delete("/users", json=too_many).status_code == 400
+
+    response = client.delete("/users", json={"ids": ["u0"] * MAX_BATCH_SIZE})
+    assert response.status_code == 200
+    assert response.get_json()["deleted"] == 1
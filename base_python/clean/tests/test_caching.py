@@ -0,0 +1,159 @@
+import asyncio
+
+from domain.order import Order
+from domain.user import User
+from infrastructure.repositories.caching import RepositoryCache, TTLCache
+from infrastructure.repositories.caching_order_repository import CachingOrderRepository
+from infrastructure.repositories.caching_user_repository import CachingUserRepository
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+
+
+class CountingUserRepository(InMemoryUserRepository):
+    """Counts backend reads; a read can be held until ``release`` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.release = None
+
+    async def find_by_id(self, id):
+        self.reads += 1
+        user = await super().find_by_id(id)
+        if self.release is not None:
+            await self.release.wait()
+        return user
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired_entries():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    # "b" was the least recently used
+    assert cache.get("b", None) is None and len(cache) == 2
+
+    cache.put("d", 4, ttl=1)
+    now[0] = 5.0
+    assert cache.get("d", None) is None
+    assert cache.get("c") == 3
+    now[0] = 10.0
+    assert cache.get("c", None) is None
+
+
+def test_fill_from_before_a_write_is_dropped():
+    cache = RepositoryCache()
+    version = cache.version
+    cache.invalidate(["u1"])
+    cache.fill("u1", "stale", version)
+    assert cache.lookup("u1") == (False, None)
+
+    cache.fill("u1", "fresh", cache.version)
+    assert cache.lookup("u1") == (True, "fresh")
+
+
+def test_slow_read_cannot_reinstate_a_replaced_user():
+    async def scenario():
+        backend = CountingUserRepository()
+        users = CachingUserRepository(backend)
+        await users.create(User("u1", "Old", "old@example.com"))
+
+        backend.release = asyncio.Event()
+        slow_read = asyncio.create_task(users.find_by_id("u1"))
+        await asyncio.sleep(0)
+        # The write lands while the read holds the old user
+        await users.create(User("u1", "New", "new@example.com"))
+        backend.release.set()
+        assert (await slow_read).name == "Old"
+
+        assert (await users.find_by_id("u1")).name == "New"
+        assert (await users.find_by_id("u1")).name == "New"
+        assert backend.reads == 2
+
+    asyncio.run(scenario())
+
+
+def test_misses_are_cached_until_a_create():
+    async def scenario():
+        backend = CountingUserRepository()
+        users = CachingUserRepository(backend)
+
+        assert await users.find_by_id("u1") is None
+        assert await users.find_by_id("u1") is None
+        assert backend.reads == 1 and users.stats()["negative_hits"] == 1
+
+        await users.create(User("u1", "Ana", "ana@example.com"))
+        assert (await users.find_by_id("u1")).name == "Ana"
+
+    asyncio.run(scenario())
+
+
+def test_order_writes_invalidate_entries_and_the_listing():
+    async def scenario():
+        orders = CachingOrderRepository(InMemoryOrderRepository(), cache_find_all=True)
+        for i in range(3):
+            await orders.create(Order(f"o{i}", "u1" if i else "u2", "Pen", 1))
+        assert len(await orders.find_all()) == 3
+        assert len(await orders.find_all()) == 3
+        assert orders.stats()["listing_hits"] == 1
+        assert (await orders.find_by_id("o1")).status == "pending"
+
+        await orders.update_status(["o1"], "completed")
+        assert (await orders.find_by_id("o1")).status == "completed"
+        assert {order.status for order in await orders.find_all()} == {"pending", "completed"}
+
+        await orders.delete_by_user_id("u1")
+        assert await orders.find_by_id("o1") is None
+        assert [order.id for order in await orders.find_all()] == ["o0"]
+
+    asyncio.run(scenario())
+
+
+class CountingPagesUserRepository(InMemoryUserRepository):
+    """Counts find_page calls reaching the backend"""
+
+    def __init__(self):
+        super().__init__()
+        self.page_reads = 0
+
+    async def find_page(self, cursor=None, limit=50):
+        self.page_reads += 1
+        return await super().find_page(cursor, limit)
+
+
+def test_pages_are_cached_by_version_cursor_and_limit():
+    async def scenario():
+        backend = CountingPagesUserRepository()
+        users = CachingUserRepository(backend, cache_find_all=True)
+        for i in range(5):
+            await users.create(User(f"u{i}", f"User {i}", f"u{i}@example.com"))
+
+        page, cursor = await users.find_page(limit=2)
+        assert [user.id for user in page] == ["u0", "u1"] and cursor == "u1"
+        # The cached copy cannot be changed through a returned page
+        page.clear()
+        assert [user.id for user in (await users.find_page(limit=2))[0]] == ["u0", "u1"]
+        await users.find_page(cursor, 2)
+        await users.find_page(limit=3)
+        assert backend.page_reads == 3
+        stats = users.stats()
+        assert (stats["page_hits"], stats["page_misses"]) == (1, 3)
+
+        await users.delete("u0")
+        page, cursor = await users.find_page(limit=2)
+        assert [user.id for user in page] == ["u1", "u2"] and backend.page_reads == 4
+
+    asyncio.run(scenario())
+
+
+def test_pages_are_not_cached_without_listing_caching():
+    async def scenario():
+        backend = CountingPagesUserRepository()
+        users = CachingUserRepository(backend)
+        await users.find_page(limit=2)
+        await users.find_page(limit=2)
+        assert backend.page_reads == 2
+
+    asyncio.run(scenario())
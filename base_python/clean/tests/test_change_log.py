@@ -0,0 +1,97 @@
+"""
+Change feed tests: the ring buffer, cursor expiry and the routes.
+"""
+
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.http.flask_app import create_flask_app
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+
+
+def fill(change_log, count):
+    for i in range(1, count + 1):
+        change_log.append("order", "create", f"o{i}", {"n": i})
+
+
+def seqs(page):
+    return [change["seq"] for change in page["changes"]]
+
+
+def test_ring_keeps_the_newest_capacity_changes():
+    change_log = ChangeLog(capacity=5)
+    fill(change_log, 12)
+
+    # Changes 1-7 were overwritten by the wrap-around
+    page = change_log.since(0)
+    assert seqs(page) == [8, 9, 10, 11, 12]
+    assert page["truncated"] and page["next"] == 12 and page["last_seq"] == 12
+    assert [change["id"] for change in page["changes"]] == ["o8", "o9", "o10", "o11", "o12"]
+
+    # A cursor whose next change is the oldest kept one is still intact
+    assert not change_log.since(7)["truncated"]
+    assert seqs(change_log.since(7)) == [8, 9, 10, 11, 12]
+    assert change_log.since(6)["truncated"]
+
+    page = change_log.since(9, limit=2)
+    assert seqs(page) == [10, 11] and page["next"] == 11 and not page["truncated"]
+    page = change_log.since(page["next"], limit=2)
+    assert seqs(page) == [12] and page["next"] == 12
+
+    page = change_log.since(12)
+    assert page["changes"] == [] and page["next"] == 12 and not page["truncated"]
+
+
+def test_cursor_from_before_a_restart_expires():
+    change_log = ChangeLog(capacity=5)
+    fill(change_log, 3)
+    # A consumer that saw seq 40 of a previous process
+    page = change_log.since(40)
+    assert page["truncated"]
+    assert page["changes"] == [] and page["next"] == 3
+    assert seqs(change_log.since(page["next"])) == []
+
+
+def test_wait_async_wakes_on_a_write_from_another_thread():
+    change_log = ChangeLog()
+
+    async def scenario():
+        assert not await change_log.wait_async(0, 0.01)
+        timer = threading.Timer(0.05, fill, (change_log, 1))
+        timer.start()
+        assert await change_log.wait_async(0, 5)
+        timer.join()
+
+    asyncio.run(scenario())
+    assert change_log.wait(0, 0)
+
+
+def test_change_feed_route():
+    client = TestClient(create_fastapi_app())
+    client.post("/api/users", json={"name": "Ana", "email": "ana@example.com"})
+    changes = client.get("/api/changes").json()["changes"]
+    assert [(change["entity"], change["operation"]) for change in changes] == [("user", "create")]
+
+
+def test_change_feed_is_disabled_for_backends_that_do_not_publish():
+    client = TestClient(create_fastapi_app(custom_order_repository=InMemoryOrderRepository()))
+    assert client.get("/api/changes").status_code == 501
+
+    # A caller wiring its own change log keeps the feed
+    change_log = ChangeLog()
+    client = TestClient(
+        create_fastapi_app(
+            custom_order_repository=InMemoryOrderRepository(change_log=change_log),
+            change_log=change_log,
+        )
+    )
+    assert client.get("/api/changes").status_code == 200
+
+    flask_client = create_flask_app(custom_user_repository=InMemoryUserRepository()).test_client()
+    assert flask_client.get("/changes").status_code == 501
+    assert create_flask_app().test_client().get("/changes").status_code == 200
@@ -0,0 +1,141 @@
+"""
+Response compression tests for the shared middleware and the Flask app.
+"""
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from flask import Response, stream_with_context
+
+from shared.http import compression
+from shared.http.compression import CompressionMiddleware, choose_encoding, compress_stream
+from infrastructure.http.flask_app import create_flask_app
+
+
+def test_compress_stream_encodes_str_chunks():
+    chunks = ["héllo ", b"bytes ", "wörld"]
+    body = b"".join(compress_stream(iter(chunks), "gzip"))
+    assert gzip.decompress(body) == "héllo bytes wörld".encode("utf-8")
+
+
+def test_flask_compresses_streamed_str_body():
+    app = create_flask_app()
+
+    @app.route("/stream")
+    def stream():
+        def generate():
+            for i in range(100):
+                yield f"line {i}\n"
+        return Response(stream_with_context(generate()), mimetype="text/plain")
+
+    response = app.test_client().get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    expected = "".join(f"line {i}\n" for i in range(100)).encode()
+    assert gzip.decompress(response.get_data()) == expected
+
+
+def asgi_app(*chunks, content_type=b"application/json", headers=()):
+    """An ASGI app sending chunks as one response, streamed if more than one"""
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", content_type), *headers],
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            more_body = i < len(chunks) - 1
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    return app
+
+
+def call(app, path="/api/users", accept_encoding=b"gzip"):
+    """Headers and body messages sent by app for a GET of path"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(b"accept-encoding", accept_encoding)],
+    }
+    asyncio.run(app(scope, receive, send))
+    start, *bodies = messages
+    return dict(start["headers"]), bodies
+
+
+def test_asgi_small_responses_are_not_compressed():
+    body = b'{"id":"u1"}'
+    headers, bodies = call(CompressionMiddleware(asgi_app(body), minimum_size=100))
+    assert b"content-encoding" not in headers
+    assert [message["body"] for message in bodies] == [body]
+
+    large = b"x" * 100
+    headers, bodies = call(CompressionMiddleware(asgi_app(large), minimum_size=100))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"content-length"] == str(len(bodies[0]["body"])).encode()
+    assert gzip.decompress(bodies[0]["body"]) == large
+
+
+def test_asgi_excluded_paths_are_never_compressed():
+    middleware = CompressionMiddleware(asgi_app(b"x" * 5000), minimum_size=1)
+    for path in compression.DEFAULT_EXCLUDED_PATHS:
+        headers, bodies = call(middleware, path)
+        assert b"content-encoding" not in headers
+        assert bodies[0]["body"] == b"x" * 5000
+
+
+def test_asgi_streams_are_compressed_chunk_by_chunk():
+    chunks = [b'[{"id":"u1"}', b',{"id":"u2"}', b"]"]
+    app = asgi_app(*chunks, headers=[(b"content-length", b"25"), (b"vary", b"Cookie")])
+    headers, bodies = call(CompressionMiddleware(app, minimum_size=1000))
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"Cookie, Accept-Encoding"
+    assert b"content-length" not in headers
+    assert [message["more_body"] for message in bodies] == [True, True, False]
+    # Every chunk is flushed, so the client can decode it on arrival
+    decoder = zlib.decompressobj(31)
+    for chunk, message in zip(chunks, bodies):
+        assert decoder.decompress(message["body"]) == chunk
+    assert decoder.eof
+
+
+def test_asgi_sets_vary():
+    headers, _ = call(CompressionMiddleware(asgi_app(b"x" * 2000)))
+    assert headers[b"vary"] == b"Accept-Encoding"
+    # Not compressible: left alone
+    app = asgi_app(b"x" * 2000, content_type=b"image/png")
+    headers, _ = call(CompressionMiddleware(app))
+    assert b"content-encoding" not in headers and b"vary" not in headers
+
+
+def test_brotli_is_preferred_only_when_installed(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+    headers, _ = call(CompressionMiddleware(asgi_app(b"x" * 2000)), accept_encoding=b"br, gzip")
+    assert headers[b"content-encoding"] == b"gzip"
+
+
+def test_brotli_is_chosen_when_installed():
+    brotli = pytest.importorskip("brotli")
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+    headers, bodies = call(
+        CompressionMiddleware(asgi_app(b"x" * 2000)), accept_encoding=b"gzip, br"
+    )
+    assert headers[b"content-encoding"] == b"br"
+    assert brotli.decompress(bodies[0]["body"]) == b"x" * 2000
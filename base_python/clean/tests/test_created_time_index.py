@@ -0,0 +1,94 @@
+"""
+Creation-time index tests: range edges and per-bucket rollups checked
+against a brute-force pass over every order.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from application.ports.order_repository import bucket_by_created_at
+from domain.order import Order
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.thread_safe_order_repository import (
+    ThreadSafeInMemoryOrderRepository,
+)
+
+REPOSITORIES = [InMemoryOrderRepository, ThreadSafeInMemoryOrderRepository]
+
+
+def create(repository, orders):
+    async def create_all():
+        for order in orders:
+            await repository.create(order)
+
+    asyncio.run(create_all())
+
+
+def in_range(orders, since, until):
+    return sorted(
+        (
+            order for order in orders
+            if (since is None or order.created_at >= since)
+            and (until is None or order.created_at < until)
+        ),
+        key=lambda order: (order.created_at, order.id),
+    )
+
+
+@pytest.mark.parametrize("repository_class", REPOSITORIES)
+def test_range_edges(repository_class):
+    repository = repository_class()
+    times = [59.999, 60.0, 60.5, 119.999, 120.0, 3600.0]
+    create(repository, [Order(f"o{i}", "u1", "Pen", i + 1, created_at=t) for i, t in enumerate(times)])
+    # Orders without a creation time are not indexed by it
+    create(repository, [Order("untimed", "u1", "Pen", 1)])
+
+    def created(since=None, until=None, limit=None):
+        orders = asyncio.run(repository.find_by_created_range(since, until, limit))
+        return [order.created_at for order in orders]
+
+    # since is inclusive, until exclusive, on and off minute boundaries
+    assert created(60, 120) == [60.0, 60.5, 119.999]
+    assert created(60.5, 120.0001) == [60.5, 119.999, 120.0]
+    assert created(until=60) == [59.999]
+    assert created(since=120) == [120.0, 3600.0]
+    assert created(120, 120) == []
+    assert created(200, 3000) == []
+    assert created() == times
+    assert created(limit=2) == [59.999, 60.0]
+    assert created(60, limit=4) == [60.0, 60.5, 119.999, 120.0]
+
+    # Updates and deletes leave the buckets they were in
+    asyncio.run(repository.delete("o1"))
+    asyncio.run(repository.update_status(["o2"], "completed"))
+    assert created(60, 120) == [60.5, 119.999]
+    assert asyncio.run(repository.created_timeseries(60, 60, 120)) == [
+        {"start": 60, "count": 2, "quantity": 3 + 4}
+    ]
+
+
+@pytest.mark.parametrize("repository_class", REPOSITORIES)
+def test_timeseries_matches_brute_force(repository_class):
+    rng = random.Random(47)
+    repository = repository_class()
+    orders = [
+        Order(f"o{i:04d}", "u1", "Pen", rng.randint(1, 9), created_at=rng.uniform(0, 7200))
+        for i in range(800)
+    ]
+    # Several orders in the same instant
+    orders += [Order(f"same{i}", "u1", "Pen", 1, created_at=600.0) for i in range(3)]
+    create(repository, orders)
+
+    ranges = [(None, None), (600, None), (None, 600), (600, 660), (30.5, 3599.25)]
+    ranges += [tuple(sorted(rng.uniform(-100, 7300) for _ in range(2))) for _ in range(20)]
+    for since, until in ranges:
+        expected = in_range(orders, since, until)
+        found = asyncio.run(repository.find_by_created_range(since, until))
+        assert [order.id for order in found] == [order.id for order in expected]
+        # 60 and 300 roll up whole minutes; 45 and 90 regroup orders one by one
+        for bucket_seconds in (60, 300, 45, 90):
+            assert asyncio.run(
+                repository.created_timeseries(bucket_seconds, since, until)
+            ) == bucket_by_created_at(expected, bucket_seconds)
@@ -0,0 +1,247 @@
+"""
+DynamoDB adapter tests.
+
+The stubbed tests always run: a botocore Stubber checks the exact requests
+(pagination, GSI queries, projections) and replays canned responses. The
+rest run against a local DynamoDB stand-in:
+
+    docker run -p 8000:8000 amazon/dynamodb-local
+    DYNAMODB_ENDPOINT_URL=http://localhost:8000 pytest clean/tests
+
+and are skipped when DYNAMODB_ENDPOINT_URL is not set.
+"""
+
+import asyncio
+import os
+import uuid
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from domain.order import Order
+from domain.user import User
+from infrastructure.repositories.dynamodb import (
+    ORDERS_USER_ID_INDEX,
+    USERS_EMAIL_INDEX,
+    DynamoDBConnection,
+    create_tables,
+)
+from infrastructure.repositories.dynamodb_order_repository import DynamoDBOrderRepository
+from infrastructure.repositories.dynamodb_user_repository import DynamoDBUserRepository
+
+ENDPOINT_URL = os.environ.get("DYNAMODB_ENDPOINT_URL")
+
+requires_local_dynamodb = pytest.mark.skipif(
+    not ENDPOINT_URL, reason="DYNAMODB_ENDPOINT_URL not set (no local DynamoDB)"
+)
+
+
+def order_item(i, user_id="u1"):
+    return {
+        "id": {"S": f"o{i}"},
+        "user_id": {"S": user_id},
+        "product": {"S": "Pen"},
+        "quantity": {"N": str(i + 1)},
+        "status": {"S": "pending"},
+        "created_at": {"N": repr(1000.0 + i)},
+    }
+
+
+def user_item(i):
+    return {"id": {"S": f"u{i}"}, "name": {"S": f"User {i}"}, "email": {"S": "same@example.com"}}
+
+
+@pytest.fixture
+def stubbed():
+    """Repositories on a stubbed client, checked for unused responses afterwards"""
+    client = boto3.client(
+        "dynamodb",
+        region_name="us-east-1",
+        aws_access_key_id="stub",
+        aws_secret_access_key="stub",
+    )
+    connection = DynamoDBConnection(client=client, max_pool_connections=2)
+    with Stubber(client) as stubber:
+        yield stubber, DynamoDBUserRepository(connection), DynamoDBOrderRepository(connection)
+        stubber.assert_no_pending_responses()
+    connection.close()
+
+
+def test_scan_follows_last_evaluated_key(stubbed):
+    stubber, _, orders = stubbed
+    stubber.add_response(
+        "scan",
+        {"Items": [order_item(0), order_item(1)], "LastEvaluatedKey": {"id": {"S": "o1"}}},
+        {"TableName": "Orders"},
+    )
+    stubber.add_response(
+        "scan",
+        {"Items": [order_item(2)], "LastEvaluatedKey": {"id": {"S": "o2"}}},
+        {"TableName": "Orders", "ExclusiveStartKey": {"id": {"S": "o1"}}},
+    )
+    # A last page with no LastEvaluatedKey ends the scan, even if empty
+    stubber.add_response(
+        "scan", {"Items": []}, {"TableName": "Orders", "ExclusiveStartKey": {"id": {"S": "o2"}}}
+    )
+
+    found = asyncio.run(orders.find_all())
+    assert [order.id for order in found] == ["o0", "o1", "o2"]
+    assert [order.quantity for order in found] == [1, 2, 3]
+    assert all(isinstance(order.created_at, float) for order in found)
+
+
+def test_gsi_queries_page_through_the_index(stubbed):
+    stubber, users, orders = stubbed
+    query = {
+        "TableName": "Orders",
+        "IndexName": ORDERS_USER_ID_INDEX,
+        "KeyConditionExpression": "user_id = :user_id",
+        "ExpressionAttributeValues": {":user_id": {"S": "u7"}},
+    }
+    stubber.add_response(
+        "query",
+        {"Items": [order_item(3, "u7")], "LastEvaluatedKey": {"id": {"S": "o3"}, "user_id": {"S": "u7"}}},
+        query,
+    )
+    stubber.add_response(
+        "query",
+        {"Items": [order_item(5, "u7")]},
+        {**query, "ExclusiveStartKey": {"id": {"S": "o3"}, "user_id": {"S": "u7"}}},
+    )
+    stubber.add_response(
+        "query",
+        {"Items": [user_item(1), user_item(2)]},
+        {
+            "TableName": "Users",
+            "IndexName": USERS_EMAIL_INDEX,
+            "KeyConditionExpression": "email = :email",
+            "ExpressionAttributeValues": {":email": {"S": "same@example.com"}},
+        },
+    )
+
+    assert [order.id for order in asyncio.run(orders.find_by_user_id("u7"))] == ["o3", "o5"]
+    assert [user.id for user in asyncio.run(users.find_by_email("same@example.com"))] == ["u1", "u2"]
+
+
+def test_projections_always_read_the_key(stubbed):
+    stubber, users, orders = stubbed
+    projection = {
+        "ProjectionExpression": "#p0, #p1",
+        "ExpressionAttributeNames": {"#p0": "id", "#p1": "quantity"},
+    }
+    # The order exists: the projected key comes back with the attribute
+    stubber.add_response(
+        "get_item",
+        {"Item": {"id": {"S": "o1"}, "quantity": {"N": "4"}}},
+        {"TableName": "Orders", "Key": {"id": {"S": "o1"}}, **projection},
+    )
+    stubber.add_response(
+        "get_item", {}, {"TableName": "Orders", "Key": {"id": {"S": "o9"}}, **projection}
+    )
+    # Only the key of a user lacking the requested attribute
+    stubber.add_response(
+        "get_item",
+        {"Item": {"id": {"S": "u1"}}},
+        {
+            "TableName": "Users",
+            "Key": {"id": {"S": "u1"}},
+            "ProjectionExpression": "#p0, #p1",
+            "ExpressionAttributeNames": {"#p0": "id", "#p1": "nickname"},
+        },
+    )
+    stubber.add_response(
+        "scan",
+        {"Items": [{"quantity": {"N": "2"}}], "LastEvaluatedKey": {"id": {"S": "o0"}}},
+        {
+            "TableName": "Orders",
+            "ProjectionExpression": "#p0",
+            "ExpressionAttributeNames": {"#p0": "quantity"},
+        },
+    )
+    stubber.add_response(
+        "scan",
+        {"Items": [{"quantity": {"N": "3"}}]},
+        {
+            "TableName": "Orders",
+            "ProjectionExpression": "#p0",
+            "ExpressionAttributeNames": {"#p0": "quantity"},
+            "ExclusiveStartKey": {"id": {"S": "o0"}},
+        },
+    )
+
+    assert asyncio.run(orders.find_by_id_projected("o1", ["quantity"])) == {"quantity": 4}
+    assert asyncio.run(orders.find_by_id_projected("o9", ["quantity"])) is None
+    assert asyncio.run(users.find_by_id_projected("u1", ["nickname"])) == {"nickname": None}
+    assert asyncio.run(orders.find_all_projected(["quantity"])) == [
+        {"quantity": 2},
+        {"quantity": 3},
+    ]
+
+
+@pytest.fixture
+def repositories():
+    """Fresh tables per test, dropped afterwards"""
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url=ENDPOINT_URL,
+        region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID", "local"),
+        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY", "local"),
+    )
+    suffix = uuid.uuid4().hex[:8]
+    users_table, orders_table = f"Users-{suffix}", f"Orders-{suffix}"
+    create_tables(client, users_table, orders_table)
+    connection = DynamoDBConnection(client=client, max_pool_connections=8)
+    yield (
+        DynamoDBUserRepository(connection, users_table),
+        DynamoDBOrderRepository(connection, orders_table),
+    )
+    connection.close()
+    client.delete_table(TableName=users_table)
+    client.delete_table(TableName=orders_table)
+
+
+@requires_local_dynamodb
+def test_user_crud_and_email_index(repositories):
+    users, _ = repositories
+
+    async def scenario():
+        await users.create(User("u1", "Ana", "ana@example.com"))
+        await users.create(User("u2", "Bia", "bia@example.com"))
+
+        assert (await users.find_by_id("u1")).name == "Ana"
+        assert await users.find_by_id("missing") is None
+        assert await users.find_by_id_projected("u2", ["name"]) == {"name": "Bia"}
+        assert [user.id for user in await users.find_by_email("bia@example.com")] == ["u2"]
+
+        await users.delete("u1")
+        with pytest.raises(ValueError):
+            await users.delete("u1")
+        assert [user.id for user in await users.find_all()] == ["u2"]
+
+    asyncio.run(scenario())
+
+
+@requires_local_dynamodb
+def test_order_scan_pagination_and_user_index(repositories):
+    _, orders = repositories
+
+    async def scenario():
+        # Enough items for Scan to return several pages at Limit=10
+        for i in range(25):
+            await orders.create(Order(f"o{i}", f"u{i % 3}", "Pen", i + 1))
+
+        pages = orders._connection.pages("scan", TableName=orders._table_name, Limit=10)
+        assert len([page async for page in pages]) >= 3
+        assert len(await orders.find_all()) == 25
+
+        by_user = await orders.find_by_user_id("u1")
+        assert sorted(order.id for order in by_user) == sorted(f"o{i}" for i in range(1, 25, 3))
+        assert all(isinstance(order.quantity, int) for order in by_user)
+
+        results = await orders.delete_many(["o0", "o0", "missing"])
+        assert results == {"o0": True, "missing": False}
+        assert len(await orders.delete_by_user_id("u2")) == 8
+
+    asyncio.run(scenario())
@@ -0,0 +1,88 @@
+"""
+Deep health check tests: the monitor must see backend outages even
+through the caching decorators.
+"""
+
+import asyncio
+
+from shared.http.health import HealthMonitor, LivenessWSGIMiddleware
+from shared.http.load_shedding import LoadShedder
+from infrastructure.http.flask_app import create_flask_app
+from infrastructure.repositories.caching_order_repository import CachingOrderRepository
+from infrastructure.repositories.caching_user_repository import CachingUserRepository
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+
+
+class Outage:
+    """Makes a repository's find_by_id fail while ``down`` is set"""
+
+    def __init__(self, repository):
+        self.down = False
+        find_by_id = repository.find_by_id
+
+        async def failing_find_by_id(id):
+            if self.down:
+                raise ConnectionError("backend unreachable")
+            return await find_by_id(id)
+
+        repository.find_by_id = failing_find_by_id
+
+
+def test_ping_bypasses_negative_cache():
+    for backend, caching in (
+        (InMemoryUserRepository(), CachingUserRepository),
+        (InMemoryOrderRepository(), CachingOrderRepository),
+    ):
+        outage = Outage(backend)
+        repository = caching(backend)
+        monitor = HealthMonitor()
+        monitor.add("repository", repository.ping)
+
+        async def scenario():
+            await monitor.check_now()
+            assert monitor.snapshot()["status"] == "healthy"
+
+            # The probe id is now a cached miss, which used to keep
+            # answering after the backend went away
+            assert await repository.find_by_id("__health__") is None
+            outage.down = True
+            assert await repository.find_by_id("__health__") is None
+            await monitor.check_now()
+            report = monitor.snapshot()
+            assert report["status"] == "unhealthy"
+            assert report["checks"]["repository"]["error"] == "backend unreachable"
+
+        asyncio.run(scenario())
+
+
+def test_liveness_is_answered_before_the_app():
+    def app(environ, start_response):
+        start_response("204 No Content", [])
+        return [b""]
+
+    middleware = LivenessWSGIMiddleware(app)
+    responses = []
+
+    def start_response(status, headers):
+        responses.append((status, dict(headers)))
+
+    body = middleware({"PATH_INFO": "/live"}, start_response)
+    assert b"".join(body) == b'{"status":"alive"}'
+    assert responses[-1] == (
+        "200 OK",
+        {"Content-Type": "application/json", "Content-Length": "18", "Cache-Control": "no-store"},
+    )
+    middleware({"PATH_INFO": "/users"}, start_response)
+    assert responses[-1] == ("204 No Content", {})
+
+
+def test_flask_liveness_skips_the_hooks():
+    shedder = LoadShedder()
+    app = create_flask_app(load_shedder=shedder)
+    response = app.test_client().get("/live")
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "alive"}
+    # Answered before Flask: no limiter, and no background tasks started
+    assert shedder.stats() == {}
+    assert not app.extensions["background_tasks"].running
@@ -0,0 +1,120 @@
+"""
+Time-ordered ID generator tests: ordering under a stalled or rewound clock,
+the encoded layouts, and the batch create routes that use ``new_ids``.
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.ids.time_ordered import (
+    CROCKFORD_BASE32,
+    TimeOrderedIdGenerator,
+    ULIDIdGenerator,
+    UUID7IdGenerator,
+)
+
+GENERATORS = [UUID7IdGenerator, ULIDIdGenerator]
+
+
+class SteppedClock:
+    """Nanosecond clock that returns whatever ``now_ms`` is set to"""
+
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+
+    def __call__(self):
+        return self.now_ms * 1_000_000
+
+
+def timestamp_ms(generator_class, id):
+    if generator_class is UUID7IdGenerator:
+        return uuid.UUID(id).int >> 80
+    value = 0
+    for char in id:
+        value = value * 32 + CROCKFORD_BASE32.index(char)
+    return value >> 80
+
+
+def test_base_class_requires_a_format():
+    with pytest.raises(TypeError):
+        TimeOrderedIdGenerator()
+
+
+@pytest.mark.parametrize("generator_class", GENERATORS)
+def test_ids_increase_within_one_millisecond(generator_class):
+    clock = SteppedClock(1_700_000_000_000)
+    generator = generator_class(clock)
+    ids = [generator.new_id() for _ in range(500)] + generator.new_ids(500)
+    ids += [generator.new_id() for _ in range(10)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert {timestamp_ms(generator_class, id) for id in ids} == {clock.now_ms}
+
+
+@pytest.mark.parametrize("generator_class", GENERATORS)
+def test_ids_keep_increasing_when_the_clock_steps_back(generator_class):
+    clock = SteppedClock(1_700_000_000_000)
+    generator = generator_class(clock)
+    before = generator.new_ids(3)
+    clock.now_ms -= 5_000
+    after = [generator.new_id() for _ in range(3)] + generator.new_ids(3)
+
+    ids = before + after
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    # Issued as if the clock had stalled at its latest reading
+    assert timestamp_ms(generator_class, after[-1]) == clock.now_ms + 5_000
+
+    clock.now_ms += 10_000
+    later = generator.new_id()
+    assert later > ids[-1]
+    assert timestamp_ms(generator_class, later) == clock.now_ms
+
+
+def test_uuid7_layout():
+    id = UUID7IdGenerator(SteppedClock(1_700_000_000_000)).new_id()
+    parsed = uuid.UUID(id)
+    assert parsed.version == 7 and parsed.variant == uuid.RFC_4122
+    assert str(parsed) == id
+
+
+def test_ulid_layout():
+    id = ULIDIdGenerator(SteppedClock(1_700_000_000_000)).new_id()
+    assert len(id) == 26 and set(id) <= set(CROCKFORD_BASE32)
+    # 26 characters hold 130 bits; the top two are always clear
+    assert id[0] in "01234567"
+
+
+def test_batch_create_routes_issue_ordered_ids():
+    client = TestClient(create_fastapi_app(id_generator=ULIDIdGenerator()))
+
+    response = client.post(
+        "/api/users/batch",
+        json=[{"name": f"User {i}", "email": f"user{i}@example.com"} for i in range(20)],
+    )
+    assert response.status_code == 201
+    ids = [user["id"] for user in response.json()]
+    assert ids == sorted(ids) and len(set(ids)) == 20
+
+    response = client.post(
+        "/api/orders/batch",
+        json=[{"user_id": ids[0], "product": "Pen", "quantity": i + 1} for i in range(5)],
+    )
+    assert response.status_code == 201
+    order_ids = [order["id"] for order in response.json()]
+    assert order_ids == sorted(order_ids)
+
+    # One invalid entity rejects the whole batch before anything is stored
+    response = client.post(
+        "/api/orders/batch",
+        json=[
+            {"user_id": ids[0], "product": "Pen", "quantity": 1},
+            {"user_id": ids[0], "product": "  ", "quantity": 1},
+        ],
+    )
+    assert response.status_code == 400
+    assert len(client.get("/api/orders").json()) == 5
+    assert client.post("/api/orders/batch", json=[]).status_code == 400
@@ -0,0 +1,157 @@
+"""
+Load shedding tests: the bounded FIFO wait queue, the adaptive limits and
+the 503 answers of the ASGI middleware and the Flask hooks.
+"""
+
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared.http.load_shedding import (
+    AIMDLimit,
+    ConcurrencyLimiter,
+    GradientLimit,
+    LoadShedder,
+    LoadSheddingMiddleware,
+)
+from infrastructure.http.flask_app import create_flask_app
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def test_full_queue_is_rejected_immediately():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=0, queue_timeout=5)
+    assert limiter.acquire()
+
+    started = time.perf_counter()
+    assert not limiter.acquire()
+    assert time.perf_counter() - started < 1
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_timed_out_waiter_gets_no_slot():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=0.02)
+    assert limiter.acquire()
+
+    assert not limiter.acquire()
+    stats = limiter.stats()
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 1 and stats["queued"] == 0
+
+    limiter.release(0.001)
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_release_hands_the_slot_to_the_oldest_waiter():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=3, queue_timeout=5)
+    assert limiter.acquire()
+    granted = []
+
+    def wait(name):
+        assert limiter.acquire()
+        granted.append(name)
+
+    threads = []
+    for name in ("first", "second", "third"):
+        thread = threading.Thread(target=wait, args=(name,))
+        thread.start()
+        threads.append(thread)
+        # Queue them in a known order
+        wait_until(lambda: limiter.stats()["queued"] == len(threads))
+
+    for count in (1, 2, 3):
+        limiter.release(0.001)
+        wait_until(lambda: len(granted) == count)
+    for thread in threads:
+        thread.join()
+    assert granted == ["first", "second", "third"]
+
+
+def test_aimd_limit_direction():
+    aimd = AIMDLimit(latency_threshold=0.1, backoff_ratio=0.5)
+    limit = 4
+    for _ in range(3):
+        assert aimd.update(limit, 0.01, True) == limit
+    assert aimd.update(limit, 0.01, True) == limit + 1
+    assert aimd.update(limit, 0.5, True) == limit * 0.5
+    assert aimd.update(limit, 0.01, False) == limit * 0.5
+
+
+def test_gradient_limit_direction():
+    assert GradientLimit().update(10, 0.01, True) > 10
+    gradient = GradientLimit()
+    gradient.update(10, 0.01, True)
+    # Latency ten times the best seen backs the limit off
+    assert gradient.update(10, 0.1, True) < 10
+    assert GradientLimit().update(10, 0.01, False) < 10
+
+
+def run(limiter, requests, latency, ok):
+    for _ in range(requests):
+        assert limiter.acquire()
+        limiter.release(latency, ok)
+
+
+def test_adaptive_limits_stay_within_bounds():
+    for adaptive in ("aimd", "gradient"):
+        limiter = ConcurrencyLimiter(limit=4, adaptive=adaptive, min_limit=2, max_limit=6)
+        run(limiter, 200, 0.001, True)
+        assert limiter.limit == 6
+        run(limiter, 200, 0.001, False)
+        assert limiter.limit == 2
+
+
+def asgi_app(shedder):
+    app = FastAPI()
+    app.add_middleware(LoadSheddingMiddleware, shedder=shedder)
+
+    @app.get("/work")
+    async def work():
+        return {"ok": True}
+
+    @app.get("/ready")
+    async def ready():
+        return {"ready": True}
+
+    return TestClient(app)
+
+
+def test_asgi_sheds_with_retry_after():
+    shedder = LoadShedder(limit=1, max_queue=0, retry_after=7)
+    client = asgi_app(shedder)
+    busy = shedder.limiter_for("GET", "/work")
+    assert busy.acquire()
+
+    response = client.get("/work")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+
+    busy.release(0.001)
+    assert client.get("/work").status_code == 200
+    # Exempt routes are never limited
+    assert client.get("/ready").status_code == 200
+    assert "GET /ready" not in shedder.stats()
+
+
+def test_flask_sheds_with_retry_after():
+    shedder = LoadShedder(limit=1, max_queue=0, retry_after=7)
+    client = create_flask_app(load_shedder=shedder).test_client()
+    busy = shedder.limiter_for("GET", "/version")
+    assert busy.acquire()
+
+    response = client.get("/version")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+
+    busy.release(0.001)
+    assert client.get("/version").status_code == 200
+    client.get("/ready")
+    client.get("/changes")
+    assert set(shedder.stats()) == {"GET /version"}
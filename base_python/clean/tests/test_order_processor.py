@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from application.use_cases.create_order import CreateOrderUseCase
+from domain.order import Order
+from infrastructure.processing.order_processor import OrderProcessor
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+
+
+async def stored_orders(repository, count):
+    orders = [Order(f"o{i:02}", "u1", "Pen", 1) for i in range(count)]
+    for order in orders:
+        await repository.create(order)
+    return orders
+
+
+async def statuses(repository):
+    return {order.id: order.status for order in await repository.find_all()}
+
+
+def test_processed_orders_are_completed_in_batches():
+    async def scenario():
+        repository = InMemoryOrderRepository()
+        processor = OrderProcessor(repository, workers=3, batch_size=5, batch_interval=10)
+        processor.start()
+        for order in await stored_orders(repository, 12):
+            await processor.submit(order)
+        # Two full batches are flushed without waiting for the interval
+        for _ in range(100):
+            if processor.completed >= 10:
+                break
+            await asyncio.sleep(0.01)
+        assert processor.completed >= 10
+        await processor.stop()
+
+        assert set((await statuses(repository)).values()) == {"completed"}
+        stats = processor.stats()
+        assert (stats["submitted"], stats["processed"], stats["completed"]) == (12, 12, 12)
+        assert 2 <= stats["batches"] < 12
+        assert not stats["running"]
+
+    asyncio.run(scenario())
+
+
+def test_submit_waits_while_the_queue_is_full():
+    async def scenario():
+        repository = InMemoryOrderRepository()
+        release = asyncio.Event()
+
+        async def step(order):
+            await release.wait()
+
+        processor = OrderProcessor(repository, step=step, workers=1, queue_size=2)
+        processor.start()
+        orders = await stored_orders(repository, 4)
+        # One order held by the worker, two queued
+        for order in orders[:3]:
+            await processor.submit(order)
+        await asyncio.sleep(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(processor.submit(orders[3]), 0.05)
+
+        release.set()
+        await processor.submit(orders[3])
+        await processor.stop()
+        assert set((await statuses(repository)).values()) == {"completed"}
+
+    asyncio.run(scenario())
+
+
+def test_stop_drains_queued_orders_until_the_timeout():
+    async def scenario():
+        repository = InMemoryOrderRepository()
+
+        async def step(order):
+            if order.id == "o02":
+                await asyncio.sleep(60)
+
+        processor = OrderProcessor(repository, step=step, workers=1, step_timeout=None)
+        processor.start()
+        for order in await stored_orders(repository, 4):
+            await processor.submit(order)
+        await processor.stop(drain_timeout=0.1)
+
+        # Orders ahead of the stuck one are completed by the final flush;
+        # the stuck one and those behind it stay pending
+        assert await statuses(repository) == {
+            "o00": "completed",
+            "o01": "completed",
+            "o02": "pending",
+            "o03": "pending",
+        }
+        with pytest.raises(RuntimeError):
+            await processor.submit(Order("o04", "u1", "Pen", 1))
+
+    asyncio.run(scenario())
+
+
+def test_orders_created_while_processing_is_stopped_stay_pending():
+    async def scenario():
+        repository = InMemoryOrderRepository()
+        processor = OrderProcessor(repository)
+        use_case = CreateOrderUseCase(repository, order_queue=processor)
+
+        order = await use_case.execute({"user_id": "u1", "product": "Pen", "quantity": 1})
+        assert (await repository.find_by_id(order.id)).status == "pending"
+        assert processor.stats()["submitted"] == 0
+
+    asyncio.run(scenario())
+
+
+class FlakyOrderRepository(InMemoryOrderRepository):
+    """update_status fails for the first ``failures`` calls"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    async def update_status(self, ids, status):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("backend unreachable")
+        return await super().update_status(ids, status)
+
+
+def test_failed_completions_are_retried():
+    async def scenario():
+        repository = FlakyOrderRepository(failures=2)
+        processor = OrderProcessor(
+            repository, batch_size=5, batch_interval=0.001, flush_retries=3, retry_delay=0.001
+        )
+        processor.start()
+        for order in await stored_orders(repository, 5):
+            await processor.submit(order)
+        for _ in range(200):
+            if processor.completed == 5:
+                break
+            await asyncio.sleep(0.01)
+        await processor.stop()
+
+        assert set((await statuses(repository)).values()) == {"completed"}
+        stats = processor.stats()
+        assert (stats["completed"], stats["failed"], stats["given_up"]) == (5, 0, 0)
+        assert repository.calls == 3
+
+    asyncio.run(scenario())
+
+
+def test_completions_are_given_up_after_the_retries():
+    async def scenario():
+        repository = FlakyOrderRepository(failures=10**9)
+        processor = OrderProcessor(
+            repository, batch_size=5, batch_interval=0.001, flush_retries=2, retry_delay=0.001
+        )
+        processor.start()
+        for order in await stored_orders(repository, 3):
+            await processor.submit(order)
+        await processor.stop()
+
+        # One call and two retries, then the orders are left pending
+        assert repository.calls == 3
+        assert set((await statuses(repository)).values()) == {"pending"}
+        stats = processor.stats()
+        assert (stats["completed"], stats["failed"], stats["given_up"]) == (0, 3, 3)
+        assert stats["pending_batch"] == 0
+
+    asyncio.run(scenario())
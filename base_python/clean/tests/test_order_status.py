@@ -0,0 +1,141 @@
+"""
+Order status index and bulk status transition tests.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from application.ports.order_repository import OrderRepository
+from domain.order import Order
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.repositories.change_log import ChangeLog
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.thread_safe_order_repository import (
+    ThreadSafeInMemoryOrderRepository,
+)
+
+REPOSITORIES = [InMemoryOrderRepository, ThreadSafeInMemoryOrderRepository]
+
+
+def seed(repository, count):
+    async def create_all():
+        for i in range(count):
+            await repository.create(Order(f"o{i:02d}", "u1", "Pen", i + 1))
+
+    asyncio.run(create_all())
+
+
+@pytest.mark.parametrize("repository_class", REPOSITORIES)
+def test_find_by_status_pages_in_id_order(repository_class):
+    repository = repository_class()
+    seed(repository, 7)
+
+    async def scenario():
+        await repository.update_status(["o01", "o04"], "completed")
+
+        pending, cursor = [], None
+        while True:
+            page, cursor = await repository.find_by_status("pending", cursor, limit=2)
+            assert len(page) <= 2
+            pending.extend(order.id for order in page)
+            if cursor is None:
+                break
+        assert pending == ["o00", "o02", "o03", "o05", "o06"]
+
+        page, cursor = await repository.find_by_status("completed", limit=2)
+        assert [order.id for order in page] == ["o01", "o04"]
+        # An exactly full last page has no next cursor
+        assert cursor is None
+        assert all(order.status == "completed" for order in page)
+
+        page, cursor = await repository.find_by_status("completed", cursor="o04")
+        assert (page, cursor) == ([], None)
+        assert await repository.count_by_status() == {"pending": 5, "completed": 2}
+
+        await repository.delete("o04")
+        assert await repository.count_by_status() == {"pending": 5, "completed": 1}
+
+    asyncio.run(scenario())
+
+
+class ScanningOrderRepository(InMemoryOrderRepository):
+    """Status queries through the port's scanning defaults, point reads refused"""
+
+    find_by_status = OrderRepository.find_by_status
+    count_by_status = OrderRepository.count_by_status
+
+    async def find_by_id(self, id):
+        raise AssertionError("the scanning default must not re-read orders one by one")
+
+
+def test_scanning_default_pages_from_the_scan():
+    repository = ScanningOrderRepository()
+    seed(repository, 5)
+
+    async def scenario():
+        await repository.update_status(["o03"], "completed")
+        page, cursor = await repository.find_by_status("pending", limit=3)
+        assert [order.id for order in page] == ["o00", "o01", "o02"] and cursor == "o02"
+        page, cursor = await repository.find_by_status("pending", cursor)
+        assert [order.id for order in page] == ["o04"] and cursor is None
+        assert await repository.count_by_status() == {"pending": 4, "completed": 1}
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("repository_class", REPOSITORIES)
+def test_update_status_outcomes_and_change_feed(repository_class):
+    change_log = ChangeLog()
+    repository = repository_class(change_log=change_log)
+    seed(repository, 2)
+
+    async def scenario():
+        results = await repository.update_status(["o00", "o00", "missing"], "completed")
+        assert results == {"o00": "updated", "missing": "not_found"}
+        assert await repository.update_status(["o00"], "completed") == {"o00": "unchanged"}
+        assert await repository.update_status(["o00"], "pending") == {
+            "o00": "invalid_transition"
+        }
+
+    asyncio.run(scenario())
+    changes = change_log.since(0)["changes"]
+    assert [(change["operation"], change["id"]) for change in changes] == [
+        ("create", "o00"),
+        ("create", "o01"),
+        ("update", "o00"),
+    ]
+    assert changes[-1]["data"]["status"] == "completed"
+
+
+def test_bulk_status_patch_reports_each_outcome():
+    repository = InMemoryOrderRepository()
+    seed(repository, 3)
+    asyncio.run(repository.update_status(["o02"], "completed"))
+    client = TestClient(create_fastapi_app(custom_order_repository=repository))
+
+    response = client.patch(
+        "/api/orders/status", json={"ids": ["o00", "o02", "missing"], "status": "completed"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["results"] == {
+        "o00": {"result": "updated"},
+        "o02": {"result": "unchanged"},
+        "missing": {"result": "not_found"},
+    }
+    assert (body["updated"], body["unchanged"], body["not_found"]) == (1, 1, 1)
+    assert body["invalid_transition"] == 0
+
+    response = client.patch("/api/orders/status", json={"ids": ["o00", "o01"], "status": "pending"})
+    body = response.json()
+    assert body["invalid_transition"] == 1
+    assert body["results"]["o01"] == {"result": "unchanged"}
+
+    assert client.get("/api/orders/status").json() == {"pending": 1, "completed": 2}
+    response = client.get("/api/orders", params={"status": "completed", "limit": 1})
+    assert [order["id"] for order in response.json()] == ["o00"]
+    assert response.headers["X-Next-Cursor"] == "o00"
+    assert client.get("/api/orders", params={"status": "done"}).status_code == 400
+    assert client.patch("/api/orders/status", json={"ids": [], "status": "completed"}).status_code == 400
@@ -0,0 +1,64 @@
+import asyncio
+import random
+
+from application.ports.order_repository import (
+    OrderRepository,
+    product_match_score,
+    tokenize_product,
+)
+from domain.order import Order
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+
+
+def search(repository, query, limit=20):
+    return [order.id for order in asyncio.run(repository.search_by_product(query, limit))]
+
+
+def repository_with(*products):
+    repository = InMemoryOrderRepository()
+    for i, product in enumerate(products):
+        asyncio.run(repository.create(Order(f"o{i}", "u1", product, 1)))
+    return repository
+
+
+def test_every_term_must_match_and_exact_words_rank_first():
+    repository = repository_with("Red Pen", "Red Pencil", "Blue Pen", "Pen")
+
+    # Exact "pen" beats the "pencil" prefix match; shorter products first on ties
+    assert search(repository, "pen") == ["o3", "o0", "o2", "o1"]
+    assert search(repository, "RED pen") == ["o0", "o1"]
+    assert search(repository, "red pe", limit=1) == ["o0"]
+    assert search(repository, "green pen") == []
+    assert search(repository, " ,; ") == []
+
+
+def test_index_follows_overwrites_and_deletes():
+    repository = repository_with("Red Pen", "Blue Pen")
+
+    asyncio.run(repository.create(Order("o0", "u1", "Green Mug", 1)))
+    assert search(repository, "red") == []
+    assert search(repository, "mug") == ["o0"]
+
+    asyncio.run(repository.delete("o0"))
+    assert search(repository, "green") == []
+    # Terms without postings leave the sorted term list too
+    assert "green" not in repository._product_terms
+    assert search(repository, "pen") == ["o1"]
+
+
+def test_index_matches_the_scanning_default():
+    words = ["pen", "pencil", "paper", "pad", "red", "blue", "ink", "inkjet"]
+    generator = random.Random(31)
+    repository = repository_with(
+        *(" ".join(generator.choices(words, k=generator.randint(1, 3))) for _ in range(200))
+    )
+
+    for query in ["pen", "p", "pen red", "in", "inkjet blue", "pa pe", "x"]:
+        terms = list(dict.fromkeys(tokenize_product(query)))
+        indexed = asyncio.run(repository.search_by_product(query, 300))
+        scanned = asyncio.run(OrderRepository.search_by_product(repository, query, 300))
+        assert {order.id for order in indexed} == {order.id for order in scanned}
+        # Same ranking, up to the order of exact ties
+        assert [
+            (product_match_score(terms, order.product), len(order.product)) for order in indexed
+        ] == [(product_match_score(terms, order.product), len(order.product)) for order in scanned]
@@ -0,0 +1,137 @@
+"""
+Request profiling tests: one cProfile session at a time, and sampled
+stacks limited to the thread serving the request.
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared.http.profiling import (
+    ProfilerBusyError,
+    ProfilingMiddleware,
+    RequestProfiler,
+    StackSampler,
+)
+from infrastructure.http.flask_app import create_flask_app
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def spin_elsewhere(stop):
+    while not stop.is_set():
+        pass
+
+
+def sampled(sampler, work):
+    """Stacks the sampler saw while another thread kept busy"""
+    stop = threading.Event()
+    other = threading.Thread(target=spin_elsewhere, args=(stop,))
+    other.start()
+    sampler.start()
+    try:
+        work()
+    finally:
+        stacks = sampler.stop()
+        stop.set()
+        other.join()
+    return stacks
+
+
+def test_sampler_keeps_only_the_request_thread():
+    sampler = StackSampler(0.001, threads=[threading.get_ident()])
+    stacks = sampled(sampler, lambda: spin(0.05))
+
+    assert any("spin" in stack for stack in stacks)
+    assert not any("spin_elsewhere" in stack for stack in stacks)
+
+
+def test_sampler_follows_a_handler_on_a_worker_thread():
+    def handler():
+        spin(0.05)
+
+    sampler = StackSampler(0.001, code=handler.__code__)
+
+    def work():
+        worker = threading.Thread(target=handler)
+        worker.start()
+        worker.join()
+
+    stacks = sampled(sampler, work)
+    assert stacks and all("handler" in stack for stack in stacks)
+    assert not any("spin_elsewhere" in stack for stack in stacks)
+
+
+def test_one_cprofile_session_at_a_time():
+    profiler = RequestProfiler(admin_token="secret")
+    session = profiler.start("cprofile")
+    with pytest.raises(ProfilerBusyError):
+        profiler.start("cprofile")
+    # Sampling sessions do not take the cProfile slot
+    profiler.finish(profiler.start("sample"), "GET", "/", store=False)
+    profiler.finish(session, "GET", "/", store=True)
+
+    profiler.finish(profiler.start("cprofile"), "GET", "/", store=True)
+    assert len(profiler.list()) == 2
+
+
+def asgi_client(profiler):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    @app.get("/async")
+    async def async_route():
+        return {"ok": True}
+
+    @app.get("/sync")
+    def sync_route():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_asgi_cprofile_rules():
+    profiler = RequestProfiler(admin_token="secret")
+    client = asgi_client(profiler)
+    headers = {**ADMIN, "X-Profile": "cprofile"}
+
+    response = client.get("/async", headers=headers)
+    assert response.status_code == 200
+    assert profiler.get(response.headers["X-Profile-Id"])["mode"] == "cprofile"
+
+    # cProfile would only see the event loop, not the worker thread
+    assert client.get("/sync", headers=headers).status_code == 400
+    response = client.get("/sync", headers={**ADMIN, "X-Profile": "sample"})
+    assert response.status_code == 200 and "X-Profile-Id" in response.headers
+
+    session = profiler.start("cprofile")
+    try:
+        assert client.get("/async", headers=headers).status_code == 409
+    finally:
+        profiler.finish(session, "GET", "/", store=False)
+    assert client.get("/async", headers=headers).status_code == 200
+
+
+def test_flask_cprofile_busy_gets_409():
+    profiler = RequestProfiler(admin_token="secret")
+    client = create_flask_app(profiler=profiler).test_client()
+    headers = {**ADMIN, "X-Profile": "cprofile"}
+
+    response = client.get("/users", headers=headers)
+    assert response.status_code == 200
+    assert profiler.get(response.headers["X-Profile-Id"]) is not None
+
+    session = profiler.start("cprofile")
+    try:
+        assert client.get("/users", headers=headers).status_code == 409
+    finally:
+        profiler.finish(session, "GET", "/", store=False)
@@ -0,0 +1,61 @@
+import asyncio
+import random
+from functools import partial
+
+import pytest
+
+from application.ports.order_repository import OrderRepository
+from domain.order import Order
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+
+
+def pages(method, **query):
+    """Every page of a quantity range query, as lists of (quantity, id)"""
+
+    async def collect():
+        result, cursor = [], None
+        while True:
+            page, cursor = await method(cursor=cursor, **query)
+            result.append([(order.quantity, order.id) for order in page])
+            if cursor is None:
+                return result
+
+    return asyncio.run(collect())
+
+
+@pytest.fixture
+def repository():
+    generator = random.Random(32)
+    repository = InMemoryOrderRepository()
+    for i in range(120):
+        asyncio.run(repository.create(Order(f"o{i:03}", "u1", "Pen", generator.randint(1, 10))))
+    return repository
+
+
+@pytest.mark.parametrize("limit", [1, 9, 50, 200])
+@pytest.mark.parametrize("bounds", [(None, None), (3, 7), (5, 5), (11, None), (None, 0)])
+@pytest.mark.parametrize("descending", [False, True])
+def test_index_pages_match_the_scanning_default(repository, limit, bounds, descending):
+    query = dict(min_quantity=bounds[0], max_quantity=bounds[1], limit=limit, descending=descending)
+    scanned = partial(OrderRepository.find_by_quantity_range, repository)
+
+    indexed = pages(repository.find_by_quantity_range, **query)
+    assert indexed == pages(scanned, **query)
+    entries = [entry for page in indexed for entry in page]
+    assert entries == sorted(entries, reverse=descending)
+
+
+def test_index_follows_overwrites_and_deletes():
+    repository = InMemoryOrderRepository()
+    for i, quantity in enumerate([5, 1, 9]):
+        asyncio.run(repository.create(Order(f"o{i}", "u1", "Pen", quantity)))
+
+    asyncio.run(repository.create(Order("o2", "u1", "Pen", 2)))
+    asyncio.run(repository.delete("o0"))
+    assert repository._quantity_index == [(1, "o1"), (2, "o2")]
+    assert [order.id for order in asyncio.run(repository.top_n_by_quantity(1))] == ["o2"]
+
+
+def test_invalid_cursor_is_rejected(repository):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        asyncio.run(repository.find_by_quantity_range(cursor="not-a-cursor"))
@@ -0,0 +1,111 @@
+import json
+import re
+
+import pytest
+from pydantic import Field, TypeAdapter
+from typing_extensions import Annotated
+
+from domain.order import Order
+from domain.text import WHITESPACE
+from domain.user import User
+from infrastructure.http.schemas import (
+    MAX_BATCH_SIZE,
+    create_order_schema,
+    create_orders_schema,
+    create_user_schema,
+    decode_request,
+    update_order_status_schema,
+)
+
+# Padding the domain strips but a plain length check would count,
+# including whitespace outside ASCII
+STRINGS = ["", "a", "ab", " a ", "  a", "a\n", "\u00a0a\u00a0", "\x1ca\x1c", "a b", " ab ", "a\u2003b"]
+
+
+def domain_accepts(build):
+    try:
+        build()
+    except ValueError:
+        return False
+    return True
+
+
+def schema_accepts(schema, body):
+    try:
+        decode_request(schema, json.dumps(body).encode())
+    except ValueError:
+        return False
+    return True
+
+
+def test_whitespace_class_is_str_isspace_in_both_regex_engines():
+    # Every whitespace character is below U+3001
+    characters = [chr(code) for code in range(0x3001)]
+    expected = [character for character in characters if character.isspace()]
+    pattern = f"^[{WHITESPACE}]$"
+    rust = TypeAdapter(Annotated[str, Field(pattern=pattern)])
+
+    def rust_accepts(character):
+        try:
+            rust.validate_python(character)
+        except ValueError:
+            return False
+        return True
+
+    assert [character for character in characters if re.fullmatch(pattern, character)] == expected
+    assert [character for character in characters if rust_accepts(character)] == expected
+
+
+@pytest.mark.parametrize("text", STRINGS)
+def test_schemas_and_domain_agree_on_names_and_products(text):
+    assert schema_accepts(create_user_schema, {"name": text, "email": "a@b.co"}) == domain_accepts(
+        lambda: User("u1", text, "a@b.co")
+    )
+    assert schema_accepts(
+        create_order_schema, {"user_id": "u1", "product": text, "quantity": 1}
+    ) == domain_accepts(lambda: Order("o1", "u1", text, 1))
+
+
+@pytest.mark.parametrize("email", ["a@b.co", "a@b.co\n", "a b@c.de", "a@b", "@b.co"])
+def test_schemas_and_domain_agree_on_emails(email):
+    assert schema_accepts(create_user_schema, {"name": "Ana", "email": email}) == domain_accepts(
+        lambda: User("u1", "Ana", email)
+    )
+
+
+def test_decoding_is_strict_and_ignores_unknown_keys():
+    body = b'{"user_id": "u1", "product": "Pen", "quantity": 2, "extra": true}'
+    assert decode_request(create_order_schema, body) == {
+        "user_id": "u1",
+        "product": "Pen",
+        "quantity": 2,
+    }
+
+    with pytest.raises(ValueError, match="quantity"):
+        decode_request(create_order_schema, b'{"user_id": "u1", "product": "Pen", "quantity": "2"}')
+    with pytest.raises(ValueError, match="status"):
+        decode_request(
+            create_order_schema,
+            b'{"user_id": "u1", "product": "Pen", "quantity": 2, "status": "lost"}',
+        )
+    with pytest.raises(ValueError, match="Request body is required"):
+        decode_request(create_user_schema, b"")
+    with pytest.raises(ValueError):
+        decode_request(create_user_schema, b"{not json")
+
+
+def test_pattern_errors_do_not_echo_the_pattern():
+    with pytest.raises(ValueError) as error:
+        decode_request(create_user_schema, b'{"name": "Ana", "email": "nope"}')
+    assert str(error.value) == "email: Invalid format"
+
+
+def test_batches_are_bounded():
+    order = {"user_id": "u1", "product": "Pen", "quantity": 1}
+    assert len(decode_request(create_orders_schema, json.dumps([order] * MAX_BATCH_SIZE).encode())) == MAX_BATCH_SIZE
+
+    for batch in ([], [order] * (MAX_BATCH_SIZE + 1)):
+        with pytest.raises(ValueError):
+            decode_request(create_orders_schema, json.dumps(batch).encode())
+    with pytest.raises(ValueError):
+        decode_request(update_order_status_schema, b'{"ids": [], "status": "completed"}')
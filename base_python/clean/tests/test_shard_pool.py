@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.order import Order
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.shard_pool import ShardPool, partitioned_repositories
+
+
+@pytest.fixture(scope="module")
+def repositories():
+    """A 3-shard partitioned order repository and a single-process one, same data"""
+    pool = ShardPool(3)
+    _, partitioned = partitioned_repositories(pool)
+    single = InMemoryOrderRepository()
+
+    async def fill():
+        for i in range(60):
+            order = Order(f"o{i:02}", f"u{i % 4}", "Pen", i % 7 + 1, ("pending", "completed")[i % 3 == 0])
+            await partitioned.create(order)
+            await single.create(order)
+
+    asyncio.run(fill())
+    yield partitioned, single
+    pool.close()
+
+
+def pages(method, *args, **kwargs):
+    """Every page of a cursor query, as lists of ids"""
+
+    async def collect():
+        result, cursor = [], None
+        while True:
+            page, cursor = await method(*args, cursor=cursor, **kwargs)
+            result.append([order.id for order in page])
+            if cursor is None:
+                return result
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("limit", [1, 7, 20, 60, 100])
+def test_merged_pages_match_a_single_process(repositories, limit):
+    partitioned, single = repositories
+
+    assert pages(partitioned.find_page, limit=limit) == pages(single.find_page, limit=limit)
+    for status in ("pending", "completed"):
+        assert pages(partitioned.find_by_status, status, limit=limit) == pages(
+            single.find_by_status, status, limit=limit
+        )
+    for descending in (False, True):
+        query = dict(min_quantity=2, max_quantity=6, limit=limit, descending=descending)
+        assert pages(partitioned.find_by_quantity_range, **query) == pages(
+            single.find_by_quantity_range, **query
+        )
+
+
+def test_merged_counts_match_a_single_process(repositories):
+    partitioned, single = repositories
+
+    assert asyncio.run(partitioned.count_by_status()) == asyncio.run(single.count_by_status())
+
+
+def test_lifespan_exit_closes_the_pool(monkeypatch):
+    closed = []
+    close = ShardPool.close
+    monkeypatch.setattr(ShardPool, "close", lambda pool: closed.append(close(pool)))
+    monkeypatch.setenv("REPOSITORY_BACKEND", "partitioned")
+    monkeypatch.setenv("REPOSITORY_SHARDS", "1")
+
+    with TestClient(create_fastapi_app()) as client:
+        assert client.post(
+            "/api/orders", json={"user_id": "u1", "product": "Pen", "quantity": 1}
+        ).status_code == 201
+        assert not closed
+    assert len(closed) == 1
@@ -0,0 +1,151 @@
+"""
+SnapshotStore tests: equivalence with a dict under random writes, and
+snapshot isolation while writes land during iteration.
+"""
+
+import asyncio
+import random
+import sys
+import threading
+
+import pytest
+
+from domain.user import User
+from infrastructure.repositories import snapshot_store
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from infrastructure.repositories.snapshot_store import SnapshotStore
+
+
+@pytest.fixture(params=[4, snapshot_store.NODE_SIZE])
+def node_size(request, monkeypatch):
+    # Small nodes make splits and multi-level trees common
+    monkeypatch.setattr(snapshot_store, "NODE_SIZE", request.param)
+    return request.param
+
+
+def walk_pages(snapshot, limit):
+    values, cursor = [], None
+    while True:
+        page, cursor = snapshot.page(cursor, limit)
+        values.extend(page)
+        if cursor is None:
+            return values
+
+
+def test_matches_a_dict_under_random_writes(node_size):
+    rng = random.Random(node_size)
+    store, expected = SnapshotStore(), {}
+    snapshots = []
+    for step in range(6000):
+        key = f"k{rng.randrange(800):04d}"
+        if key in expected and rng.random() < 0.4:
+            del store[key]
+            del expected[key]
+        else:
+            store[key] = expected[key] = rng.random()
+        if step % 499 == 0:
+            snapshots.append((store.snapshot(), dict(expected)))
+
+        assert len(store) == len(expected)
+        assert store.get(key) == expected.get(key)
+        assert (key in store) == (key in expected)
+
+    for snapshot, contents in snapshots + [(store.snapshot(), expected)]:
+        ordered = sorted(contents.items())
+        assert list(snapshot.items()) == ordered
+        assert list(snapshot) == [key for key, _ in ordered]
+        assert len(snapshot) == len(contents)
+        assert walk_pages(snapshot, 7) == [value for _, value in ordered]
+        for key in rng.sample(sorted(contents), min(20, len(contents))):
+            assert snapshot[key] == contents[key]
+            assert list(snapshot.values(key)) == [value for k, value in ordered if k > key]
+        assert snapshot.get("missing") is None and "missing" not in snapshot
+
+    with pytest.raises(KeyError):
+        del store["missing"]
+    for key in list(expected):
+        del store[key]
+    assert len(store) == 0 and list(store.snapshot().items()) == []
+    store["again"] = 1
+    assert list(store.snapshot().items()) == [("again", 1)]
+
+
+def test_snapshot_is_isolated_from_writes_during_iteration(node_size):
+    store = SnapshotStore()
+    for i in range(500):
+        store[f"k{i:04d}"] = i
+    snapshot = store.snapshot()
+
+    seen = []
+    for position, (key, value) in enumerate(snapshot.items()):
+        seen.append((key, value))
+        if position == 100:
+            # Rewrite, delete and insert on both sides of the iterator
+            for i in range(0, 500, 3):
+                store[f"k{i:04d}"] = -i
+            for i in range(1, 500, 3):
+                del store[f"k{i:04d}"]
+            for i in range(500, 700):
+                store[f"k{i:04d}"] = i
+    assert seen == [(f"k{i:04d}", i) for i in range(500)]
+    assert len(snapshot) == 500
+    assert len(store) == 500 - 167 + 200
+    assert store["k0003"] == -3 and "k0001" not in store
+
+
+def test_repository_listing_is_by_id_and_stable_under_concurrent_writes():
+    repository = InMemoryUserRepository()
+
+    async def create(ids, name="User"):
+        for id in ids:
+            await repository.create(User(id, name, f"{id}@example.com"))
+
+    asyncio.run(create(["u3", "u1", "u2"]))
+    # Listed by id, not insertion order
+    assert [user.id for user in asyncio.run(repository.find_all())] == ["u1", "u2", "u3"]
+
+    asyncio.run(create([f"v{i:04d}" for i in range(2000)]))
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            asyncio.run(create([f"w{i:06d}"], "Writer"))
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(5):
+            ids = [user.id for user in asyncio.run(repository.find_all())]
+            assert ids == sorted(ids) and len(ids) == len(set(ids))
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_unlocked_writers_never_lose_an_update(node_size):
+    store = SnapshotStore()
+    # A short switch interval makes writers interleave mid-update
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def writer(thread):
+        for i in range(300):
+            store[f"{thread}-{i:03}"] = i
+            if i % 3 == 0:
+                del store[f"{thread}-{i:03}"]
+
+    try:
+        threads = [threading.Thread(target=writer, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    expected = {f"{thread}-{i:03}": i for thread in range(8) for i in range(300) if i % 3}
+    assert dict(store.snapshot().items()) == expected
+    assert len(store) == len(expected)
+    assert all(store[key] == value for key, value in expected.items())
@@ -0,0 +1,84 @@
+"""
+Sparse fieldset tests: ?fields= must return exactly the requested keys,
+reject unknown ones, and reach the repositories' projected queries.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.order import Order
+from domain.user import User
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+
+
+def recording(repository_class):
+    """A repository subclass that records its projected queries"""
+
+    class Recording(repository_class):
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        async def find_by_id_projected(self, id, fields):
+            self.calls.append(("find_by_id_projected", list(fields)))
+            return await super().find_by_id_projected(id, fields)
+
+        async def find_all_projected(self, fields):
+            self.calls.append(("find_all_projected", list(fields)))
+            return await super().find_all_projected(fields)
+
+    return Recording()
+
+
+@pytest.fixture
+def repositories():
+    users = recording(InMemoryUserRepository)
+    orders = recording(InMemoryOrderRepository)
+    asyncio.run(users.create(User("u1", "Ada", "ada@example.com")))
+    asyncio.run(orders.create(Order("o1", "u1", "Pen", 2, created_at=1.0)))
+    return users, orders
+
+
+@pytest.fixture
+def client(repositories):
+    users, orders = repositories
+    return TestClient(create_fastapi_app(custom_user_repository=users, custom_order_repository=orders))
+
+
+@pytest.mark.parametrize("path", ["/api/users", "/api/users/u1", "/api/orders", "/api/orders/o1"])
+def test_unknown_fields_are_rejected(client, path):
+    response = client.get(path, params={"fields": "id,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+    assert client.get(path, params={"fields": " , "}).status_code == 400
+
+
+def test_projections_use_the_projected_queries(client, repositories):
+    users, orders = repositories
+
+    response = client.get("/api/users/u1", params={"fields": "email,id,email"})
+    assert response.json() == {"email": "ada@example.com", "id": "u1"}
+    response = client.get("/api/users", params={"fields": "name"})
+    assert response.json() == [{"name": "Ada"}]
+    assert users.calls == [("find_by_id_projected", ["email", "id"]), ("find_all_projected", ["name"])]
+
+    response = client.get("/api/orders/o1", params={"fields": "status,quantity"})
+    assert response.json() == {"status": "pending", "quantity": 2}
+    assert list(response.json()) == ["status", "quantity"]
+    response = client.get("/api/orders", params={"fields": "id,created_at"})
+    assert response.json() == [{"id": "o1", "created_at": 1.0}]
+    assert [call[0] for call in orders.calls] == ["find_by_id_projected", "find_all_projected"]
+
+    assert client.get("/api/users/missing", params={"fields": "id"}).status_code == 404
+    assert client.get("/api/orders/missing", params={"fields": "id"}).status_code == 404
+
+
+def test_filtered_listings_project_too(client):
+    response = client.get("/api/orders", params={"status": "pending", "fields": "id"})
+    assert response.json() == [{"id": "o1"}]
+    response = client.get("/api/orders/search", params={"q": "pen", "fields": "product"})
+    assert response.json() == [{"product": "Pen"}]
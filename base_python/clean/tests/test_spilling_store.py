@@ -0,0 +1,110 @@
+"""
+SpillingStore tests: LRU eviction to disk, faulting back in, and the byte
+budget's accounting.
+"""
+
+import asyncio
+
+import pytest
+
+from domain.order import Order
+from infrastructure.repositories.in_memory_order_repository import InMemoryOrderRepository
+from infrastructure.repositories.spilling_store import SpillingStore, entity_store
+
+
+def text_store(**budget):
+    return SpillingStore(encode=str.encode, decode=bytes.decode, **budget)
+
+
+def hot_keys(store):
+    return list(store._hot)
+
+
+def test_requires_a_budget():
+    with pytest.raises(ValueError):
+        text_store()
+
+
+def test_evicts_least_recently_used_and_faults_back_in():
+    store = text_store(max_entries=2)
+    for key in "abcde":
+        store[key] = key * 3
+    assert hot_keys(store) == ["d", "e"]
+    assert store.stats()["spilled_entries"] == 3 and store.stats()["evictions"] == 3
+
+    # Reading a spilled key reloads it as most recently used
+    assert store["a"] == "aaa"
+    assert hot_keys(store) == ["e", "a"]
+    assert store["e"] == "eee"
+    assert hot_keys(store) == ["a", "e"]
+    assert (store.hits, store.faults) == (1, 1)
+
+    # Overwriting or deleting a spilled key leaves no stale copy on disk
+    store["b"] = "new"
+    del store["c"]
+    assert store["b"] == "new" and "c" not in store
+    with pytest.raises(KeyError):
+        store["c"]
+    with pytest.raises(KeyError):
+        del store["c"]
+
+    # Iteration keeps insertion order wherever entries live, and a full
+    # scan neither promotes nor counts as a fault
+    faults = store.faults
+    assert list(store) == ["a", "b", "d", "e"]
+    assert list(store.values()) == ["aaa", "new", "ddd", "eee"]
+    assert store.faults == faults
+    assert len(store) == 4
+
+
+def test_byte_budget_accounting():
+    store = text_store(max_bytes=10)
+    store["a"] = "xxxx"
+    store["b"] = "yyyy"
+    assert store.stats()["hot_bytes"] == 8
+
+    store["a"] = "xx"
+    assert store.stats()["hot_bytes"] == 6
+    # Going over budget spills the least recently used entry
+    store["c"] = "zzzzz"
+    assert hot_keys(store) == ["a", "c"]
+    assert store.stats()["hot_bytes"] == 7
+
+    del store["c"]
+    assert store.stats()["hot_bytes"] == 2
+    assert store["b"] == "yyyy"
+    assert store.stats()["hot_bytes"] == 6
+
+    # An entry larger than the whole budget is still kept hot, alone
+    store["big"] = "w" * 50
+    assert hot_keys(store) == ["big"]
+    assert store.stats()["hot_bytes"] == 50
+    assert sorted(store) == ["a", "b", "big"]
+    assert {key: store[key] for key in ("a", "b")} == {"a": "xx", "b": "yyyy"}
+
+
+def test_repository_over_a_spilling_entity_store():
+    repository = InMemoryOrderRepository(entity_store(Order, max_entries=10))
+
+    async def scenario():
+        orders = [
+            Order(f"o{i:03d}", f"u{i % 4}", f"Product {i}", i + 1, created_at=1000.0 + i)
+            for i in range(50)
+        ]
+        for order in orders:
+            await repository.create(order)
+        assert repository._orders.stats()["hot_entries"] == 10
+
+        # Reloaded entities round-trip through their JSON encoding
+        reloaded = await repository.find_by_id("o000")
+        assert reloaded.to_dict() == orders[0].to_dict()
+        assert [order.id for order in await repository.find_by_user_id("u1")] == [
+            order.id for order in orders if order.user_id == "u1"
+        ]
+        assert [order.id async for order in repository.iter_all()] == [
+            order.id for order in orders
+        ]
+        await repository.update_status(["o001"], "completed")
+        assert (await repository.find_by_id("o001")).status == "completed"
+
+    asyncio.run(scenario())
@@ -0,0 +1,137 @@
+"""
+Thread-safe repository tests: many threads writing and reading the same
+ids must never see a half applied write.
+"""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+
+from domain.order import Order
+from domain.user import User
+from infrastructure.repositories.snapshot_store import SnapshotStore
+from infrastructure.repositories.thread_safe_order_repository import (
+    ThreadSafeInMemoryOrderRepository,
+)
+from infrastructure.repositories.thread_safe_user_repository import (
+    ThreadSafeInMemoryUserRepository,
+)
+
+STORES = {"dict": dict, "snapshot": SnapshotStore}
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # Switch threads as often as possible to interleave the operations
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(*targets):
+    """Run each coroutine function on its own thread and event loop"""
+    errors = []
+
+    def run(target):
+        try:
+            asyncio.run(target())
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+@pytest.mark.parametrize("store", STORES)
+def test_concurrent_create_and_delete_of_one_id(store):
+    repository = ThreadSafeInMemoryUserRepository(store=STORES[store]())
+    emails = [f"writer{n}@example.com" for n in range(3)]
+
+    def creator(email):
+        async def create():
+            for _ in range(300):
+                await repository.create(User("same", "Same User", email))
+        return create
+
+    async def deleter():
+        for _ in range(300):
+            try:
+                await repository.delete("same")
+            except ValueError:
+                pass
+
+    run_threads(*(creator(email) for email in emails), deleter, deleter)
+
+    async def indexed():
+        found = [user for email in emails for user in await repository.find_by_email(email)]
+        return found, await repository.find_by_name_prefix("same")
+
+    stored = asyncio.run(repository.find_by_id("same"))
+    by_email, by_name = asyncio.run(indexed())
+    # The indexes hold exactly the stored user, or nothing once deleted
+    expected = [stored] if stored is not None else []
+    assert by_email == expected and by_name == expected
+    assert len(asyncio.run(repository.find_all())) == len(expected)
+
+
+@pytest.mark.parametrize("store", STORES)
+def test_index_lookups_never_return_a_missing_user(store):
+    repository = ThreadSafeInMemoryUserRepository(store=STORES[store]())
+    done = threading.Event()
+
+    async def writer():
+        try:
+            for round in range(200):
+                for n in range(5):
+                    await repository.create(User(f"u{n}", f"Name {round}", "shared@example.com"))
+                for n in range(5):
+                    await repository.delete(f"u{n}")
+        finally:
+            done.set()
+
+    async def reader():
+        while not done.is_set():
+            for user in await repository.find_by_email("shared@example.com"):
+                assert user is not None and user.email == "shared@example.com"
+            for user in await repository.find_by_name_prefix("name"):
+                assert user is not None
+
+    run_threads(writer, reader, reader)
+
+
+@pytest.mark.parametrize("store", STORES)
+def test_find_all_sees_whole_batches(store):
+    repository = ThreadSafeInMemoryOrderRepository(store=STORES[store]())
+    batches = [[f"o{batch:02d}{n}" for n in range(5)] for batch in range(20)]
+    for batch in batches:
+        for id in batch:
+            asyncio.run(repository.create(Order(id, "u1", "Pen", 1)))
+    done = threading.Event()
+
+    async def writer():
+        try:
+            for batch in batches:
+                await repository.update_status(batch, "completed")
+        finally:
+            done.set()
+
+    async def reader():
+        while not done.is_set():
+            orders = await repository.find_all()
+            assert len(orders) == 100
+            completed = {order.id for order in orders if order.status == "completed"}
+            # Every batch is seen all completed or all pending
+            for batch in batches:
+                assert completed.issuperset(batch) or completed.isdisjoint(batch)
+
+    run_threads(writer, reader, reader)
+    counts = asyncio.run(repository.count_by_status())
+    assert counts.get("completed") == 100 and not counts.get("pending")
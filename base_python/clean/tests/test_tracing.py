@@ -0,0 +1,92 @@
+"""
+Tracing tests: server spans continue incoming W3C traces, are named after
+the route template, and parent the repository and use case spans.
+"""
+
+from fastapi.testclient import TestClient
+
+from shared.http.tracing import TracingMiddleware
+from shared.tracing.tracer import Tracer, parse_traceparent
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.http.flask_app import create_flask_app
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from infrastructure.tracing.instrumentation import instrument_repository, instrument_use_case
+from application.use_cases.delete_user import DeleteUserUseCase
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+def server_span(tracer, name):
+    [span] = [span for span in tracer.exporter.get_finished_spans() if span.name == name]
+    return span
+
+
+def children(tracer, parent):
+    return {
+        span.name
+        for span in tracer.exporter.get_finished_spans()
+        if span.parent_id == parent.span_id and span.trace_id == parent.trace_id
+    }
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(TRACEPARENT) == {"trace_id": TRACE_ID, "parent_id": PARENT_ID}
+    assert parse_traceparent("00-abc-def-01") == {}
+    assert parse_traceparent(None) == {}
+
+
+def test_fastapi_request_spans():
+    tracer = Tracer()
+    client = TestClient(create_fastapi_app(tracer=tracer))
+    user = client.post(
+        "/api/users", json={"name": "Ada", "email": "ada@example.com"},
+        headers={"traceparent": TRACEPARENT},
+    ).json()
+
+    span = server_span(tracer, "POST /api/users")
+    assert (span.trace_id, span.parent_id) == (TRACE_ID, PARENT_ID)
+    assert span.attributes["http.status_code"] == 201
+    assert "CreateUserUseCase.execute" in children(tracer, span)
+    [use_case] = [s for s in tracer.exporter.get_finished_spans()
+                  if s.name == "CreateUserUseCase.execute"]
+    assert any(name.startswith("UserRepository.") for name in children(tracer, use_case))
+
+    client.get(f"/api/users/{user['id']}")
+    # Named by route template, not by the raw path
+    span = server_span(tracer, "GET /api/users/{user_id}")
+    assert span.attributes["http.route"] == "/api/users/{user_id}"
+    assert span.trace_id != TRACE_ID and span.parent_id is None
+    assert children(tracer, span) == {"UserRepository.find_by_id"}
+
+
+def test_flask_request_spans():
+    tracer = Tracer()
+    client = create_flask_app(tracer=tracer).test_client()
+    user = client.post(
+        "/users", json={"name": "Ada", "email": "ada@example.com"},
+        headers={"traceparent": TRACEPARENT},
+    ).get_json()
+
+    span = server_span(tracer, "POST /users")
+    assert (span.trace_id, span.parent_id) == (TRACE_ID, PARENT_ID)
+    assert "CreateUserUseCase.execute" in children(tracer, span)
+
+    client.get(f"/users/{user['id']}")
+    span = server_span(tracer, "GET /users/<user_id>")
+    assert span.attributes["http.status_code"] == 200
+    assert children(tracer, span) == {"UserRepository.find_by_id"}
+
+
+def test_nothing_is_wrapped_without_a_tracer(monkeypatch):
+    monkeypatch.delenv("TRACING_EXPORTER", raising=False)
+    repository = InMemoryUserRepository()
+    use_case = DeleteUserUseCase(repository)
+    assert instrument_repository(repository, None, "UserRepository") is repository
+    assert instrument_use_case(use_case, None) is use_case
+
+    app = create_fastapi_app()
+    assert all(middleware.cls is not TracingMiddleware for middleware in app.user_middleware)
+    hooks = create_flask_app().before_request_funcs[None]
+    assert "start_request_span" not in {hook.__name__ for hook in hooks}
@@ -0,0 +1,121 @@
+"""
+User index tests: the email hash index and the casefolded name-prefix
+list must answer like the port's scanning defaults, and drive the
+?email=&name_prefix=&limit= filters of GET /api/users.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from application.ports.user_repository import UserRepository
+from domain.user import User
+from infrastructure.http.fastapi_app import create_fastapi_app
+from infrastructure.repositories.in_memory_user_repository import InMemoryUserRepository
+from infrastructure.repositories.thread_safe_user_repository import (
+    ThreadSafeInMemoryUserRepository,
+)
+
+REPOSITORIES = [InMemoryUserRepository, ThreadSafeInMemoryUserRepository]
+
+USERS = [
+    User("u1", "Ada Lovelace", "ada@example.com"),
+    User("u2", "ada byron", "ada@example.com"),
+    User("u3", "Alan Turing", "alan@example.com"),
+    User("u4", "STRASSE", "strasse@example.com"),
+    User("u5", "Zoe", "zoe@example.com"),
+]
+
+
+class ScanningUserRepository(InMemoryUserRepository):
+    """Index queries through the port's scanning defaults"""
+
+    find_by_email = UserRepository.find_by_email
+    find_by_name_prefix = UserRepository.find_by_name_prefix
+
+
+def seeded(repository_class):
+    repository = repository_class()
+    for user in USERS:
+        asyncio.run(repository.create(user))
+    return repository
+
+
+def ids(users):
+    return [user.id for user in users]
+
+
+@pytest.mark.parametrize("repository_class", REPOSITORIES)
+def test_indexes_follow_creates_and_deletes(repository_class):
+    repository = seeded(repository_class)
+
+    async def scenario():
+        assert ids(await repository.find_by_email("ada@example.com")) == ["u1", "u2"]
+        await repository.delete("u1")
+        assert ids(await repository.find_by_email("ada@example.com")) == ["u2"]
+        assert ids(await repository.find_by_name_prefix("ada")) == ["u2"]
+        # Replacing a user moves it to its new email and name
+        await repository.create(User("u2", "Grace", "grace@example.com"))
+        assert await repository.find_by_email("ada@example.com") == []
+        assert ids(await repository.find_by_email("grace@example.com")) == ["u2"]
+        assert await repository.find_by_name_prefix("ada") == []
+        assert ids(await repository.find_by_name_prefix("gr")) == ["u2"]
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("repository_class", REPOSITORIES)
+def test_name_prefix_is_casefolded(repository_class):
+    repository = seeded(repository_class)
+
+    async def scenario():
+        assert ids(await repository.find_by_name_prefix("ADA")) == ["u2", "u1"]
+        # "ß" casefolds to "ss"
+        assert ids(await repository.find_by_name_prefix("straß")) == ["u4"]
+        assert ids(await repository.find_by_name_prefix("a", limit=2)) == ["u2", "u1"]
+        # The last name in the sorted list, and a prefix past it
+        assert ids(await repository.find_by_name_prefix("zo")) == ["u5"]
+        assert await repository.find_by_name_prefix("zz") == []
+
+    asyncio.run(scenario())
+
+
+def test_scanning_defaults_match_the_indexes():
+    indexed = seeded(InMemoryUserRepository)
+    scanning = seeded(ScanningUserRepository)
+
+    async def scenario():
+        for email in ("ada@example.com", "zoe@example.com", "nobody@example.com"):
+            assert ids(await scanning.find_by_email(email)) == ids(
+                await indexed.find_by_email(email)
+            )
+        for prefix, limit in (("a", None), ("A", 2), ("straß", None), ("zo", 1), ("zz", None)):
+            assert ids(await scanning.find_by_name_prefix(prefix, limit)) == ids(
+                await indexed.find_by_name_prefix(prefix, limit)
+            )
+
+    asyncio.run(scenario())
+
+
+def test_user_filters_over_http():
+    repository = seeded(InMemoryUserRepository)
+    client = TestClient(create_fastapi_app(custom_user_repository=repository))
+
+    response = client.get("/api/users", params={"email": "ada@example.com"})
+    assert [user["id"] for user in response.json()] == ["u1", "u2"]
+    response = client.get("/api/users", params={"email": "ada@example.com", "limit": 1})
+    assert [user["id"] for user in response.json()] == ["u1"]
+    response = client.get(
+        "/api/users", params={"email": "ada@example.com", "name_prefix": "ADA B"}
+    )
+    assert [user["id"] for user in response.json()] == ["u2"]
+
+    response = client.get("/api/users", params={"name_prefix": "a", "limit": 2})
+    assert [user["id"] for user in response.json()] == ["u2", "u1"]
+    response = client.get("/api/users", params={"name_prefix": "al", "fields": "id,email"})
+    assert response.json() == [{"id": "u3", "email": "alan@example.com"}]
+    response = client.get("/api/users", params={"email": "zoe@example.com", "fields": "name"})
+    assert response.json() == [{"name": "Zoe"}]
+
+    assert client.get("/api/users", params={"name_prefix": "a", "limit": 0}).status_code == 422
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from domain.order import Order
+from domain.user import User
+from infrastructure.repositories.in_memory_user_summary_read_model import (
+    InMemoryUserSummaryReadModel,
+)
+
+
+def user(id):
+    return User(id, f"User {id}", f"{id}@example.com")
+
+
+def totals(read_model):
+    """{user id: (order count, total quantity)} of every row"""
+    rows, _ = asyncio.run(read_model.page(limit=1000))
+    return {row.id: (row.order_count, row.total_quantity) for row in rows}
+
+
+async def listing(items, between=None):
+    for item in items:
+        yield item
+        # Changes reported while the rebuild is still reading
+        if between is not None:
+            await between(item)
+
+
+def test_orders_without_a_row_are_held_aside():
+    read_model = InMemoryUserSummaryReadModel()
+
+    async def scenario():
+        # The order arrives before its user
+        await read_model.order_saved(Order("o1", "u1", "Pen", 3))
+        await read_model.user_saved(user("u1"))
+        await read_model.order_saved(Order("o2", "u1", "Pen", 4))
+        # Deleting the user without a cascade keeps its orders counted
+        await read_model.user_deleted("u1")
+        await read_model.order_deleted("o1")
+        await read_model.user_saved(user("u1"))
+
+    asyncio.run(scenario())
+    assert totals(read_model) == {"u1": (1, 4)}
+
+
+def test_replaced_orders_move_their_contribution():
+    read_model = InMemoryUserSummaryReadModel()
+
+    async def scenario():
+        for id in ("u1", "u2"):
+            await read_model.user_saved(user(id))
+        await read_model.order_saved(Order("o1", "u1", "Pen", 3))
+        await read_model.order_saved(Order("o1", "u2", "Pen", 5))
+        await read_model.order_saved(Order("o1", "u2", "Pen", 5, "completed"))
+        await read_model.order_deleted("o1")
+        # Deleting again changes nothing
+        await read_model.order_deleted("o1")
+
+    asyncio.run(scenario())
+    assert totals(read_model) == {"u1": (0, 0), "u2": (0, 0)}
+
+
+def test_pages_are_detached_copies():
+    read_model = InMemoryUserSummaryReadModel()
+    for id in ("u1", "u2", "u3"):
+        asyncio.run(read_model.user_saved(user(id)))
+
+    rows, cursor = asyncio.run(read_model.page(limit=2))
+    assert [row.id for row in rows] == ["u1", "u2"] and cursor == "u2"
+    asyncio.run(read_model.order_saved(Order("o1", "u1", "Pen", 2)))
+    assert rows[0].order_count == 0
+
+    rows, cursor = asyncio.run(read_model.page(limit=2, cursor=cursor))
+    assert [row.id for row in rows] == ["u3"] and cursor is None
+
+
+def test_changes_during_a_rebuild_are_replayed():
+    read_model = InMemoryUserSummaryReadModel()
+    users = [user("u1"), user("u2")]
+    orders = [Order("o1", "u1", "Pen", 1), Order("o2", "u2", "Pen", 2)]
+
+    async def during_users(item):
+        if item.id == "u1":
+            # Reported after the listing already passed these rows
+            await read_model.order_saved(Order("o3", "u1", "Pen", 10))
+            await read_model.user_saved(user("u0"))
+
+    async def during_orders(item):
+        if item.id == "o1":
+            # o2 is still ahead in the listing: replaying its delete after
+            # the listing saved it must leave it deleted
+            await read_model.order_deleted("o2")
+
+    asyncio.run(read_model.rebuild(listing(users, during_users), listing(orders, during_orders)))
+    assert totals(read_model) == {"u0": (0, 0), "u1": (2, 11), "u2": (0, 0)}
+
+    # Later changes apply to the rebuilt rows and are no longer recorded
+    asyncio.run(read_model.order_saved(Order("o4", "u2", "Pen", 1)))
+    assert totals(read_model)["u2"] == (1, 1)
+    assert read_model._replay is None
+
+
+def test_failed_rebuild_keeps_the_current_rows():
+    read_model = InMemoryUserSummaryReadModel()
+    asyncio.run(read_model.user_saved(user("u1")))
+
+    async def broken(item):
+        raise RuntimeError("listing failed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(read_model.rebuild(listing([user("u2")], broken), listing([])))
+    assert totals(read_model) == {"u1": (0, 0)}
+    assert read_model._replay is None
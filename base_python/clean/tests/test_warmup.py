@@ -0,0 +1,88 @@
+"""
+Warm-up tests: required tasks are retried until they succeed, optional
+failures are only recorded, and /ready stays 503 until warm-up is done.
+"""
+
+import asyncio
+import threading
+import time
+
+from shared.http.warmup import WarmUp
+from infrastructure.http.flask_app import create_flask_app
+
+
+def flaky(failures):
+    """A task failing its first ``failures`` calls"""
+    calls = []
+
+    def task():
+        calls.append(None)
+        if len(calls) <= failures:
+            raise ConnectionError("backend not up yet")
+
+    return task
+
+
+def test_required_task_is_retried_until_it_succeeds():
+    warm_up = WarmUp(retry_interval=0.001)
+    warm_up.add("connect", flaky(2))
+    asyncio.run(warm_up.run())
+
+    assert warm_up.ready
+    [task] = warm_up.status()["tasks"]
+    assert task["state"] == "done" and task["attempts"] == 3 and task["error"] is None
+
+
+def test_failed_optional_task_does_not_block_readiness():
+    warm_up = WarmUp(retry_interval=0.001)
+    warm_up.add("preload", flaky(1), required=False)
+
+    async def compile_templates():
+        pass
+
+    warm_up.add("templates", compile_templates)
+    asyncio.run(warm_up.run())
+
+    status = warm_up.status()
+    assert status["status"] == "ready"
+    assert [(task["name"], task["state"], task["attempts"]) for task in status["tasks"]] == [
+        ("preload", "failed", 1),
+        ("templates", "done", 1),
+    ]
+    assert status["tasks"][0]["error"] == "backend not up yet"
+
+
+def test_failing_required_task_keeps_the_app_unready():
+    warm_up = WarmUp(retry_interval=0.001)
+    warm_up.add("connect", flaky(10**9))
+
+    async def scenario():
+        run = asyncio.create_task(warm_up.run())
+        await asyncio.sleep(0.05)
+        assert not warm_up.ready
+        run.cancel()
+
+    asyncio.run(scenario())
+    [task] = warm_up.status()["tasks"]
+    assert task["state"] == "failed" and task["attempts"] > 1
+
+
+def test_flask_readiness_waits_for_warm_up():
+    release = threading.Event()
+    warm_up = WarmUp()
+    warm_up.add("slow", lambda: release.wait(5))
+    app = create_flask_app(warm_up=warm_up)
+    client = app.test_client()
+
+    # The first request starts the warm-up
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "warming_up"
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while client.get("/ready").status_code != 200:
+        assert time.monotonic() < deadline, "never became ready"
+        time.sleep(0.005)
+    assert client.get("/ready").get_json()["tasks"][0]["state"] == "done"
+    app.extensions["background_tasks"].stop()
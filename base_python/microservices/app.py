@@ -3,7 +3,7 @@ from datetime import datetime
 from flask import Flask, request, jsonify
 from .controllers.user_controller import UserController
 from .services.user_service import UserService
-from .repositories.user_repository import InMemoryUserRepository
+from .repositories.user_repository import ThreadSafeInMemoryUserRepository
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -42,8 +42,8 @@ def create_app() -> Flask:
         logger.info(f'Version check responded with: {version}')
         return jsonify({'version': version})
     
-    # Initialize dependencies
-    user_repository = InMemoryUserRepository()
+    # Initialize dependencies (Flask serves requests from multiple threads)
+    user_repository = ThreadSafeInMemoryUserRepository()
     user_service = UserService(user_repository)
     user_controller = UserController(user_service)
     
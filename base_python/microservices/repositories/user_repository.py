@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
+import heapq
+import itertools
 import logging
+import threading
 from ..models.user import User
 
 logger = logging.getLogger(__name__)
@@ -87,3 +90,90 @@ class InMemoryUserRepository(UserRepository):
     async def clear(self) -> None:
         """Clear all users (for testing) - async version"""
         self._users.clear()
+
+
+class ThreadSafeInMemoryUserRepository(UserRepository):
+    """
+    Thread-safe in-memory implementation of UserRepository.
+    Users are sharded by id across N dicts, each guarded by its own lock,
+    so requests for different users do not contend on a single lock.
+    """
+    
+    def __init__(self, stripes: int = 16):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # Each shard maps id -> (sequence, user); sequences keep creation order
+        self._shards: List[Dict[str, tuple]] = [{} for _ in range(stripes)]
+        self._sequence = itertools.count()
+    
+    def _stripe(self, user_id: str) -> int:
+        return hash(user_id) % len(self._shards)
+    
+    def _lock_all(self) -> None:
+        for lock in self._locks:
+            lock.acquire()
+    
+    def _unlock_all(self) -> None:
+        for lock in reversed(self._locks):
+            lock.release()
+    
+    async def create(self, user: User) -> User:
+        """Create a new user"""
+        logger.info(f'Attempting to create user: {user.id}')
+        stripe = self._stripe(user.id)
+        with self._locks[stripe]:
+            shard = self._shards[stripe]
+            # Re-creating moves the user to the end: a fresh sequence must
+            # also come last in the shard for the merge in find_all to hold
+            shard.pop(user.id, None)
+            shard[user.id] = (next(self._sequence), user)
+        logger.info(f'User persisted successfully: {user.id}')
+        return user
+    
+    async def find_by_id(self, user_id: str) -> Optional[User]:
+        """Find user by ID"""
+        logger.info(f'Finding user by id: {user_id}')
+        stripe = self._stripe(user_id)
+        with self._locks[stripe]:
+            entry = self._shards[stripe].get(user_id)
+        
+        if entry:
+            logger.info(f'User found: {user_id}')
+        else:
+            logger.info(f'User not found: {user_id}')
+        
+        return entry[1] if entry else None
+    
+    async def find_all(self) -> List[User]:
+        """Find all users, as a consistent snapshot in creation order"""
+        logger.info('Retrieving all users')
+        self._lock_all()
+        try:
+            shards = [list(shard.values()) for shard in self._shards]
+        finally:
+            self._unlock_all()
+        # Each shard is already in sequence order, so a k-way merge suffices
+        users = [user for _, user in heapq.merge(*shards, key=lambda entry: entry[0])]
+        logger.info(f'Retrieved users count: {len(users)}')
+        return users
+    
+    async def delete(self, user_id: str) -> bool:
+        """Delete user by ID"""
+        logger.info(f'Attempting to delete user: {user_id}')
+        stripe = self._stripe(user_id)
+        with self._locks[stripe]:
+            deleted = self._shards[stripe].pop(user_id, None) is not None
+        
+        if deleted:
+            logger.info(f'User deleted successfully: {user_id}')
+        else:
+            logger.info(f'User not found when attempting to delete: {user_id}')
+        return deleted
+    
+    async def clear(self) -> None:
+        """Clear all users (for testing)"""
+        self._lock_all()
+        try:
+            for shard in self._shards:
+                shard.clear()
+        finally:
+            self._unlock_all()
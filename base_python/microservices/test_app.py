@@ -1,7 +1,9 @@
 import pytest
 import json
 import asyncio
+import threading
 from .app import create_app
+from .models.user import User
 
 @pytest.fixture
 def client():
@@ -45,3 +47,54 @@ def test_create_user(client):
     assert data['name'] == 'Test User'
     assert data['email'] == 'test@example.com'
     assert 'id' in data
+
+def test_concurrent_user_creation(client):
+    """Test users created from many threads are all persisted"""
+    app = client.application
+
+    def create_users(worker: int):
+        worker_client = app.test_client()
+        for i in range(20):
+            worker_client.post('/users',
+                               data=json.dumps({'name': f'User {worker}-{i}',
+                                                'email': f'user{worker}-{i}@example.com'}),
+                               content_type='application/json')
+
+    threads = [threading.Thread(target=create_users, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    response = client.get('/users')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data) == 160
+    assert len({user['id'] for user in data}) == 160
+
+def test_concurrent_user_overwrites_keep_creation_order(client):
+    """Test re-created users move to the end of the listing, from many threads"""
+    repository = client.application.user_repository
+
+    def overwrite_users(worker: int):
+        for i in range(200):
+            user_id = f'user-{(worker * 7 + i) % 40}'
+            asyncio.run(repository.create(User(user_id, f'Name {worker}-{i}', f'{user_id}@example.com')))
+
+    threads = [threading.Thread(target=overwrite_users, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Re-create a few users one after another; they must be listed last, in that order
+    recreated = ['user-5', 'user-39', 'user-0', 'user-17']
+    for user_id in recreated:
+        asyncio.run(repository.create(User(user_id, 'Latest', f'{user_id}@example.com')))
+
+    response = client.get('/users')
+    data = json.loads(response.data)
+    assert len(data) == 40
+    assert len({user['id'] for user in data}) == 40
+    assert [user['id'] for user in data[-4:]] == recreated
+    assert all(user['name'] == 'Latest' for user in data[-4:])
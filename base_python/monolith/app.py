@@ -1,8 +1,93 @@
-from fastapi import FastAPI
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
+from typing import List, Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from users import save_user, get_user
 from orders import save_order, get_order
+from help_dynamodb import (
+    check_dynamodb,
+    check_write_behind,
+    prime_dynamodb,
+    retry_write_behind,
+    start_write_behind,
+    stop_write_behind,
+    tracer,
+    write_behind_stats,
+)
+from write_behind import BufferFullError
+from shared.http.load_shedding import LoadShedder, LoadSheddingMiddleware
+from shared.http.compression import CompressionMiddleware
+from shared.http.profiling import ProfilingMiddleware, RequestProfiler
+from shared.http.tracing import TracingMiddleware
+from shared.http.health import HealthMonitor, LivenessMiddleware
+from shared.http.warmup import WarmUp
+
+
+# Startup warm-up; /ready stays 503 until DynamoDB has been reached once
+warm_up = WarmUp()
+warm_up.add("dynamodb", prime_dynamodb)
+
+# DynamoDB reachability checked in the background; /health/deep serves
+# the cached result so probes never call DynamoDB
+health_monitor = HealthMonitor(interval=float(os.environ.get("HEALTH_CHECK_INTERVAL", "10")))
+health_monitor.add("dynamodb", check_dynamodb)
+# Acknowledged writes that could not be persisted yet
+health_monitor.add("write_behind", check_write_behind)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_write_behind()
+    tasks = [asyncio.create_task(warm_up.run()), asyncio.create_task(health_monitor.run())]
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Flush buffered writes before the process exits
+    stop_write_behind()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Negotiated gzip/brotli for responses of 1 KiB or more
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
-app = FastAPI()
+# On-demand (admin-guarded) and 1-in-N sampled request profiling,
+# configured with PROFILING_ADMIN_TOKEN and PROFILING_SAMPLE_EVERY
+profiler = RequestProfiler.from_env()
+app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+# Per-route concurrency limits so slow DynamoDB calls cannot pile up
+# in the thread pool; the limit adapts to observed latency
+load_shedder = LoadShedder(limit=32, max_queue=16, adaptive="gradient")
+app.add_middleware(LoadSheddingMiddleware, shedder=load_shedder)
+
+# Request spans with DynamoDB child spans, enabled by TRACING_EXPORTER
+if tracer is not None:
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
+# Liveness is answered outermost with a prebuilt response
+app.add_middleware(LivenessMiddleware)
+
+
+@app.exception_handler(BufferFullError)
+async def buffer_full_handler(request: Request, exc: BufferFullError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a ?fields=a,b sparse fieldset"""
+    if not fields:
+        return None
+    return list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip())) or None
 
 
 # Health check
@@ -11,6 +96,59 @@ def health_check():
     return {"message": "health from monolith"}
 
 
+# Deep health from the cached background checks
+@app.get("/health/deep")
+def deep_health():
+    report = health_monitor.snapshot()
+    return JSONResponse(report, status_code=200 if report["status"] == "healthy" else 503)
+
+
+# Readiness, separate from liveness
+@app.get("/ready")
+def readiness():
+    return JSONResponse(warm_up.status(), status_code=200 if warm_up.ready else 503)
+
+
+@app.get("/metrics/load-shedding")
+def load_shedding_metrics():
+    return load_shedder.stats()
+
+
+@app.get("/metrics/write-behind")
+def write_behind_metrics():
+    return write_behind_stats()
+
+
+# Profiling admin endpoints
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not profiler.is_authorized(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+# Queue writes that exhausted their retries again, once DynamoDB recovers
+@app.post("/admin/write-behind/retry", dependencies=[Depends(require_admin)])
+def retry_dead_letters():
+    return retry_write_behind()
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+def list_profiles():
+    return profiler.list()
+
+
+@app.get("/admin/profiles/hot-stacks", dependencies=[Depends(require_admin)])
+def hot_stacks(limit: int = Query(50, ge=1, le=1000)):
+    return profiler.hot_stacks(limit)
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str):
+    profile = profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
 # User endpoints
 @app.post("/users", status_code=201)
 def create_user(data: dict):
@@ -18,8 +156,8 @@ def create_user(data: dict):
 
 
 @app.get("/users/{user_id}")
-def retrieve_user(user_id: str):
-    return get_user(user_id)
+def retrieve_user(user_id: str, fields: Optional[str] = None):
+    return get_user(user_id, parse_fields(fields))
 
 
 # Order endpoints
@@ -29,8 +167,8 @@ def create_order(data: dict):
 
 
 @app.get("/orders/{order_id}")
-def retrieve_order(order_id: str):
-    return get_order(order_id)
+def retrieve_order(order_id: str, fields: Optional[str] = None):
+    return get_order(order_id, parse_fields(fields))
 
 
 if __name__ == "__main__":
@@ -1,13 +1,92 @@
 import boto3
-from typing import Optional
+from typing import Dict, List, Optional, Sequence
 from botocore.exceptions import ClientError
+from shared.dynamodb import projection_arguments
+from shared.tracing.tracer import tracer_from_env
+from tracing import traced
+from write_behind import WriteBehindBuffer, load_write_behind_config
 
 # DynamoDB client
 dynamodb = boto3.resource("dynamodb")
 
+# Span tracer, or None when TRACING_EXPORTER is unset
+tracer = tracer_from_env("monolith")
 
+# Tables opted in to write-behind (see load_write_behind_config)
+write_behind_buffers: Dict[str, WriteBehindBuffer] = {
+    table_name: WriteBehindBuffer(dynamodb, table_name, **options)
+    for table_name, options in load_write_behind_config().items()
+}
+
+
+# Tables used by the monolith
+TABLE_NAMES = ("Users", "Orders")
+
+
+def prime_dynamodb() -> None:
+    """Load the DynamoDB service model and open pooled connections up front"""
+    for table_name in TABLE_NAMES:
+        # DescribeTable also fails fast if a table is missing
+        dynamodb.meta.client.describe_table(TableName=table_name)
+
+
+def check_dynamodb() -> None:
+    """Reachability check: a cheap control-plane call on each table"""
+    for table_name in TABLE_NAMES:
+        dynamodb.meta.client.describe_table(TableName=table_name)
+
+
+def check_write_behind() -> None:
+    """Fail while any write-behind table holds writes that exhausted their retries"""
+    for table_name, buffer in write_behind_buffers.items():
+        dead_letters = buffer.stats()["dead_letters"]
+        if dead_letters:
+            raise Exception(f"{dead_letters} writes to {table_name} failed and are held for retry")
+
+
+def write_behind_stats() -> List[dict]:
+    """Counters of every write-behind table"""
+    return [buffer.stats() for buffer in write_behind_buffers.values()]
+
+
+def retry_write_behind() -> Dict[str, int]:
+    """Queue dead-lettered writes again; how many per table"""
+    return {
+        table_name: buffer.retry_dead_letters()
+        for table_name, buffer in write_behind_buffers.items()
+    }
+
+
+def start_write_behind() -> None:
+    """Start the background flushers of all write-behind tables"""
+    for buffer in write_behind_buffers.values():
+        buffer.start()
+
+
+def stop_write_behind() -> None:
+    """Flush and stop all write-behind tables"""
+    for buffer in write_behind_buffers.values():
+        buffer.close()
+
+
+@traced(
+    tracer,
+    "DynamoDB.PutItem",
+    lambda table_name, data: {
+        "db.system": "dynamodb",
+        "db.operation": "PutItem",
+        "db.table": table_name,
+        "entity.id": data.get("id"),
+        "write_behind": table_name in write_behind_buffers,
+    },
+)
 def save_to_dynamodb(table_name: str, data: dict) -> dict:
     """Save data to DynamoDB table"""
+    buffer = write_behind_buffers.get(table_name)
+    if buffer is not None:
+        buffer.put(data)
+        return data
+
     try:
         table = dynamodb.Table(table_name)
         table.put_item(Item=data)
@@ -20,10 +99,45 @@ def save_to_dynamodb(table_name: str, data: dict) -> dict:
         raise Exception(f"Failed to save to DynamoDB: {str(e)}")
 
 
-def get_from_dynamodb(table_name: str, key: dict) -> Optional[dict]:
-    """Get data from DynamoDB table by key"""
+@traced(
+    tracer,
+    "DynamoDB.GetItem",
+    lambda table_name, key, fields=None: {
+        "db.system": "dynamodb",
+        "db.operation": "GetItem",
+        "db.table": table_name,
+        "entity.id": next(iter(key.values()), None),
+        "db.projection": ",".join(fields) if fields else "",
+    },
+)
+def get_from_dynamodb(
+    table_name: str, key: dict, fields: Optional[Sequence[str]] = None
+) -> Optional[dict]:
+    """Get data from DynamoDB table by key, optionally only some attributes.
+
+    Returns None only when there is no such item; a projection of
+    attributes the item lacks is an empty dict.
+    """
+    buffer = write_behind_buffers.get(table_name)
+    if buffer is not None:
+        # Read-your-writes: serve items that are still waiting to be flushed
+        item = buffer.get(key[buffer.key_attribute])
+        if item is not None:
+            if fields:
+                return {field: item[field] for field in fields if field in item}
+            return item
+
     try:
         table = dynamodb.Table(table_name)
+        if fields:
+            # The key attributes are always projected, so GetItem returns an
+            # Item for every existing key, even one lacking all the fields
+            projected = list(dict.fromkeys([*key, *fields]))
+            response = table.get_item(Key=key, **projection_arguments(projected))
+            item = response.get("Item")
+            if item is None:
+                return None
+            return {field: item[field] for field in fields if field in item}
         response = table.get_item(Key=key)
         return response.get("Item")
     except ClientError as e:
@@ -1,3 +1,4 @@
+from typing import Optional, Sequence
 from fastapi import HTTPException
 from help_dynamodb import save_to_dynamodb, get_from_dynamodb
 
@@ -7,8 +8,8 @@ def save_order(data: dict):
     return data
 
 
-def get_order(order_id: str):
-    order = get_from_dynamodb("Orders", {"id": order_id})
-    if not order:
+def get_order(order_id: str, fields: Optional[Sequence[str]] = None):
+    order = get_from_dynamodb("Orders", {"id": order_id}, fields)
+    if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The monolith imports its modules from the monolith/ directory
+MONOLITH_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MONOLITH_DIR)
+# and middleware shared with the clean architecture app from base_python/shared
+sys.path.insert(1, os.path.dirname(MONOLITH_DIR))
+
+# help_dynamodb builds its boto3 resource at import time
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
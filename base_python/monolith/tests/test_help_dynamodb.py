@@ -0,0 +1,60 @@
+"""
+DynamoDB helper tests against a stubbed client.
+"""
+
+import pytest
+from botocore.stub import Stubber
+from fastapi import HTTPException
+
+import help_dynamodb
+from users import get_user
+
+
+@pytest.fixture
+def stubber():
+    with Stubber(help_dynamodb.dynamodb.meta.client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+def expect_projected_get(stubber, item):
+    stubber.add_response(
+        "get_item",
+        {"Item": item} if item is not None else {},
+        {
+            "TableName": "Users",
+            "Key": {"id": "u1"},
+            "ProjectionExpression": "#p0, #p1",
+            "ExpressionAttributeNames": {"#p0": "id", "#p1": "nickname"},
+        },
+    )
+
+
+def test_projection_of_missing_attributes_is_not_a_404(stubber):
+    # The user exists but has no nickname: only the projected key comes back
+    expect_projected_get(stubber, {"id": {"S": "u1"}})
+    assert get_user("u1", ["nickname"]) == {}
+
+
+def test_missing_item_is_a_404(stubber):
+    expect_projected_get(stubber, None)
+    with pytest.raises(HTTPException) as error:
+        get_user("u1", ["nickname"])
+    assert error.value.status_code == 404
+
+
+def test_key_is_only_returned_when_requested(stubber):
+    stubber.add_response(
+        "get_item",
+        {"Item": {"id": {"S": "u1"}, "name": {"S": "Ana"}}},
+        {
+            "TableName": "Users",
+            "Key": {"id": "u1"},
+            "ProjectionExpression": "#p0, #p1",
+            "ExpressionAttributeNames": {"#p0": "id", "#p1": "name"},
+        },
+    )
+    assert help_dynamodb.get_from_dynamodb("Users", {"id": "u1"}, ["name", "id"]) == {
+        "name": "Ana",
+        "id": "u1",
+    }
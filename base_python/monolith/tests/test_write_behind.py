@@ -0,0 +1,164 @@
+"""
+Write-behind buffer tests against a stubbed BatchWriteItem.
+"""
+
+import threading
+import time
+
+import pytest
+
+import write_behind
+from write_behind import BufferClosedError, BufferFullError, WriteBehindBuffer
+
+
+class StubTable:
+    """Records BatchWriteItem calls; ``unprocessed`` decides what each call leaves unwritten"""
+
+    def __init__(self, unprocessed=None):
+        self.calls = []
+        self.stored = {}
+        self.unprocessed = unprocessed or (lambda call, requests: [])
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        self.calls.append([request["PutRequest"]["Item"] for request in requests])
+        left = self.unprocessed(len(self.calls), requests)
+        if isinstance(left, Exception):
+            raise left
+        for request in requests:
+            if request not in left:
+                item = request["PutRequest"]["Item"]
+                self.stored[item["id"]] = item
+        return {"UnprocessedItems": {table_name: left} if left else {}}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(write_behind.time, "sleep", delays.append)
+    return delays
+
+
+def test_coalesces_writes_per_key_and_batches(sleeps):
+    table = StubTable()
+    buffer = WriteBehindBuffer(table, "Orders", batch_size=2)
+    buffer.put({"id": "a", "v": 1})
+    buffer.put({"id": "b", "v": 1})
+    buffer.put({"id": "a", "v": 2})
+    buffer.put({"id": "c", "v": 1})
+    assert len(buffer) == 3
+    assert buffer.get("a") == {"id": "a", "v": 2}
+
+    full = WriteBehindBuffer(table, "Orders", max_pending=1, put_timeout=0)
+    full.put({"id": "a", "v": 1})
+    # Rewriting a pending key needs no room; a new key does
+    full.put({"id": "a", "v": 2})
+    with pytest.raises(BufferFullError):
+        full.put({"id": "b", "v": 1})
+
+    buffer.flush()
+    # The rewrite of "a" moved it behind "b"
+    assert [[item["id"] for item in call] for call in table.calls] == [["b", "a"], ["c"]]
+    assert table.stored["a"] == {"id": "a", "v": 2}
+    assert buffer.get("a") is None
+    assert buffer.stats()["written"] == 3 and buffer.stats()["batches"] == 2
+
+
+def test_retries_unprocessed_items_with_exponential_backoff(sleeps):
+    # The first two attempts leave the last item unwritten
+    table = StubTable(lambda call, requests: requests[-1:] if call <= 2 else [])
+    buffer = WriteBehindBuffer(table, "Orders", retry_base_delay=0.05)
+    buffer.put({"id": "a"})
+    buffer.put({"id": "b"})
+    buffer.flush()
+
+    assert [[item["id"] for item in call] for call in table.calls] == [["a", "b"], ["b"], ["b"]]
+    assert sleeps == [0.05, 0.1]
+    assert set(table.stored) == {"a", "b"}
+    assert buffer.stats()["failed"] == 0 and buffer.stats()["dead_letters"] == 0
+
+
+def test_exhausted_writes_are_dead_lettered_not_dropped(sleeps):
+    down = True
+    table = StubTable(lambda call, requests: ConnectionError("unreachable") if down else [])
+    buffer = WriteBehindBuffer(table, "Orders", max_retries=2, max_dead_letters=2)
+    buffer.put({"id": "a", "v": 1})
+    buffer.put({"id": "b", "v": 1})
+    buffer.flush()
+
+    assert len(table.calls) == 3
+    assert sleeps == [0.05, 0.1]
+    assert buffer.dead_letters() == [{"id": "a", "v": 1}, {"id": "b", "v": 1}]
+    # Acknowledged writes stay readable
+    assert buffer.get("a") == {"id": "a", "v": 1}
+    assert buffer.stats()["failed"] == 2 and buffer.stats()["dead_letters"] == 2
+    # A full dead-letter queue refuses new writes
+    with pytest.raises(BufferFullError):
+        buffer.put({"id": "c"})
+
+    down = False
+    assert buffer.retry_dead_letters() == 2
+    buffer.put({"id": "a", "v": 2})
+    buffer.flush()
+    assert table.stored == {"a": {"id": "a", "v": 2}, "b": {"id": "b", "v": 1}}
+    assert buffer.dead_letters() == [] and len(buffer) == 0
+
+
+def test_newer_write_supersedes_a_failing_one(sleeps):
+    buffer = None
+
+    def fail_after_rewrite(call, requests):
+        if call == 1:
+            buffer.put({"id": "a", "v": 2})
+        return ConnectionError("unreachable") if call <= 2 else []
+
+    table = StubTable(fail_after_rewrite)
+    buffer = WriteBehindBuffer(table, "Orders", max_retries=1)
+    buffer.put({"id": "a", "v": 1})
+    buffer.flush()
+
+    # The failed v1 is not dead-lettered; the pending v2 is written instead
+    assert buffer.dead_letters() == []
+    assert table.stored == {"a": {"id": "a", "v": 2}}
+    assert buffer.stats()["failed"] == 1 and buffer.stats()["written"] == 1
+
+
+def test_close_flushes_everything_pending():
+    table = StubTable()
+    buffer = WriteBehindBuffer(table, "Orders", batch_size=25, flush_interval=60)
+    buffer.start()
+    for i in range(60):
+        buffer.put({"id": f"o{i}"})
+    buffer.close(timeout=5)
+
+    assert len(table.stored) == 60
+    assert len(buffer) == 0
+
+
+def test_puts_are_refused_once_close_starts():
+    table = StubTable()
+    # Not started, so the pending item keeps the buffer full until close()
+    buffer = WriteBehindBuffer(table, "Orders", max_pending=1, put_timeout=5)
+    buffer.put({"id": "o1"})
+    errors = []
+
+    def waiting_put():
+        try:
+            buffer.put({"id": "o2"})
+        except BufferFullError as e:
+            errors.append(e)
+
+    producer = threading.Thread(target=waiting_put)
+    producer.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    buffer.close()
+    producer.join()
+
+    # The waiting producer is woken by close(), not by its timeout
+    assert time.monotonic() - started < 1
+    assert [type(e) for e in errors] == [BufferClosedError]
+    with pytest.raises(BufferClosedError):
+        buffer.put({"id": "o3"})
+    assert set(table.stored) == {"o1"}
+    assert len(buffer) == 0
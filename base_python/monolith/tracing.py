@@ -0,0 +1,29 @@
+"""
+Span decorator for the monolith's DynamoDB helpers.
+
+The tracer itself and the HTTP middleware are shared with the clean
+architecture app (see shared/tracing/tracer.py and shared/http/tracing.py).
+"""
+
+import functools
+from typing import Any, Callable, Dict
+
+
+def traced(tracer, span_name: str, attributes: Callable[..., Dict[str, Any]]):
+    """Decorate a function with a span when tracer is set, else leave it alone.
+
+    ``attributes`` builds the span attributes from the call arguments.
+    """
+
+    def decorator(function):
+        if tracer is None:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name, attributes=attributes(*args, **kwargs)):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,3 +1,4 @@
+from typing import Optional, Sequence
 from fastapi import HTTPException
 from help_dynamodb import save_to_dynamodb, get_from_dynamodb
 
@@ -7,8 +8,8 @@ def save_user(data: dict):
     return data
 
 
-def get_user(user_id: str):
-    user = get_from_dynamodb("Users", {"id": user_id})
-    if not user:
+def get_user(user_id: str, fields: Optional[Sequence[str]] = None):
+    user = get_from_dynamodb("Users", {"id": user_id}, fields)
+    if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
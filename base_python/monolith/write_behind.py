@@ -0,0 +1,300 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB accepts at most 25 put requests per BatchWriteItem call
+MAX_BATCH_SIZE = 25
+
+
+class BufferFullError(Exception):
+    """Raised when a write-behind buffer cannot accept more items.
+
+    Raised both when too many writes are pending and when the dead-letter
+    queue is full.
+    """
+
+    def __init__(self, table_name: str, retry_after: int = 1):
+        super().__init__(f"Write buffer for {table_name} is full")
+        self.table_name = table_name
+        self.retry_after = retry_after
+
+
+class BufferClosedError(BufferFullError):
+    """Raised by put() once close() has started: the write would never be flushed"""
+
+    def __init__(self, table_name: str, retry_after: int = 1):
+        super().__init__(table_name, retry_after)
+        self.args = (f"Write buffer for {table_name} is closed",)
+
+
+class WriteBehindBuffer:
+    """Bounded in-process buffer that drains puts to DynamoDB in batches.
+
+    Writes are acknowledged as soon as they are queued. A background thread
+    flushes them with BatchWriteItem when ``batch_size`` items are pending or
+    ``flush_interval`` seconds have passed, retrying unprocessed items with
+    exponential backoff. Pending items are kept in an overlay keyed by
+    ``key_attribute`` so reads can see writes that are not persisted yet.
+
+    Items still unwritten after ``max_retries`` retries were already
+    acknowledged, so they are never dropped: they move to a dead-letter
+    queue, stay readable through ``get`` and are reported by ``stats`` until
+    ``retry_dead_letters`` queues them again or a newer write for the same
+    key replaces them. Once ``max_dead_letters`` items are held there, new
+    writes fail with BufferFullError rather than risk more silent loss.
+    One batch is written at a time, so writes to a key reach DynamoDB in
+    order. Once ``close`` has started, ``put`` raises BufferClosedError,
+    including for producers already waiting for room.
+    """
+
+    def __init__(
+        self,
+        dynamodb,
+        table_name: str,
+        key_attribute: str = "id",
+        max_pending: int = 10000,
+        batch_size: int = MAX_BATCH_SIZE,
+        flush_interval: float = 0.5,
+        put_timeout: float = 0.1,
+        max_retries: int = 5,
+        retry_base_delay: float = 0.05,
+        max_dead_letters: int = 1000,
+    ):
+        self._dynamodb = dynamodb
+        self.table_name = table_name
+        self.key_attribute = key_attribute
+        self.max_pending = max_pending
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.max_dead_letters = max_dead_letters
+
+        # key -> latest pending item, in arrival order
+        self._pending: Dict[str, dict] = {}
+        # key -> item handed to the flusher but not confirmed yet
+        self._in_flight: Dict[str, dict] = {}
+        # key -> item that exhausted its retries, in failure order
+        self._dead_letters: Dict[str, dict] = {}
+        self._condition = threading.Condition()
+        # Held while a batch is taken and written, by one flusher at a time
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def put(self, item: dict) -> None:
+        """Queue an item for writing, waiting briefly if the buffer is full"""
+        key = item[self.key_attribute]
+        deadline = time.monotonic() + self.put_timeout
+        with self._condition:
+            if self._closing:
+                raise BufferClosedError(self.table_name)
+            if len(self._dead_letters) >= self.max_dead_letters:
+                raise BufferFullError(self.table_name)
+            while (
+                key not in self._pending
+                and len(self._pending) >= self.max_pending
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BufferFullError(self.table_name)
+                self._condition.wait(remaining)
+                if self._closing:
+                    raise BufferClosedError(self.table_name)
+
+            # Re-inserting moves the key to the end so the newest write wins
+            self._pending.pop(key, None)
+            self._pending[key] = item
+            # The new write supersedes one that failed earlier
+            self._dead_letters.pop(key, None)
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the buffered item for a key, if it has not been persisted"""
+        with self._condition:
+            item = self._pending.get(key)
+            if item is None:
+                item = self._in_flight.get(key)
+            if item is None:
+                item = self._dead_letters.get(key)
+            return item
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._pending) + len(self._in_flight)
+
+    def stats(self) -> dict:
+        """Return buffer counters for monitoring"""
+        with self._condition:
+            return {
+                "table": self.table_name,
+                "pending": len(self._pending),
+                "in_flight": len(self._in_flight),
+                "dead_letters": len(self._dead_letters),
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+    def dead_letters(self) -> List[dict]:
+        """Items that exhausted their retries, oldest failure first"""
+        with self._condition:
+            return list(self._dead_letters.values())
+
+    def retry_dead_letters(self) -> int:
+        """Queue every dead-lettered item for writing again; returns how many"""
+        with self._condition:
+            items, self._dead_letters = self._dead_letters, {}
+            for key, item in items.items():
+                # A newer pending write for the key already supersedes it
+                self._pending.setdefault(key, item)
+            if items:
+                self._condition.notify_all()
+            return len(items)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background flusher thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._closing = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"write-behind-{self.table_name}", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Write-behind flusher started for {self.table_name}")
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting writes and flush everything that is pending"""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    f"Write-behind flusher for {self.table_name} still draining "
+                    f"{len(self)} items after {timeout}s"
+                )
+                return
+            self._thread = None
+        # Drain anything left if the flusher was never started
+        self.flush()
+        logger.info(f"Write-behind flusher stopped for {self.table_name}")
+
+    def flush(self) -> None:
+        """Synchronously write every pending item"""
+        while self._flush_once():
+            pass
+
+    # ------------------------------------------------------------------
+    # Flusher
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if len(self._pending) < self.batch_size and not self._closing:
+                    self._condition.wait(self.flush_interval)
+                if self._closing and not self._pending:
+                    return
+            self._flush_once()
+
+    def _flush_once(self) -> bool:
+        """Write one batch; False if nothing was pending"""
+        with self._flush_lock:
+            batch = self._take_batch()
+            if not batch:
+                return False
+            self._write_batch(batch)
+            return True
+
+    def _take_batch(self) -> List[dict]:
+        with self._condition:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                key = next(iter(self._pending))
+                item = self._pending.pop(key)
+                self._in_flight[key] = item
+                batch.append(item)
+            if batch:
+                # Space was freed for producers waiting in put()
+                self._condition.notify_all()
+            return batch
+
+    def _write_batch(self, batch: List[dict]) -> None:
+        requests = [{"PutRequest": {"Item": item}} for item in batch]
+        attempt = 0
+        while requests:
+            try:
+                response = self._dynamodb.batch_write_item(
+                    RequestItems={self.table_name: requests}
+                )
+                requests = response.get("UnprocessedItems", {}).get(
+                    self.table_name, []
+                )
+            except Exception as e:
+                logger.warning(
+                    f"BatchWriteItem to {self.table_name} failed: {str(e)}"
+                )
+            if not requests:
+                break
+            attempt += 1
+            if attempt > self.max_retries:
+                break
+            time.sleep(self.retry_base_delay * (2 ** (attempt - 1)))
+
+        failed_keys = {
+            request["PutRequest"]["Item"][self.key_attribute] for request in requests
+        }
+        with self._condition:
+            for item in batch:
+                key = item[self.key_attribute]
+                del self._in_flight[key]
+                # Unless a newer write for the key is already pending
+                if key in failed_keys and key not in self._pending:
+                    self._dead_letters[key] = item
+            self.batches += 1
+            self.failed += len(failed_keys)
+            self.written += len(batch) - len(failed_keys)
+
+        if failed_keys:
+            logger.error(
+                f"Dead-lettered {len(failed_keys)} items for {self.table_name} "
+                f"after {self.max_retries} retries"
+            )
+
+
+def load_write_behind_config() -> Dict[str, dict]:
+    """Read per-table write-behind settings from the environment.
+
+    ``DYNAMODB_WRITE_BEHIND`` holds a JSON object mapping table names to
+    WriteBehindBuffer keyword arguments, for example::
+
+        {"Orders": {"batch_size": 25, "flush_interval": 0.2, "max_pending": 5000}}
+
+    Tables that are not listed keep writing synchronously.
+    """
+    raw = os.environ.get("DYNAMODB_WRITE_BEHIND")
+    if not raw:
+        return {}
+    config = json.loads(raw)
+    return {table: dict(options or {}) for table, options in config.items()}
@@ -5,8 +5,12 @@ setup(
     version="1.0.0",
     description="Portable application for Local Server, Docker, AWS Lambda, ECS and EKS - Python Version",
     author="Converted to Python",
-    packages=find_packages(),
+    # The apps run from their own directories; what is installed is the
+    # code they share (pip install -e . for local runs, container images
+    # copy shared/ next to the app instead)
+    packages=find_packages(include=["shared", "shared.*"]),
     install_requires=[
+        "starlette>=0.27",
         "flask==3.0.0",
         "flask-cors==4.0.0",
         "pytest==7.4.3",
@@ -0,0 +1 @@
+# Code shared by the monolith and clean architecture apps
@@ -0,0 +1,11 @@
+from typing import Any, Dict, Sequence
+
+
+def projection_arguments(fields: Sequence[str]) -> Dict[str, Any]:
+    """Build ProjectionExpression arguments for a list of attribute names"""
+    # Placeholders avoid clashes with reserved words such as "name" or "status"
+    names = {f"#p{i}": field for i, field in enumerate(fields)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
@@ -0,0 +1 @@
+# Shared HTTP middleware package
@@ -0,0 +1,208 @@
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+DEFAULT_EXCLUDED_PATHS = ("/health", "/api/health", "/health/deep", "/ready")
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, in order of preference"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding allowed by an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class StreamCompressor:
+    """Incremental gzip or brotli compressor"""
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=4 if level is None else level)
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit everything buffered so far, keeping the stream open"""
+        if self.encoding == "br":
+            return self._compressor.flush()
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_body(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    compressor = StreamCompressor(encoding, level)
+    return compressor.compress(body) + compressor.finish()
+
+
+def compress_stream(
+    chunks: Iterable[Union[bytes, str]], encoding: str, level: Optional[int] = None
+) -> Iterator[bytes]:
+    """Compress an iterable of chunks, flushing after each one.
+
+    WSGI generators may yield ``str``; those chunks are encoded as UTF-8,
+    the encoding Werkzeug uses for text bodies.
+    """
+    compressor = StreamCompressor(encoding, level)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """ASGI middleware for negotiated gzip/brotli response compression.
+
+    Buffered responses are compressed only when they are at least
+    ``minimum_size`` bytes; chunked responses are compressed incrementally.
+    Paths listed in ``exclude_paths`` are never compressed.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        exclude_paths: Iterable[str] = DEFAULT_EXCLUDED_PATHS,
+        level: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.exclude_paths = set(exclude_paths)
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.level)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, minimum_size: int, level: Optional[int]):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start_message = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            headers = dict(message.get("headers", []))
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            if b"content-encoding" in headers or not is_compressible(content_type):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                # Hold the start message until the first body chunk tells us
+                # whether the response is streamed and how large it is
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body:
+                if len(body) < self.minimum_size:
+                    self.passthrough = True
+                    await self.send(self.start_message)
+                    await self.send(message)
+                    return
+                data = compress_body(body, self.encoding, self.level)
+                await self.send(self._compressed_start(content_length=len(data)))
+                await self.send({"type": "http.response.body", "body": data})
+                return
+            self.compressor = StreamCompressor(self.encoding, self.level)
+            await self.send(self._compressed_start())
+
+        data = self.compressor.compress(body)
+        data += self.compressor.flush() if more_body else self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compressed_start(self, content_length: Optional[int] = None):
+        headers = []
+        vary = b"Accept-Encoding"
+        for name, value in self.start_message.get("headers", []):
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary = value + b", Accept-Encoding"
+                continue
+            headers.append((name, value))
+        headers.append((b"content-encoding", self.encoding.encode()))
+        headers.append((b"vary", vary))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        message = dict(self.start_message)
+        message["headers"] = headers
+        return message
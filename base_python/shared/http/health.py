@@ -0,0 +1,139 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+LIVENESS_PATH = "/live"
+
+# Prebuilt once and reused for every probe
+_LIVE_BODY = b'{"status":"alive"}'
+_LIVE_START = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_LIVE_BODY)).encode()),
+        (b"cache-control", b"no-store"),
+    ],
+}
+_LIVE_BODY_MESSAGE = {"type": "http.response.body", "body": _LIVE_BODY}
+_LIVE_WSGI_HEADERS = [
+    ("Content-Type", "application/json"),
+    ("Content-Length", str(len(_LIVE_BODY))),
+    ("Cache-Control", "no-store"),
+]
+_LIVE_WSGI_BODY = [_LIVE_BODY]
+
+
+class LivenessMiddleware:
+    """ASGI middleware answering the liveness probe before any other layer.
+
+    The probe never reaches routing, other middleware or the backends, and
+    its response is built once at import time.
+    """
+
+    def __init__(self, app, path: str = LIVENESS_PATH):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == self.path:
+            await send(_LIVE_START)
+            await send(_LIVE_BODY_MESSAGE)
+            return
+        await self.app(scope, receive, send)
+
+
+class LivenessWSGIMiddleware:
+    """WSGI counterpart of LivenessMiddleware"""
+
+    def __init__(self, app, path: str = LIVENESS_PATH):
+        self.app = app
+        self.path = path
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") == self.path:
+            start_response("200 OK", _LIVE_WSGI_HEADERS)
+            return _LIVE_WSGI_BODY
+        return self.app(environ, start_response)
+
+
+HealthCheck = Callable[[], Union[None, Awaitable[None]]]
+
+
+class HealthMonitor:
+    """Runs dependency checks in the background and caches the outcome.
+
+    Every ``interval`` seconds each check is run with a ``timeout``; a check
+    passes unless it raises or times out. Readers only ever see the cached
+    result, so health requests never call a backend. A result older than
+    ``stale_after`` seconds (default three intervals) is reported unhealthy,
+    which catches a stuck monitor.
+    """
+
+    def __init__(
+        self,
+        interval: float = 10.0,
+        timeout: float = 2.0,
+        stale_after: Optional[float] = None,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after if stale_after is not None else 3 * interval
+        self._checks: Dict[str, HealthCheck] = {}
+        self._results: Dict[str, Dict] = {}
+        self._checked_at: Optional[float] = None
+
+    def add(self, name: str, check: HealthCheck) -> None:
+        self._checks[name] = check
+
+    async def _run_check(self, check: HealthCheck) -> Dict:
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(check):
+                await asyncio.wait_for(check(), self.timeout)
+            else:
+                await asyncio.wait_for(asyncio.to_thread(check), self.timeout)
+            result = {"status": "ok"}
+        except asyncio.TimeoutError:
+            result = {"status": "failing", "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": "failing", "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    async def check_now(self) -> None:
+        """Run every check once, concurrently, and replace the cached results"""
+        names = list(self._checks)
+        outcomes = await asyncio.gather(*(self._run_check(self._checks[name]) for name in names))
+        for name, outcome in zip(names, outcomes):
+            if outcome["status"] != "ok":
+                logger.warning(f"Health check {name} failing: {outcome['error']}")
+        self._results = dict(zip(names, outcomes))
+        self._checked_at = time.time()
+
+    async def run(self) -> None:
+        while True:
+            await self.check_now()
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict:
+        """The cached health report; never triggers a check"""
+        checked_at = self._checked_at
+        if checked_at is None:
+            status = "unknown"
+        elif time.time() - checked_at > self.stale_after:
+            status = "stale"
+        elif all(result["status"] == "ok" for result in self._results.values()):
+            status = "healthy"
+        else:
+            status = "unhealthy"
+        return {
+            "status": status,
+            "checked_at": checked_at,
+            "age_s": None if checked_at is None else round(time.time() - checked_at, 3),
+            "checks": self._results,
+        }
@@ -0,0 +1,331 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Optional
+
+from starlette.routing import Match
+
+
+class AIMDLimit:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    The limit grows by one after a full window of fast, successful requests
+    and is cut by ``backoff_ratio`` whenever a request is slow or fails.
+    """
+
+    def __init__(self, latency_threshold: float = 0.5, backoff_ratio: float = 0.9):
+        self.latency_threshold = latency_threshold
+        self.backoff_ratio = backoff_ratio
+        self._successes = 0
+
+    def update(self, limit: float, latency: float, ok: bool) -> float:
+        if not ok or latency > self.latency_threshold:
+            self._successes = 0
+            return limit * self.backoff_ratio
+        self._successes += 1
+        if self._successes >= limit:
+            self._successes = 0
+            return limit + 1
+        return limit
+
+
+class GradientLimit:
+    """Latency-gradient concurrency limit.
+
+    Compares the best latency seen recently with a smoothed latency and
+    scales the limit by their ratio, leaving ``sqrt(limit)`` headroom for
+    queueing.
+    """
+
+    def __init__(self, smoothing: float = 0.2, tolerance: float = 1.5, min_window: int = 100):
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.min_window = min_window
+        self._min_latency: Optional[float] = None
+        self._samples = 0
+
+    def update(self, limit: float, latency: float, ok: bool) -> float:
+        self._samples += 1
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        if self._samples >= self.min_window:
+            # Forget the floor now and then so it can track a slower backend
+            self._samples = 0
+            self._min_latency = latency
+        if not ok:
+            return limit * 0.9
+        gradient = max(0.5, min(1.0, self.tolerance * self._min_latency / max(latency, 1e-9)))
+        new_limit = limit * gradient + math.sqrt(limit)
+        return limit * (1 - self.smoothing) + new_limit * self.smoothing
+
+
+ADAPTIVE_LIMITS = {"aimd": AIMDLimit, "gradient": GradientLimit}
+
+
+class _ThreadWaiter:
+    def __init__(self):
+        self.event = threading.Event()
+
+    def grant(self) -> None:
+        self.event.set()
+
+
+class _AsyncWaiter:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.event = asyncio.Event()
+
+    def grant(self) -> None:
+        self.loop.call_soon_threadsafe(self.event.set)
+
+
+_REJECTED = object()
+
+
+class ConcurrencyLimiter:
+    """Concurrency limit with a short bounded wait queue.
+
+    Requests over the limit wait in a FIFO queue of at most ``max_queue``
+    entries for up to ``queue_timeout`` seconds; anything beyond that is
+    rejected immediately. Slots are handed directly to the oldest waiter on
+    release. Usable from threads (``acquire``) and coroutines
+    (``acquire_async``).
+    """
+
+    def __init__(
+        self,
+        limit: int = 64,
+        max_queue: int = 32,
+        queue_timeout: float = 0.05,
+        adaptive: Optional[str] = None,
+        min_limit: int = 1,
+        max_limit: int = 512,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._limit = float(limit)
+        self._strategy = ADAPTIVE_LIMITS[adaptive]() if adaptive else None
+        self._lock = threading.Lock()
+        self._waiters: Deque = deque()
+        self._in_flight = 0
+        self._latency_ewma = 0.0
+
+        self.accepted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def _enter(self, make_waiter: Callable):
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                self.accepted += 1
+                return None
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                return _REJECTED
+            waiter = make_waiter()
+            self._waiters.append(waiter)
+            return waiter
+
+    def _abandon(self, waiter) -> bool:
+        """Leave the queue after a timeout; True if a slot was granted meanwhile"""
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                return True
+            self.timed_out += 1
+            return False
+
+    def acquire(self) -> bool:
+        """Take a slot from a worker thread; False means shed the request"""
+        waiter = self._enter(_ThreadWaiter)
+        if waiter is None:
+            return True
+        if waiter is _REJECTED:
+            return False
+        if waiter.event.wait(self.queue_timeout):
+            return True
+        return self._abandon(waiter)
+
+    async def acquire_async(self) -> bool:
+        """Take a slot from the event loop; False means shed the request"""
+        loop = asyncio.get_running_loop()
+        waiter = self._enter(lambda: _AsyncWaiter(loop))
+        if waiter is None:
+            return True
+        if waiter is _REJECTED:
+            return False
+        try:
+            await asyncio.wait_for(waiter.event.wait(), self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self._abandon(waiter)
+
+    def release(self, latency: float, ok: bool = True) -> None:
+        """Give a slot back and feed the observed latency to the limit"""
+        with self._lock:
+            self.completed += 1
+            if not ok:
+                self.failed += 1
+            self._latency_ewma = (
+                latency if self.completed == 1 else 0.9 * self._latency_ewma + 0.1 * latency
+            )
+            if self._strategy is not None:
+                # From the unrounded limit, or small smoothed steps are lost
+                new_limit = self._strategy.update(self._limit, latency, ok)
+                self._limit = float(max(self.min_limit, min(self.max_limit, new_limit)))
+
+            self._in_flight -= 1
+            while self._waiters and self._in_flight < self.limit:
+                self._in_flight += 1
+                self.accepted += 1
+                self._waiters.popleft().grant()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "completed": self.completed,
+                "failed": self.failed,
+                "latency_ewma_ms": round(self._latency_ewma * 1000, 3),
+            }
+
+
+class LoadShedder:
+    """Registry of per-route concurrency limiters.
+
+    Routes are identified as ``"<METHOD> <path template>"``, for example
+    ``"GET /api/users/{user_id}"``. ``route_limits`` overrides the default
+    limit for individual routes and ``exempt_routes`` lists path templates
+    (such as health probes) that are never limited.
+    """
+
+    def __init__(
+        self,
+        limit: int = 64,
+        max_queue: int = 32,
+        queue_timeout: float = 0.05,
+        adaptive: Optional[str] = None,
+        route_limits: Optional[Dict[str, int]] = None,
+        exempt_routes: Iterable[str] = (
+            "/health",
+            "/api/health",
+            "/health/deep",
+            "/ready",
+            "/metrics/load-shedding",
+            "/api/metrics/load-shedding",
+            # Long-polls are idle by design and must not hold a slot
+            "/changes",
+            "/api/changes",
+        ),
+        retry_after: int = 1,
+    ):
+        if adaptive is not None and adaptive not in ADAPTIVE_LIMITS:
+            raise ValueError(f"Unknown adaptive limit: {adaptive}")
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.adaptive = adaptive
+        self.route_limits = dict(route_limits or {})
+        self.exempt_routes = set(exempt_routes)
+        self.retry_after = retry_after
+        self._limiters: Dict[str, ConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter_for(self, method: str, path: str) -> Optional[ConcurrencyLimiter]:
+        """Return the limiter of a route, or None if the route is exempt"""
+        if path in self.exempt_routes:
+            return None
+        key = f"{method} {path}"
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(key)
+                if limiter is None:
+                    limiter = ConcurrencyLimiter(
+                        limit=self.route_limits.get(key, self.limit),
+                        max_queue=self.max_queue,
+                        queue_timeout=self.queue_timeout,
+                        adaptive=self.adaptive,
+                    )
+                    self._limiters[key] = limiter
+        return limiter
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {key: limiter.stats() for key, limiter in list(self._limiters.items())}
+
+
+class LoadSheddingMiddleware:
+    """ASGI middleware that applies a LoadShedder to matched routes"""
+
+    def __init__(self, app, shedder: LoadShedder):
+        self.app = app
+        self.shedder = shedder
+
+    def _route_path(self, scope) -> Optional[str]:
+        router = getattr(scope.get("app"), "router", None)
+        for route in getattr(router, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = self._route_path(scope)
+        limiter = self.shedder.limiter_for(scope["method"], path) if path else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire_async():
+            await self._shed(send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            limiter.release(time.perf_counter() - started, ok=status < 500)
+
+    async def _shed(self, send) -> None:
+        body = b'{"detail":"Service overloaded, retry later"}'
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.shedder.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,377 @@
+import asyncio
+import cProfile
+import hmac
+import inspect
+import itertools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from types import CodeType
+from typing import Collection, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from starlette.routing import Match
+
+PROFILE_MODES = ("cprofile", "sample")
+
+# Leaf frames of threads that are parked rather than doing work
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("thread.py", "_worker"),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def fold_stack(frame) -> Optional[str]:
+    """Collapse a frame chain into a root-to-leaf ``a;b;c`` flamegraph line"""
+    leaf = frame.f_code
+    if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_FRAMES:
+        return None
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _runs(frame, code: CodeType) -> bool:
+    while frame is not None:
+        if frame.f_code is code:
+            return True
+        frame = frame.f_back
+    return False
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a cProfile session is asked for while another one runs"""
+
+
+class StackSampler:
+    """Low-overhead sampling profiler over the threads serving one request.
+
+    A background thread snapshots ``sys._current_frames()`` every
+    ``interval`` seconds and counts the folded stacks of busy threads among
+    ``threads``, plus any thread currently running ``code`` (a sync route
+    handler on a worker thread). The result feeds flamegraph tools
+    directly (``stack count`` lines).
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.001,
+        threads: Collection[int] = (),
+        code: Optional[CodeType] = None,
+    ):
+        self.interval = interval
+        self.threads = frozenset(threads)
+        self.code = code
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if thread_id not in self.threads and (
+                    self.code is None or not _runs(frame, self.code)
+                ):
+                    continue
+                stack = fold_stack(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+
+
+def call_tree(profile: cProfile.Profile, limit: int = 50) -> List[Dict]:
+    """Summarize a cProfile run as functions with their callers, by cumulative time"""
+    stats = pstats.Stats(profile)
+    entries = []
+    for (filename, line, name), (_, calls, total, cumulative, callers) in stats.stats.items():
+        entries.append(
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+                "callers": [
+                    f"{os.path.basename(caller[0])}:{caller[1]}({caller[2]})"
+                    for caller in callers
+                ],
+            }
+        )
+    entries.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return entries[:limit]
+
+
+class ProfileSession:
+    """A profiler running for the duration of one request.
+
+    cProfile only sees the thread that starts the session, so that must be
+    the thread running the handler. The sampler watches ``threads`` and
+    threads running ``code``.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        interval: float,
+        threads: Collection[int] = (),
+        code: Optional[CodeType] = None,
+    ):
+        self.id = uuid.uuid4().hex[:12]
+        self.mode = mode
+        self.started = time.perf_counter()
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = StackSampler(interval, threads, code)
+            self._sampler.start()
+
+    def stop(self) -> Dict:
+        duration = time.perf_counter() - self.started
+        result = {"id": self.id, "mode": self.mode, "duration_ms": round(duration * 1000, 3)}
+        if self._profile is not None:
+            self._profile.disable()
+            result["call_tree"] = call_tree(self._profile)
+        else:
+            stacks = self._sampler.stop()
+            result["samples"] = self._sampler.samples
+            result["folded"] = [f"{stack} {count}" for stack, count in stacks.most_common()]
+            result["stacks"] = stacks
+        return result
+
+
+class RequestProfiler:
+    """On-demand and sampled request profiling.
+
+    A single request is profiled when it carries ``X-Profile: cprofile|sample``
+    (or ``?profile=``) together with a valid ``X-Admin-Token``; its result is
+    kept in a bounded store and its id returned in ``X-Profile-Id``. With
+    ``sample_every=N``, one request in N is also profiled with the stack
+    sampler and its stacks are added to a process-wide hot-stack table.
+    cProfile hooks the whole interpreter thread, so only one cProfile
+    session runs at a time; ``start`` raises ProfilerBusyError for others.
+    """
+
+    def __init__(
+        self,
+        admin_token: Optional[str] = None,
+        sample_every: int = 0,
+        max_profiles: int = 50,
+        interval: float = 0.001,
+        max_stacks: int = 20000,
+    ):
+        self.admin_token = admin_token
+        self.sample_every = sample_every
+        self.max_profiles = max_profiles
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self._profiles: "OrderedDict[str, Dict]" = OrderedDict()
+        self._hot_stacks: Counter = Counter()
+        self._requests = itertools.count(1)
+        self._lock = threading.Lock()
+        self._cprofile_lock = threading.Lock()
+        self.sampled_requests = 0
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        """Configure from PROFILING_ADMIN_TOKEN and PROFILING_SAMPLE_EVERY"""
+        return cls(
+            admin_token=os.environ.get("PROFILING_ADMIN_TOKEN") or None,
+            sample_every=int(os.environ.get("PROFILING_SAMPLE_EVERY", "0")),
+        )
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        if not self.admin_token or not token:
+            return False
+        return hmac.compare_digest(token.encode(), self.admin_token.encode())
+
+    def requested_mode(self, flag: Optional[str], token: Optional[str]) -> Optional[str]:
+        """Profiling mode asked for by an authorized request, if any"""
+        if not flag:
+            return None
+        mode = flag.strip().lower()
+        if mode in ("1", "true", "on"):
+            mode = "cprofile"
+        if mode not in PROFILE_MODES or not self.is_authorized(token):
+            return None
+        return mode
+
+    def take_sample(self) -> bool:
+        """Whether the global 1-in-N sampling picks the current request"""
+        return self.sample_every > 0 and next(self._requests) % self.sample_every == 0
+
+    def start(
+        self,
+        mode: str,
+        threads: Collection[int] = (),
+        code: Optional[CodeType] = None,
+    ) -> ProfileSession:
+        """Start profiling the request served by ``threads`` (and ``code``)"""
+        if mode == "cprofile" and not self._cprofile_lock.acquire(blocking=False):
+            raise ProfilerBusyError("Another cProfile session is running")
+        try:
+            return ProfileSession(mode, self.interval, threads, code)
+        except BaseException:
+            if mode == "cprofile":
+                self._cprofile_lock.release()
+            raise
+
+    def finish(self, session: ProfileSession, method: str, path: str, store: bool) -> Dict:
+        try:
+            result = session.stop()
+        finally:
+            if session.mode == "cprofile":
+                self._cprofile_lock.release()
+        result["method"] = method
+        result["path"] = path
+        stacks = result.pop("stacks", None)
+        with self._lock:
+            if stacks is not None and not store:
+                self.sampled_requests += 1
+                self._hot_stacks.update(stacks)
+                if len(self._hot_stacks) > self.max_stacks:
+                    # Keep the table bounded by dropping the coldest half
+                    self._hot_stacks = Counter(
+                        dict(self._hot_stacks.most_common(self.max_stacks // 2))
+                    )
+            if store:
+                self._profiles[session.id] = result
+                while len(self._profiles) > self.max_profiles:
+                    self._profiles.popitem(last=False)
+        return result
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {key: profile[key] for key in ("id", "mode", "method", "path", "duration_ms")}
+                for profile in self._profiles.values()
+            ]
+
+    def hot_stacks(self, limit: int = 50) -> Dict:
+        with self._lock:
+            return {
+                "sampled_requests": self.sampled_requests,
+                "sample_every": self.sample_every,
+                "folded": [
+                    f"{stack} {count}" for stack, count in self._hot_stacks.most_common(limit)
+                ],
+            }
+
+
+def _route_endpoint(scope):
+    """The handler of the route matching an ASGI request, if any"""
+    router = getattr(scope.get("app"), "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            endpoint = getattr(route, "endpoint", None)
+            return inspect.unwrap(endpoint) if endpoint is not None else None
+    return None
+
+
+async def _send_error(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class ProfilingMiddleware:
+    """ASGI middleware applying a RequestProfiler.
+
+    Async handlers run on the event loop thread, so that is the thread
+    profiled. Sync handlers run on a worker thread the middleware cannot
+    enter: they are sampled on whichever worker runs the handler, and
+    cProfile, which would only see the loop thread, is refused with 400.
+    A cProfile request while another runs gets 409.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name: value for name, value in scope["headers"]}
+        flag = headers.get(b"x-profile", b"").decode("latin-1")
+        if not flag and b"profile=" in scope.get("query_string", b""):
+            query = parse_qs(scope["query_string"].decode("latin-1"))
+            flag = query.get("profile", [""])[0]
+        token = headers.get(b"x-admin-token", b"").decode("latin-1")
+
+        mode = self.profiler.requested_mode(flag, token)
+        if mode is None and not self.profiler.take_sample():
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = _route_endpoint(scope)
+        sync_handler = endpoint is not None and not asyncio.iscoroutinefunction(endpoint)
+        if mode == "cprofile" and sync_handler:
+            await _send_error(send, 400, "cprofile cannot follow a sync route; use sample")
+            return
+        try:
+            session = self.profiler.start(
+                mode or "sample",
+                threads=[threading.get_ident()],
+                code=getattr(endpoint, "__code__", None) if sync_handler else None,
+            )
+        except ProfilerBusyError as e:
+            await _send_error(send, 409, str(e))
+            return
+
+        async def send_wrapper(message):
+            if mode is not None and message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", session.id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.finish(session, scope["method"], scope["path"], store=mode is not None)
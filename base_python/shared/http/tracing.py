@@ -0,0 +1,51 @@
+from shared.tracing.tracer import Tracer, parse_traceparent
+
+
+class TracingMiddleware:
+    """ASGI middleware that opens a server span for every HTTP request.
+
+    Only installed when tracing is enabled. Continues W3C ``traceparent``
+    traces when running with the built-in tracer.
+    """
+
+    def __init__(self, app, tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = {}
+        if isinstance(self.tracer, Tracer):
+            for name, value in scope["headers"]:
+                if name == b"traceparent":
+                    parent = parse_traceparent(value.decode("latin-1"))
+                    break
+
+        attributes = {
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        }
+        with self.tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}", attributes=attributes, **parent
+        ) as span:
+            response_size = 0
+
+            async def send_wrapper(message):
+                nonlocal response_size
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    route = scope.get("route")
+                    if route is not None:
+                        # Name by route template to keep span names low-cardinality
+                        span.update_name(f"{scope['method']} {route.path}")
+                        span.set_attribute("http.route", route.path)
+                elif message["type"] == "http.response.body":
+                    response_size += len(message.get("body", b""))
+                    if not message.get("more_body", False):
+                        span.set_attribute("http.response_size", response_size)
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
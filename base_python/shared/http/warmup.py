@@ -0,0 +1,92 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WarmUpTask:
+    def __init__(self, name: str, function: Callable, required: bool):
+        self.name = name
+        self.function = function
+        self.required = required
+        self.state = "pending"
+        self.attempts = 0
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "required": self.required,
+            "attempts": self.attempts,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+
+class WarmUp:
+    """Startup tasks that gate readiness.
+
+    Tasks run in registration order when the application starts, so the
+    first real requests do not pay for lazy initialization. Plain functions
+    run in a worker thread to keep the event loop free for liveness probes.
+    The application is ready once every required task has succeeded; a
+    failing required task is retried every ``retry_interval`` seconds, a
+    failing optional task is only logged.
+    """
+
+    def __init__(self, retry_interval: float = 2.0):
+        self.retry_interval = retry_interval
+        self._tasks: List[WarmUpTask] = []
+        self._ready = asyncio.Event()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add(self, name: str, function: Callable, required: bool = True) -> None:
+        self._tasks.append(WarmUpTask(name, function, required))
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    async def wait(self) -> None:
+        await self._ready.wait()
+
+    async def _attempt(self, task: WarmUpTask) -> bool:
+        task.attempts += 1
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(task.function):
+                await task.function()
+            else:
+                await asyncio.to_thread(task.function)
+        except Exception as e:
+            task.state = "failed"
+            task.error = str(e)
+            logger.warning(f"Warm-up task {task.name} failed: {str(e)}")
+            return False
+        finally:
+            task.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        task.state = "done"
+        task.error = None
+        return True
+
+    async def run(self) -> None:
+        """Run every task, retrying required ones until they succeed"""
+        self.started_at = time.time()
+        for task in self._tasks:
+            while not await self._attempt(task) and task.required:
+                await asyncio.sleep(self.retry_interval)
+        self.finished_at = time.time()
+        self._ready.set()
+        logger.info(f"Warm-up finished in {self.finished_at - self.started_at:.3f}s")
+
+    def status(self) -> Dict:
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "tasks": [task.to_dict() for task in self._tasks],
+        }
@@ -0,0 +1 @@
+# Span tracer shared by the monolith and clean architecture apps
@@ -0,0 +1,175 @@
+"""
+Minimal span tracer with an OpenTelemetry-compatible surface.
+
+Instrumentation only uses ``tracer.start_as_current_span(name, attributes=...)``
+and the span methods ``set_attribute``/``set_attributes``/``update_name``/
+``record_exception``, which behave the same on this tracer and on an
+OpenTelemetry SDK tracer. When tracing is disabled no tracer exists and nothing
+is instrumented at all.
+"""
+
+import os
+import secrets
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = "UNSET"
+        self.start_time = time.time_ns()
+        self.end_time: Optional[int] = None
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append({"name": name, "time": time.time_ns(), "attributes": attributes or {}})
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.add_event(
+            "exception",
+            {
+                "exception.type": type(exception).__name__,
+                "exception.message": str(exception),
+                "exception.stacktrace": "".join(
+                    traceback.format_exception(type(exception), exception, exception.__traceback__)
+                ),
+            },
+        )
+
+    def end(self) -> None:
+        if self.end_time is None:
+            self.end_time = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time if self.end_time is not None else time.time_ns()
+        return (end - self.start_time) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": self.status,
+            "duration_ms": round(self.duration_ms, 3),
+        }
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in memory, for tests and local inspection"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.max_spans = max_spans
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) > self.max_spans:
+                del self._spans[: len(self._spans) - self.max_spans]
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class Tracer:
+    """Creates spans, tracks the current one per context and exports them"""
+
+    def __init__(self, exporter: Optional[InMemorySpanExporter] = None):
+        self.exporter = exporter or InMemorySpanExporter()
+
+    @contextmanager
+    def start_as_current_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> Iterator[Span]:
+        """Start a child of the current span (or a new trace) and make it current"""
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        span = Span(name, trace_id or secrets.token_hex(16), parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "ERROR"
+            span.record_exception(e)
+            raise
+        else:
+            if span.status == "UNSET":
+                span.status = "OK"
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self.exporter.export(span)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def parse_traceparent(header: Optional[str]) -> Dict[str, str]:
+    """Extract trace and parent ids from a W3C traceparent header"""
+    if not header:
+        return {}
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return {}
+    return {"trace_id": parts[1], "parent_id": parts[2]}
+
+
+def tracer_from_env(service_name: str):
+    """Build a tracer from TRACING_EXPORTER, or None when tracing is disabled.
+
+    ``memory`` keeps spans in-process; ``otel`` uses the OpenTelemetry API
+    (the SDK and exporters are configured by the OpenTelemetry environment),
+    naming the tracer ``service_name``.
+    """
+    exporter = os.environ.get("TRACING_EXPORTER", "").lower()
+    if exporter == "memory":
+        return Tracer()
+    if exporter == "otel":
+        from opentelemetry import trace
+
+        return trace.get_tracer(service_name)
+    return None
@@ -196,7 +196,7 @@ if [ "$TG_ARN" == "None" ] || [ -z "$TG_ARN" ]; then
         --port 9000 \
         --vpc-id ${VPC_ID} \
         --target-type ip \
-        --health-check-path /health \
+        --health-check-path /ready \
         --health-check-interval-seconds 30 \
         --health-check-timeout-seconds 5 \
         --healthy-threshold-count 2 \
@@ -419,7 +419,7 @@ cat > /tmp/managed-instances-task.json <<EOF
             "healthCheck": {
                 "command": [
                     "CMD-SHELL",
-                    "curl -f http://localhost:9000/health || exit 1"
+                    "curl -f http://localhost:9000/live || exit 1"
                 ],
                 "interval": 30,
                 "timeout": 5,